@@ -0,0 +1,104 @@
+# Copyright 2023 The Zero Saver Authors. All Rights Reserved.
+#
+# This file is part of Zero Saver.
+#
+# Zero Saver is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later
+# version.
+#
+# Zero Saver is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR
+# A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# Zero Saver. If not, see <https://www.gnu.org/licenses/>.
+"""Compares the wall time of GameDataIO.write_save_file() at each durability
+level, and the part of it spent in fsync.
+
+fsync is nearly free on tmpfs, which often backs the default temporary
+directory. Pass --directory to measure the storage saves are written to.
+
+Usage:
+  python dev/benchmarks/benchmark_durability.py [--repeat N] [--scale N]
+      [--directory PATH]
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import pathlib
+import statistics
+import sys
+import tempfile
+import time
+
+_ROOT = pathlib.Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(_ROOT.joinpath('src')))
+
+# pylint: disable=wrong-import-position
+from zero_saver_core import game_data_io
+from zero_saver_core import tracing
+
+_SAVE_FILES = _ROOT.joinpath('cases', 'resources', 'save_files')
+_FSYNC_STAGES = (tracing.Stage.FSYNC, tracing.Stage.FSYNC_DIRECTORY)
+
+
+def synthetic_save(template: pathlib.Path, scale: int) -> bytes:
+  """Repeats the trader inventories of *template* *scale* times."""
+  save = json.loads(template.read_bytes())
+  for value in save['data']['general'].values():
+    if isinstance(value, dict) and isinstance(value.get('items'), list):
+      value['items'] = value['items'] * scale
+  return json.dumps(save, separators=(',', ':')).encode('utf-8')
+
+
+def measure(
+    data: game_data_io.GameDataIO,
+    durability: game_data_io.Durability,
+    repeat: int,
+) -> tuple[float, float]:
+  """Returns the median wall time of writing *data*, and of its fsync calls."""
+  times = []
+  fsync_times = []
+  for _ in range(repeat):
+    spans: list[tracing.Span] = []
+    data.tracers = [spans.append]
+    start = time.perf_counter()
+    data.write_save_file(durability=durability)
+    times.append(time.perf_counter() - start)
+    fsync_times.append(
+        sum(span.duration for span in spans if span.stage in _FSYNC_STAGES)
+    )
+  return statistics.median(times), statistics.median(fsync_times)
+
+
+def main() -> None:
+  parser = argparse.ArgumentParser(description=__doc__)
+  parser.add_argument('--repeat', type=int, default=20)
+  parser.add_argument('--scale', type=int, default=200)
+  parser.add_argument('--directory', type=pathlib.Path, default=None)
+  args = parser.parse_args()
+  template = sorted(_SAVE_FILES.glob('*.json'))[0]
+  documents = {
+      template.name: template.read_bytes(),
+      f'synthetic x{args.scale}': synthetic_save(template, args.scale),
+  }
+  with tempfile.TemporaryDirectory(dir=args.directory) as directory:
+    save_path = pathlib.Path(directory, 'save_shared_1.dat')
+    backup_path = pathlib.Path(directory, 'backup')
+    backup_path.mkdir()
+    for name, raw in documents.items():
+      print(f'{name} ({len(raw) / 2**10:.0f} KiB)')
+      save_path.write_bytes(raw)
+      data = game_data_io.GameDataIO(save_path, backup_path)
+      for durability in game_data_io.Durability:
+        wall_time, fsync_time = measure(data, durability, args.repeat)
+        print(
+            f'  {durability:<16} {wall_time * 1000:9.2f} ms'
+            f'  fsync {fsync_time * 1000:9.2f} ms'
+        )
+
+
+if __name__ == '__main__':
+  main()
@@ -0,0 +1,106 @@
+# Copyright 2023 The Zero Saver Authors. All Rights Reserved.
+#
+# This file is part of Zero Saver.
+#
+# Zero Saver is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later
+# version.
+#
+# Zero Saver is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR
+# A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# Zero Saver. If not, see <https://www.gnu.org/licenses/>.
+"""Compares the wall time of GameDataIO.write_save_file() verifying, backing up
+and encoding one after another, and concurrently with a write executor.
+
+Each write edits the save, so that every write stores a new backup. Only the
+backup releases the GIL for long; the gain is bounded by its share of the
+write, and requires more than one CPU.
+
+Usage:
+  python dev/benchmarks/benchmark_pipelined_write.py [--repeat N] [--scale N]
+      [--compression FORMAT]
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import pathlib
+import statistics
+import sys
+import tempfile
+import time
+from concurrent import futures
+
+_ROOT = pathlib.Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(_ROOT.joinpath('src')))
+
+# pylint: disable=wrong-import-position
+from zero_saver_core import backup_store
+from zero_saver_core import game_data_io
+
+
+def synthetic_save(template: pathlib.Path, scale: int) -> bytes:
+  """Repeats the trader inventories of *template* *scale* times."""
+  save = json.loads(template.read_bytes())
+  for value in save['data']['general'].values():
+    if isinstance(value, dict) and isinstance(value.get('items'), list):
+      value['items'] = value['items'] * scale
+  return json.dumps(save, separators=(',', ':')).encode('utf-8')
+
+
+def measure(data: game_data_io.GameDataIO, repeat: int) -> float:
+  """Returns the median wall time of editing and writing *data*."""
+  times = []
+  for index in range(repeat):
+    data.save['data']['difficulty']['edited'] = str(index)
+    start = time.perf_counter()
+    data.write_save_file(durability=game_data_io.Durability.NONE)
+    times.append(time.perf_counter() - start)
+  return statistics.median(times)
+
+
+def main() -> None:
+  parser = argparse.ArgumentParser(description=__doc__)
+  parser.add_argument('--repeat', type=int, default=20)
+  parser.add_argument('--scale', type=int, default=200)
+  parser.add_argument(
+      '--compression',
+      choices=list(backup_store.Compression),
+      default=backup_store.Compression.ZLIB,
+  )
+  args = parser.parse_args()
+  save_files = _ROOT.joinpath('cases', 'resources', 'save_files')
+  template = sorted(save_files.glob('*.json'))[0]
+  documents = {
+      template.name: template.read_bytes(),
+      f'synthetic x{args.scale}': synthetic_save(template, args.scale),
+  }
+  with tempfile.TemporaryDirectory() as directory, futures.ThreadPoolExecutor(
+      3
+  ) as executor:
+    save_path = pathlib.Path(directory, 'save_shared_1.dat')
+    backup_path = pathlib.Path(directory, 'backup')
+    backup_path.mkdir()
+    for name, raw in documents.items():
+      print(f'{name} ({len(raw) / 2**10:.0f} KiB)')
+      for label, write_executor in (
+          ('sequential', None),
+          ('pipelined', executor),
+      ):
+        save_path.write_bytes(raw)
+        data = game_data_io.GameDataIO(
+            save_path,
+            backup_path,
+            write_executor=write_executor,
+            backup_compression=args.compression,
+        )
+        wall_time = measure(data, args.repeat)
+        print(f'  {label:<12} {wall_time * 1000:9.2f} ms')
+
+
+if __name__ == '__main__':
+  main()
@@ -0,0 +1,102 @@
+# Copyright 2023 The Zero Saver Authors. All Rights Reserved.
+#
+# This file is part of Zero Saver.
+#
+# Zero Saver is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later
+# version.
+#
+# Zero Saver is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR
+# A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# Zero Saver. If not, see <https://www.gnu.org/licenses/>.
+"""Compares wall time and peak memory of the GameDataIO read modes.
+
+Peak memory is the peak of python allocations reported by tracemalloc. Pages of
+a memory-mapped file are not python allocations and are not counted.
+
+Usage:
+  python dev/benchmarks/benchmark_read.py [--repeat N] [--scale N]
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import pathlib
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+_ROOT = pathlib.Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(_ROOT.joinpath('src')))
+
+# pylint: disable=wrong-import-position
+from zero_saver_core import game_data_io
+
+_SAVE_FILES = _ROOT.joinpath('cases', 'resources', 'save_files')
+_MODES = {
+    'eager': {},
+    'eager+mmap': {'use_mmap': True},
+    'lazy (pre_raid)': {'lazy': True},
+    'lazy+mmap (pre_raid)': {'lazy': True, 'use_mmap': True},
+}
+
+
+def synthetic_save(template: pathlib.Path, scale: int) -> str:
+  """Repeats the trader inventories of *template* *scale* times."""
+  save = json.loads(template.read_text(encoding='utf-8'))
+  for value in save['data']['general'].values():
+    if isinstance(value, dict) and isinstance(value.get('items'), list):
+      value['items'] = value['items'] * scale
+  return json.dumps(save, separators=(',', ':'))
+
+
+def load(save_path: pathlib.Path, **options) -> None:
+  data = game_data_io.GameDataIO(save_path, **options)
+  data.save['data']['pre_raid']  # pylint: disable=pointless-statement
+
+
+def measure(save_path: pathlib.Path, repeat: int, **options):
+  """Returns the median wall time and the peak memory of loading *save_path*.
+  Memory is measured in a separate run, as tracing slows down allocations."""
+  times = []
+  for _ in range(repeat):
+    start = time.perf_counter()
+    load(save_path, **options)
+    times.append(time.perf_counter() - start)
+  tracemalloc.start()
+  load(save_path, **options)
+  peak = tracemalloc.get_traced_memory()[1]
+  tracemalloc.stop()
+  return statistics.median(times), peak
+
+
+def main() -> None:
+  parser = argparse.ArgumentParser(description=__doc__)
+  parser.add_argument('--repeat', type=int, default=20)
+  parser.add_argument('--scale', type=int, default=200)
+  args = parser.parse_args()
+  template = sorted(_SAVE_FILES.glob('*.json'))[0]
+  with tempfile.TemporaryDirectory() as directory:
+    synthetic_path = pathlib.Path(directory, 'synthetic.json')
+    synthetic_path.write_text(
+        synthetic_save(template, args.scale), encoding='utf-8'
+    )
+    for save_path in (template, synthetic_path):
+      size = save_path.stat().st_size
+      print(f'{save_path.name} ({size / 2**10:.0f} KiB)')
+      for name, options in _MODES.items():
+        wall_time, peak = measure(save_path, args.repeat, **options)
+        print(
+            f'  {name:<22} {wall_time * 1000:9.2f} ms'
+            f'  peak {peak / 2**20:8.2f} MiB'
+        )
+
+
+if __name__ == '__main__':
+  main()
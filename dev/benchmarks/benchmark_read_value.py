@@ -0,0 +1,105 @@
+# Copyright 2023 The Zero Saver Authors. All Rights Reserved.
+#
+# This file is part of Zero Saver.
+#
+# Zero Saver is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later
+# version.
+#
+# Zero Saver is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR
+# A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# Zero Saver. If not, see <https://www.gnu.org/licenses/>.
+"""Compares the wall time of reading a single value of a save with
+save_index.read_value() and a warm index cache, and with json.load() of the
+whole save.
+
+Usage:
+  python dev/benchmarks/benchmark_read_value.py [--repeat N] [--scale N]
+"""
+from __future__ import annotations
+
+import argparse
+import decimal
+import functools
+import json
+import pathlib
+import statistics
+import sys
+import tempfile
+import time
+from collections.abc import Callable
+from typing import Any
+
+_ROOT = pathlib.Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(_ROOT.joinpath('src')))
+
+# pylint: disable=wrong-import-position
+from zero_saver_core import save_index
+
+_SAVE_FILES = _ROOT.joinpath('cases', 'resources', 'save_files')
+_KEY_PATHS = ('data.pre_raid.player', 'data.pre_raid.Inventory.items.0')
+
+
+def synthetic_save(template: pathlib.Path, scale: int) -> str:
+  """Repeats the trader inventories of *template* *scale* times."""
+  save = json.loads(template.read_text(encoding='utf-8'))
+  for value in save['data']['general'].values():
+    if isinstance(value, dict) and isinstance(value.get('items'), list):
+      value['items'] = value['items'] * scale
+  return json.dumps(save, separators=(',', ':'))
+
+
+def measure(function: Callable[[], Any], repeat: int) -> float:
+  """Returns the median wall time of calling *function*."""
+  times = []
+  for _ in range(repeat):
+    start = time.perf_counter()
+    function()
+    times.append(time.perf_counter() - start)
+  return statistics.median(times)
+
+
+def json_load(save_path: pathlib.Path) -> Any:
+  with open(save_path, 'rb') as f:
+    return json.load(f, parse_float=decimal.Decimal)
+
+
+def main() -> None:
+  parser = argparse.ArgumentParser(description=__doc__)
+  parser.add_argument('--repeat', type=int, default=100)
+  parser.add_argument('--scale', type=int, default=200)
+  args = parser.parse_args()
+  template = sorted(_SAVE_FILES.glob('*.json'))[0]
+  with tempfile.TemporaryDirectory() as directory:
+    cache_directory = pathlib.Path(directory, 'cache')
+    cache_directory.mkdir()
+    synthetic_path = pathlib.Path(directory, 'synthetic.json')
+    synthetic_path.write_text(
+        synthetic_save(template, args.scale), encoding='utf-8'
+    )
+    for save_path in (template, synthetic_path):
+      size = save_path.stat().st_size
+      print(f'{save_path.name} ({size / 2**10:.0f} KiB)')
+      wall_time = measure(functools.partial(json_load, save_path), args.repeat)
+      print(f'  {"json.load":<36} {wall_time * 1000:9.3f} ms')
+      for key_path in _KEY_PATHS:
+        read_value = functools.partial(
+            save_index.read_value,
+            save_path,
+            key_path,
+            cache_directory=cache_directory,
+        )
+        read_value()  # Warms the cache.
+        wall_time = measure(read_value, args.repeat)
+        print(f'  {key_path:<36} {wall_time * 1000:9.3f} ms')
+      for cache_file in cache_directory.iterdir():
+        print(f'  index cache {cache_file.stat().st_size / 2**10:.1f} KiB')
+        cache_file.unlink()
+
+
+if __name__ == '__main__':
+  main()
@@ -0,0 +1,208 @@
+# Copyright 2023 The Zero Saver Authors. All Rights Reserved.
+#
+# This file is part of Zero Saver.
+#
+# Zero Saver is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later
+# version.
+#
+# Zero Saver is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR
+# A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# Zero Saver. If not, see <https://www.gnu.org/licenses/>.
+"""Compares the wall time of encoding saves with each save encoder, then of
+writing them to a file through each output path.
+
+The stdlib encoder writes floats instead of decimals and does not produce the
+"ZERO Sievert" format; it is listed as a lower bound only. Sections are also
+encoded in parallel, by a pool of --processes worker processes. Output paths
+report the number of write() calls reaching the file descriptor.
+
+Usage:
+  python dev/benchmarks/benchmark_write.py [--repeat N] [--scale N]
+      [--processes N]
+"""
+from __future__ import annotations
+
+import argparse
+import decimal
+import io
+import json
+import os
+import pathlib
+import statistics
+import sys
+import tempfile
+import time
+from concurrent import futures
+from typing import Any
+
+_ROOT = pathlib.Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(_ROOT.joinpath('src')))
+
+# pylint: disable=wrong-import-position
+from zero_saver_core import json_backend
+from zero_saver_core import lazy_decimal
+from zero_saver_core import monkey_patch_json
+from zero_saver_core import number_pool
+from zero_saver_core import output_sink
+from zero_saver_core import parallel_encode
+
+_SAVE_FILES = _ROOT.joinpath('cases', 'resources', 'save_files')
+_ENCODERS = {
+    'ZeroSievertJsonEncoder': monkey_patch_json.ZeroSievertJsonEncoder,
+    'ZeroSievertFastJsonEncoder': monkey_patch_json.ZeroSievertFastJsonEncoder,
+}
+
+
+def synthetic_save(template: pathlib.Path, scale: int) -> bytes:
+  """Repeats the trader inventories of *template* *scale* times."""
+  save = json.loads(template.read_bytes())
+  for value in save['data']['general'].values():
+    if isinstance(value, dict) and isinstance(value.get('items'), list):
+      value['items'] = value['items'] * scale
+  return json.dumps(save, separators=(',', ':')).encode('utf-8')
+
+
+class CountingFileIO(io.FileIO):
+  """Counts the writes reaching the file descriptor."""
+
+  writes = 0
+
+  def write(self, data: Any) -> int:
+    self.writes += 1
+    return super().write(data)
+
+
+def text_dump(save: Any, raw: io.FileIO) -> None:
+  """The original output path: json.dump() through a text stream."""
+  with io.TextIOWrapper(io.BufferedWriter(raw), encoding='utf-8') as f:
+    json.dump(save, f, cls=monkey_patch_json.ZeroSievertJsonEncoder)
+
+
+def fast_text_dump(save: Any, raw: io.FileIO) -> None:
+  with io.TextIOWrapper(io.BufferedWriter(raw), encoding='utf-8') as f:
+    json.dump(save, f, cls=monkey_patch_json.ZeroSievertFastJsonEncoder)
+
+
+def sink_dump(save: Any, raw: io.FileIO) -> None:
+  with io.BufferedWriter(raw) as f:
+    output_sink.dump(save, f)
+
+
+def encoded_write(save: Any, raw: io.FileIO) -> None:
+  """The output path of GameDataIO.write_save_file()."""
+  encoded = json.dumps(
+      save, cls=monkey_patch_json.ZeroSievertFastJsonEncoder
+  ).encode('utf-8')
+  with io.BufferedWriter(raw) as f:
+    f.write(encoded)
+
+
+_OUTPUTS = {
+    'json.dump, TextIOWrapper': text_dump,
+    'json.dump (fast), TextIOWrapper': fast_text_dump,
+    'output_sink.dump': sink_dump,
+    'dumps, encode, one write': encoded_write,
+}
+
+
+def measure_output(output: Any, save: Any, repeat: int) -> tuple[float, int]:
+  """Returns the median wall time and the write count of *output*."""
+  times = []
+  writes = 0
+  with tempfile.TemporaryDirectory() as directory:
+    path = os.path.join(directory, 'save.json')
+    for _ in range(repeat):
+      raw = CountingFileIO(path, 'w')
+      start = time.perf_counter()
+      output(save, raw)
+      times.append(time.perf_counter() - start)
+      writes = raw.writes
+  return statistics.median(times), writes
+
+
+def measure(encode: Any, repeat: int) -> float:
+  times = []
+  for _ in range(repeat):
+    start = time.perf_counter()
+    encode()
+    times.append(time.perf_counter() - start)
+  return statistics.median(times)
+
+
+def main() -> None:
+  parser = argparse.ArgumentParser(description=__doc__)
+  parser.add_argument('--repeat', type=int, default=20)
+  parser.add_argument('--scale', type=int, default=200)
+  parser.add_argument('--processes', type=int, default=os.cpu_count() or 1)
+  args = parser.parse_args()
+  with futures.ProcessPoolExecutor(args.processes) as executor:
+    run(args, executor)
+
+
+def run(args: argparse.Namespace, executor: futures.Executor) -> None:
+  template = sorted(_SAVE_FILES.glob('*.json'))[0]
+  documents = {
+      template.name: template.read_bytes(),
+      f'synthetic x{args.scale}': synthetic_save(template, args.scale),
+  }
+  parse_floats = {
+      'Decimal': decimal.Decimal,
+      'Decimal pool': number_pool.InternPool(decimal.Decimal).__getitem__,
+      'LazyDecimal pool': number_pool.InternPool(
+          lazy_decimal.LazyDecimal
+      ).__getitem__,
+  }
+  for name, raw in documents.items():
+    print(f'{name} ({len(raw) / 2**10:.0f} KiB)')
+    for parse_float_name, parse_float in parse_floats.items():
+      save = json.loads(raw, parse_float=parse_float)
+      baseline = None
+      for encoder_name, encoder in _ENCODERS.items():
+        wall_time = measure(
+            lambda encoder=encoder: json.dumps(save, cls=encoder), args.repeat
+        )
+        baseline = baseline if baseline else wall_time
+        print(
+            f'  {parse_float_name:<16} {encoder_name:<32}'
+            f' {wall_time * 1000:9.2f} ms  x{baseline / wall_time:.2f}'
+        )
+      for depth in (1, 2):
+        wall_time = measure(
+            lambda depth=depth: parallel_encode.encode(
+                save,
+                json_backend.FAST_ENCODER_BACKEND.dumps,
+                executor,
+                depth=depth,
+            ),
+            args.repeat,
+        )
+        print(
+            f'  {parse_float_name:<16}'
+            f' {f"parallel, depth {depth}, {args.processes} process(es)":<32}'
+            f' {wall_time * 1000:9.2f} ms'
+        )
+    floats = json.loads(raw)
+    wall_time = measure(lambda: json.dumps(floats), args.repeat)
+    print(
+        f'  {"float":<16} {"stdlib (lower bound)":<32}'
+        f' {wall_time * 1000:9.2f} ms'
+    )
+    save = json.loads(raw, parse_float=decimal.Decimal)
+    baseline = None
+    for output_name, output in _OUTPUTS.items():
+      wall_time, writes = measure_output(output, save, args.repeat)
+      baseline = baseline if baseline else wall_time
+      print(
+          f'  {"write":<16} {output_name:<32}'
+          f' {wall_time * 1000:9.2f} ms  x{baseline / wall_time:.2f}'
+          f'  {writes} write(s)'
+      )
+
+
+if __name__ == '__main__':
+  main()
@@ -0,0 +1,105 @@
+# Copyright 2023 The Zero Saver Authors. All Rights Reserved.
+#
+# This file is part of Zero Saver.
+#
+# Zero Saver is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later
+# version.
+#
+# Zero Saver is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR
+# A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# Zero Saver. If not, see <https://www.gnu.org/licenses/>.
+"""Structural deltas between two versions of a "ZERO Sievert" save file.
+
+A delta lists the values of the new version differing from the old one, by key
+path, together with their exact bytes. Applying it splices these bytes into the
+old version at the current location of each key path. Deltas reproduce the new
+version byte for byte, provided both versions share their formatting outside
+the differing values; diff() only returns deltas verified to do so."""
+from __future__ import annotations
+
+import json
+
+from zero_saver_core import save_index
+from zero_saver_core import splice
+
+# The key path of a value, and the text replacing it.
+Edit = tuple[save_index.KeyPath, str]
+
+
+def lexemes(raw: bytes) -> object:
+  """Decodes *raw* keeping numbers as their lexemes, so that 1.50 and 1.5
+  differ.
+
+  Raises:
+    ValueError: If *raw* is not valid JSON.
+  """
+  return json.loads(raw, parse_float=str, parse_int=str, parse_constant=str)
+
+
+def diff(
+    old: bytes,
+    new: bytes,
+    *,
+    old_lexemes: object | None = None,
+    new_lexemes: object | None = None,
+) -> list[Edit] | None:
+  """Returns the delta from the save file *old* to the save file *new*.
+
+  Args:
+    old: The previous version of the save file.
+    new: The current version of the save file.
+    old_lexemes: lexemes(old), if already decoded.
+    new_lexemes: lexemes(new), if already decoded.
+
+  Returns:
+    The edits turning *old* into *new*, or None if *new* cannot be
+    reproduced from *old* by a delta, e.g. as the two differ at the top level
+    or in formatting.
+
+  Raises:
+    ValueError: If either save file is not valid JSON.
+  """
+  if old_lexemes is None:
+    old_lexemes = lexemes(old)
+  if new_lexemes is None:
+    new_lexemes = lexemes(new)
+  paths = splice.changed_paths(old_lexemes, new_lexemes)
+  if () in paths:
+    return None
+  edits: list[Edit] = []
+  for key_path in paths:
+    start, end = save_index.locate(new, key_path)
+    edits.append((key_path, new[start:end].decode('utf-8')))
+  try:
+    patched = patch(old, edits)
+  except (KeyError, ValueError):
+    return None
+  if patched != new:
+    return None
+  return edits
+
+
+def patch(base: bytes, edits: list[Edit]) -> bytes:
+  """Applies *edits*, in document order, to the save file *base*.
+
+  Raises:
+    KeyError: If *base* has no value at the key path of an edit.
+    ValueError: If *base* is malformed, or the edits are not in document
+      order.
+  """
+  pieces: list[bytes] = []
+  position = 0
+  for key_path, text in edits:
+    start, end = save_index.locate(base, tuple(key_path))
+    if start < position:
+      raise ValueError(f'Edit out of document order: {key_path}')
+    pieces.append(base[position:start])
+    pieces.append(text.encode('utf-8'))
+    position = end
+  pieces.append(base[position:])
+  return b''.join(pieces)
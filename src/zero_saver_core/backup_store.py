@@ -0,0 +1,812 @@
+# Copyright 2023 The Zero Saver Authors. All Rights Reserved.
+#
+# This file is part of Zero Saver.
+#
+# Zero Saver is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later
+# version.
+#
+# Zero Saver is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR
+# A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# Zero Saver. If not, see <https://www.gnu.org/licenses/>.
+"""Content-addressed store of "ZERO Sievert" save backups.
+
+The content of each backup is stored once, in OBJECTS_DIRECTORY, named by its
+SHA-256 hash. Backups are listed in the reference log REFS_FILE, one line per
+backup:
+
+  <ISO 8601 timestamp> <SHA-256 as hexadecimal> <save file name>
+
+Backing up content identical to an existing backup only appends a reference,
+and backing up the content of the latest backup again writes nothing. Rotation
+drops the oldest references, then deletes the objects no longer referenced.
+It rewrites both logs, and only runs once the reference log holds
+COMPACTION_FACTOR times as many references as are kept, so that each backup
+costs constant amortized time.
+
+Objects may be compressed, in a single streaming pass, with any of the
+Compression formats; their file name is then suffixed by the format. Objects
+are addressed by the hash of their uncompressed content, and are decompressed
+transparently whatever the compression of the store reading them.
+
+Objects may also be stored as a delta against the previous backup of the same
+save file, suffixed by DELTA_SUFFIX. See zero_saver_core.backup_delta. Each
+delta holds a JSON object:
+
+  {"base": "<SHA-256 of the base>", "depth": <deltas since the keyframe>,
+   "edits": [[<key path>, "<replacement text>"], ...]}
+
+Every keyframe_interval-th backup of a chain is a full object, a keyframe.
+Reading a delta replays the deltas from the nearest keyframe, and verifies the
+hash of the result. Rotation keeps every object a kept delta depends on.
+
+Objects are listed in the manifest MANIFEST_FILE, one line per object:
+
+  <object file name> <size in bytes> <modification time in nanoseconds>
+
+Both logs are only appended to between rotations, and only their new lines are
+read, so that backing up, rotating and looking up the latest backup do not
+scan the objects directory nor stat its objects. The manifest is rebuilt from
+a scan of the objects directory when it is missing, e.g. in stores predating
+it, and when an object disagrees with it.
+"""
+from __future__ import annotations
+
+import bz2
+import dataclasses
+import datetime
+import enum
+import hashlib
+import json
+import lzma
+import os
+import pathlib
+import tempfile
+import zlib
+from collections.abc import Callable, Iterable, Iterator
+from typing import Any, BinaryIO, TYPE_CHECKING
+
+from zero_saver_core import backup_delta
+
+if TYPE_CHECKING:
+  from _typeshed import StrPath
+
+OBJECTS_DIRECTORY = 'objects'
+REFS_FILE = 'refs.log'
+MANIFEST_FILE = 'manifest.log'
+BLOCKSIZE = 2**20
+DELTA_SUFFIX = '.delta'
+# The reference log is rotated once it holds this many times the number of
+# references kept.
+COMPACTION_FACTOR = 2
+
+
+class Compression(enum.StrEnum):
+  NONE = 'none'
+  ZLIB = 'zlib'
+  BZ2 = 'bz2'
+  LZMA = 'lzma'
+
+
+class _Uncompressed:
+  """Compressor and decompressor passing data through unchanged."""
+
+  eof = True
+
+  def compress(self, data: bytes) -> bytes:
+    return data
+
+  def decompress(self, data: bytes) -> bytes:
+    return data
+
+  def flush(self) -> bytes:
+    return b''
+
+
+@dataclasses.dataclass(frozen=True)
+class _Codec:
+  """A compression format.
+
+  Attributes:
+    suffix: The suffix of the file name of objects compressed by the codec.
+    compressor: Returns a compressor of the given level, or of the default
+      level of the format if None.
+    decompressor: Returns a decompressor.
+    levels: The levels accepted by compressor, or None if it ignores them.
+  """
+
+  suffix: str
+  compressor: Callable[[int | None], Any]
+  decompressor: Callable[[], Any]
+  levels: range | None = None
+
+
+_CODECS = {
+    Compression.NONE: _Codec('', lambda level: _Uncompressed(), _Uncompressed),
+    Compression.ZLIB: _Codec(
+        '.zz',
+        lambda level: zlib.compressobj(
+            zlib.Z_DEFAULT_COMPRESSION if level is None else level
+        ),
+        zlib.decompressobj,
+        range(-1, 10),
+    ),
+    Compression.BZ2: _Codec(
+        '.bz2',
+        lambda level: bz2.BZ2Compressor(9 if level is None else level),
+        bz2.BZ2Decompressor,
+        range(1, 10),
+    ),
+    Compression.LZMA: _Codec(
+        '.xz',
+        lambda level: lzma.LZMACompressor(preset=level),
+        lzma.LZMADecompressor,
+        range(10),
+    ),
+}
+
+
+def check_level(compression: Compression, level: int | None) -> None:
+  """Checks that *level* is a valid level of *compression*, or None.
+
+  Raises:
+    ValueError: If *compression* does not support *level*.
+  """
+  levels = _CODECS[Compression(compression)].levels
+  if level is not None and levels is not None and level not in levels:
+    raise ValueError(
+        f'Invalid {Compression(compression)} compression level: {level}'
+    )
+
+
+@dataclasses.dataclass(frozen=True)
+class BackupRef:
+  """A backup listed in the reference log.
+
+  Attributes:
+    timestamp: When the backup was made, in local time.
+    sha256: The SHA-256 hash of the backed up content, as hexadecimal.
+    name: The name of the backed up save file.
+  """
+
+  timestamp: datetime.datetime
+  sha256: str
+  name: str
+
+  def to_line(self) -> str:
+    return f'{self.timestamp.isoformat()} {self.sha256} {self.name}\n'
+
+  @classmethod
+  def from_line(cls, line: str) -> BackupRef:
+    """Parses a line of the reference log.
+
+    Raises:
+      ValueError: If *line* is not a complete reference.
+    """
+    fields = line.rstrip('\n').split(' ', 2)
+    if len(fields) != 3 or len(fields[1]) != 64 or not line.endswith('\n'):
+      raise ValueError(f'Malformed reference: {line!r}')
+    timestamp, sha256, name = fields
+    return cls(datetime.datetime.fromisoformat(timestamp), sha256, name)
+
+
+@dataclasses.dataclass(frozen=True)
+class BackupObject:
+  """An object listed in the manifest.
+
+  Attributes:
+    file_name: The name of the object file: the SHA-256 hash of its
+      uncompressed content, as hexadecimal, suffixed by its format.
+    size: The size of the object file, in bytes.
+    mtime_ns: The modification time of the object file, in nanoseconds.
+  """
+
+  file_name: str
+  size: int
+  mtime_ns: int
+
+  @property
+  def sha256(self) -> str:
+    return self.file_name.split('.', 1)[0]
+
+  def to_line(self) -> str:
+    return f'{self.file_name} {self.size} {self.mtime_ns}\n'
+
+  @classmethod
+  def from_line(cls, line: str) -> BackupObject:
+    """Parses a line of the manifest.
+
+    Raises:
+      ValueError: If *line* is not a complete object listing.
+    """
+    fields = line.rstrip('\n').split(' ')
+    if (
+        len(fields) != 3
+        or len(fields[0].split('.', 1)[0]) != 64
+        or not line.endswith('\n')
+    ):
+      raise ValueError(f'Malformed object listing: {line!r}')
+    file_name, size, mtime_ns = fields
+    return cls(file_name, int(size), int(mtime_ns))
+
+
+@dataclasses.dataclass(frozen=True)
+class _Version:
+  """The latest content backed up for a save file name, kept to diff the next
+  backup against without rebuilding it.
+
+  Attributes:
+    sha256: The SHA-256 hash of the content, as hexadecimal.
+    content: The backed up content.
+    lexemes: zero_saver_core.backup_delta.lexemes() of the content, or None
+      if not decoded yet.
+  """
+
+  sha256: str
+  content: bytes
+  lexemes: object | None
+
+
+class _AppendLog:
+  """A log file of lines, only ever appended to or replaced as a whole, read
+  incrementally."""
+
+  def __init__(self, path: pathlib.Path):
+    self.path = path
+    # Identifies the file last read, and the offset of its first unread line.
+    self._identity: tuple[int, int] | None = None
+    self._offset = 0
+
+  @property
+  def found(self) -> bool:
+    """Whether the file existed when last read."""
+    return self._identity is not None
+
+  def read_new(self) -> tuple[bool, list[str]]:
+    """Returns whether the file was replaced since last read, and the complete
+    lines read since, every line of the file if replaced."""
+    try:
+      with open(self.path, 'rb') as f:
+        stat = os.fstat(f.fileno())
+        identity = (stat.st_dev, stat.st_ino)
+        replaced = identity != self._identity or stat.st_size < self._offset
+        if replaced:
+          self._identity, self._offset = identity, 0
+        elif stat.st_size == self._offset:
+          return False, []
+        f.seek(self._offset)
+        content = f.read()
+    except FileNotFoundError:
+      replaced = self.found
+      self._identity, self._offset = None, 0
+      return replaced, []
+    # A line cut short is read once complete, or ended by the next append.
+    complete = content[: content.rfind(b'\n') + 1]
+    self._offset += len(complete)
+    text = complete.decode('utf-8', errors='replace')
+    return replaced, [f'{line}\n' for line in text.split('\n')[:-1]]
+
+  def append(self, lines: Iterable[str]) -> None:
+    """Appends *lines*, after ending any line cut short by a crash."""
+    with open(self.path, 'a+b') as f:
+      if f.seek(0, os.SEEK_END):
+        f.seek(-1, os.SEEK_END)
+        if f.read(1) != b'\n':
+          f.write(b'\n')
+      f.write(''.join(lines).encode('utf-8'))
+
+  def replace(self, lines: Iterable[str]) -> None:
+    """Replaces the file with *lines*, which count as read."""
+    file_descriptor, temporary_file = tempfile.mkstemp(dir=self.path.parent)
+    with open(file_descriptor, 'w', encoding='utf-8', newline='\n') as f:
+      f.writelines(lines)
+      f.flush()
+      stat = os.fstat(f.fileno())
+    os.replace(temporary_file, self.path)
+    self._identity, self._offset = (stat.st_dev, stat.st_ino), stat.st_size
+
+
+class BackupStore:
+  """The backups stored in *directory*, keeping the *maximum_backups* latest
+  references. Older references, and the objects only they reference, are
+  deleted once the reference log holds COMPACTION_FACTOR * *maximum_backups*
+  references; until then, they are only left out of self.refs().
+
+  New objects are compressed with *compression*, at *level*. Levels range from
+  0 (1 for Compression.BZ2), the fastest, to 9, the smallest; None selects the
+  default level of the format. Raises ValueError if *level* is out of range.
+
+  If *keyframe_interval* is greater than 1, backups are stored as deltas
+  against the previous backup of the same save file, with a full keyframe
+  every *keyframe_interval* backups. Backed up files are then read into
+  memory, to be compared with the previous backup. The content of the last
+  backup of each save file is kept in memory, so a delta costs one parse of
+  the new content. Deltas save space, not time: each backup still costs more
+  than a full copy.
+
+  Concurrent processes may add backups, but rotation by one process may drop
+  a reference appended by another in the meantime. Objects left unlisted by
+  the manifest, e.g. by such races, are only deleted once self.repair() lists
+  them again.
+  """
+
+  def __init__(
+      self,
+      directory: StrPath,
+      *,
+      maximum_backups: int,
+      compression: Compression = Compression.NONE,
+      level: int | None = None,
+      keyframe_interval: int = 1,
+  ):
+    self.directory = pathlib.Path(directory)
+    self._maximum_backups = maximum_backups
+    check_level(compression, level)
+    self._codec = _CODECS[Compression(compression)]
+    self._level = level
+    self._keyframe_interval = keyframe_interval
+    self._refs_log = _AppendLog(self.directory.joinpath(REFS_FILE))
+    self._manifest = _AppendLog(self.directory.joinpath(MANIFEST_FILE))
+    # The content of both logs, as of their last read.
+    self._refs: list[BackupRef] = []
+    self._objects: dict[str, BackupObject] = {}
+    # The base of each listed object, None for full objects.
+    self._bases: dict[str, str | None] = {}
+    # The latest content backed up for each save file name, if diffed.
+    self._versions: dict[str, _Version] = {}
+
+  @property
+  def _objects_directory(self) -> pathlib.Path:
+    return self.directory.joinpath(OBJECTS_DIRECTORY)
+
+  def object_path(self, sha256: str) -> pathlib.Path | None:
+    """Returns the file holding the content with the SHA-256 hash *sha256*,
+    in any compression format or as a delta, as listed by the manifest, or None
+    if there is none."""
+    listing = self._current_objects().get(sha256)
+    if listing is None:
+      return None
+    return self._objects_directory.joinpath(listing.file_name)
+
+  def refs(self) -> list[BackupRef]:
+    """Returns the *maximum_backups* latest references of the reference log,
+    oldest first. Malformed lines, e.g. cut short by a crash, are skipped."""
+    return self._current_refs()[-self._maximum_backups :]
+
+  def objects(self) -> list[BackupObject]:
+    """Returns the objects listed by the manifest."""
+    return list(self._current_objects().values())
+
+  def repair(self) -> None:
+    """Rebuilds the manifest from a scan of the objects directory."""
+    objects: list[BackupObject] = []
+    try:
+      entries = list(os.scandir(self._objects_directory))
+    except FileNotFoundError:
+      entries = []
+    for entry in entries:
+      # Temporary files of objects being written are left out.
+      if len(entry.name.split('.', 1)[0]) != 64 or not entry.is_file():
+        continue
+      try:
+        stat = entry.stat()
+      except FileNotFoundError:
+        continue
+      objects.append(BackupObject(entry.name, stat.st_size, stat.st_mtime_ns))
+    if self.directory.is_dir():
+      self._manifest.replace(listing.to_line() for listing in objects)
+    self._objects = {listing.sha256: listing for listing in objects}
+    self._bases.clear()
+
+  def _current_refs(self) -> list[BackupRef]:
+    """Returns self._refs, updated with the lines appended to the reference log
+    since last read."""
+    replaced, lines = self._refs_log.read_new()
+    if replaced:
+      self._refs = []
+    for line in lines:
+      try:
+        self._refs.append(BackupRef.from_line(line))
+      except ValueError:
+        continue
+    return self._refs
+
+  def _current_objects(self) -> dict[str, BackupObject]:
+    """Returns self._objects, updated with the lines appended to the manifest
+    since last read."""
+    replaced, lines = self._manifest.read_new()
+    if not self._manifest.found and self._objects_directory.is_dir():
+      self.repair()
+      return self._objects
+    if replaced:
+      self._objects = {}
+      self._bases.clear()
+    for line in lines:
+      try:
+        listing = BackupObject.from_line(line)
+      except ValueError:
+        continue
+      self._objects[listing.sha256] = listing
+      self._bases.pop(listing.sha256, None)
+    return self._objects
+
+  def _stored(self, sha256: str, *, scan_if_unlisted: bool = False) -> bool:
+    """Whether the object *sha256* is stored. The manifest is repaired if the
+    object file disagrees with its listing or, if *scan_if_unlisted* is set,
+    is not listed."""
+    listing = self._current_objects().get(sha256)
+    if listing is not None:
+      try:
+        stat = os.stat(self._objects_directory.joinpath(listing.file_name))
+      except FileNotFoundError:
+        pass
+      else:
+        if (stat.st_size, stat.st_mtime_ns) == (
+            listing.size,
+            listing.mtime_ns,
+        ):
+          return True
+    elif not scan_if_unlisted:
+      return False
+    self.repair()
+    return sha256 in self._objects
+
+  def _list(self, path: pathlib.Path) -> None:
+    """Appends the object file *path* to the manifest."""
+    stat = path.stat()
+    listing = BackupObject(path.name, stat.st_size, stat.st_mtime_ns)
+    self._manifest.append([listing.to_line()])
+
+  def read(self, ref: BackupRef) -> bytes:
+    """Returns the content backed up by *ref*, decompressed, or rebuilt from
+    its keyframe if stored as a delta.
+
+    Raises:
+      OSError: If the content of *ref*, or of an object it depends on, cannot
+        be read.
+      ValueError: If the content of *ref* cannot be decompressed or rebuilt.
+    """
+    return self._content(ref.sha256)
+
+  def restore(self, ref: BackupRef, destination: StrPath) -> None:
+    """Replaces *destination* with the content backed up by *ref*. Full
+    objects are decompressed in a single streaming pass. *destination* is only
+    replaced once the content is completely written.
+
+    Raises:
+      See self.read().
+    """
+    path = self._existing_object(ref.sha256)
+    if path.name.endswith(DELTA_SUFFIX):
+      chunks: Iterator[bytes] = iter((self._content(ref.sha256),))
+    else:
+      chunks = self._decompressed(path)
+    directory = pathlib.PurePath(destination).parent
+    file_descriptor, temporary_file = tempfile.mkstemp(dir=directory)
+    try:
+      with os.fdopen(file_descriptor, 'wb') as f:
+        for chunk in chunks:
+          f.write(chunk)
+      os.replace(temporary_file, destination)
+    except BaseException:
+      os.remove(temporary_file)
+      raise
+
+  def _content(self, sha256: str) -> bytes:
+    path = self._existing_object(sha256)
+    if not path.name.endswith(DELTA_SUFFIX):
+      return b''.join(self._decompressed(path))
+    delta = json.loads(path.read_bytes())
+    try:
+      content = backup_delta.patch(
+          self._content(delta['base']), delta['edits']
+      )
+    except KeyError as e:
+      raise ValueError(f'Delta does not apply to its base: {path}') from e
+    if hashlib.sha256(content).hexdigest() != sha256:
+      raise ValueError(f'Corrupt backup delta: {path}')
+    return content
+
+  def _depth(self, sha256: str) -> int:
+    """The number of deltas between the object *sha256* and its keyframe."""
+    path = self._existing_object(sha256)
+    if not path.name.endswith(DELTA_SUFFIX):
+      return 0
+    return json.loads(path.read_bytes())['depth']
+
+  def _base(self, sha256: str) -> str | None:
+    """The base of the object *sha256*, as listed by self._objects, if stored
+    as a delta."""
+    if sha256 not in self._bases:
+      listing = self._objects.get(sha256)
+      if listing is None:
+        return None
+      base = None
+      if listing.file_name.endswith(DELTA_SUFFIX):
+        path = self._objects_directory.joinpath(listing.file_name)
+        base = json.loads(path.read_bytes())['base']
+      self._bases[sha256] = base
+    return self._bases[sha256]
+
+  def _existing_object(self, sha256: str) -> pathlib.Path:
+    path = (
+        self.object_path(sha256)
+        if self._stored(sha256, scan_if_unlisted=True)
+        else None
+    )
+    if path is None:
+      raise FileNotFoundError(f'Missing backup object: {sha256}')
+    return path
+
+  def _decompressed(
+      self,
+      path: pathlib.Path,
+      codec: _Codec | None = None,
+  ) -> Iterator[bytes]:
+    """Yields the decompressed content of the object *path*, compressed by
+    *codec*, which defaults to the codec of its suffix."""
+    if codec is None:
+      codec = next(
+          (
+              codec
+              for codec in _CODECS.values()
+              if codec.suffix and path.name.endswith(codec.suffix)
+          ),
+          _CODECS[Compression.NONE],
+      )
+    decompressor = codec.decompressor()
+    with open(path, 'rb') as f:
+      while chunk := f.read(BLOCKSIZE):
+        try:
+          yield decompressor.decompress(chunk)
+        except (zlib.error, lzma.LZMAError, OSError, EOFError) as e:
+          raise ValueError(f'Corrupt backup object: {path}') from e
+    if not decompressor.eof:
+      raise ValueError(f'Truncated backup object: {path}')
+
+  def _digest(self, path: pathlib.Path, codec: _Codec) -> str:
+    hash_function = hashlib.sha256()
+    for chunk in self._decompressed(path, codec):
+      hash_function.update(chunk)
+    return hash_function.hexdigest()
+
+  def add(
+      self,
+      content: bytes,
+      name: str,
+      *,
+      verify: bool = False,
+  ) -> BackupRef | None:
+    """Backs up *content*, the content of the save file *name*.
+
+    Args:
+      content: The content to back up.
+      name: The name of the backed up save file.
+      verify: If set, a newly stored copy is read back and compared to the
+        SHA-256 hash of *content* before it is recorded.
+
+    Returns:
+      The reference of the backup, or None if *verify* is set and the stored
+      copy does not match. Nothing is recorded in that case.
+
+    Raises:
+      OSError: If an error occurs while writing the backup.
+    """
+    sha256 = hashlib.sha256(content).hexdigest()
+    latest = self._latest(sha256, name)
+    if latest is not None:
+      return latest
+    if not self._stored(sha256) and not self._write_delta(
+        content, sha256, name
+    ):
+      temporary_file = self._write_temporary(
+          lambda f, compressor: f.write(compressor.compress(content))
+      )
+      if not self._publish(temporary_file, sha256, verify):
+        return None
+    version = self._versions.get(name)
+    if self._keyframe_interval > 1 and (
+        version is None or version.sha256 != sha256
+    ):
+      self._versions[name] = _Version(sha256, content, None)
+    return self._record(sha256, name)
+
+  def _write_delta(self, content: bytes, sha256: str, name: str) -> bool:
+    """Stores *content* as a delta against the previous backup of *name*,
+    unless a keyframe is due or no delta reproduces *content*.
+
+    Returns:
+      Whether the delta was stored.
+    """
+    if self._keyframe_interval <= 1:
+      return False
+    previous = next(
+        (ref for ref in reversed(self._current_refs()) if ref.name == name),
+        None,
+    )
+    if previous is None or not self._stored(previous.sha256):
+      return False
+    depth = self._depth(previous.sha256) + 1
+    if depth >= self._keyframe_interval:
+      return False
+    version = self._versions.get(name)
+    try:
+      if version is None or version.sha256 != previous.sha256:
+        version = _Version(
+            previous.sha256, self._content(previous.sha256), None
+        )
+      if version.lexemes is None:
+        version = dataclasses.replace(
+            version, lexemes=backup_delta.lexemes(version.content)
+        )
+      lexemes = backup_delta.lexemes(content)
+      edits = backup_delta.diff(
+          version.content,
+          content,
+          old_lexemes=version.lexemes,
+          new_lexemes=lexemes,
+      )
+    except ValueError:
+      # Either version is not JSON, or the previous backup is corrupt.
+      return False
+    if edits is None:
+      return False
+    delta = {'base': previous.sha256, 'depth': depth, 'edits': edits}
+    temporary_file = self._write_temporary(
+        lambda f, compressor: f.write(json.dumps(delta).encode('utf-8')),
+        codec=_CODECS[Compression.NONE],
+    )
+    object_path = self._objects_directory.joinpath(f'{sha256}{DELTA_SUFFIX}')
+    os.replace(temporary_file, object_path)
+    self._list(object_path)
+    self._versions[name] = _Version(sha256, content, lexemes)
+    return True
+
+  def add_file(
+      self,
+      source: StrPath,
+      name: str,
+      *,
+      verify: bool = False,
+      blocksize: int = BLOCKSIZE,
+  ) -> BackupRef | None:
+    """Backs up the file *source*, the save file *name*. The file is first
+    hashed, without being copied, so that content already stored costs no
+    writes. Otherwise, it is copied, hashed again and compressed in a single
+    pass.
+
+    Args:
+      source: The file to back up.
+      name: See self.add().
+      verify: See self.add().
+      blocksize: The number of bytes copied at a time.
+
+    Returns:
+      See self.add().
+
+    Raises:
+      OSError: If an error occurs while reading *source* or writing the
+        backup.
+    """
+    if self._keyframe_interval > 1:
+      return self.add(pathlib.Path(source).read_bytes(), name, verify=verify)
+    with open(source, 'rb', buffering=0) as source_file:
+      sha256 = hashlib.file_digest(source_file, 'sha256').hexdigest()
+    latest = self._latest(sha256, name)
+    if latest is not None:
+      return latest
+    if self._stored(sha256):
+      return self._record(sha256, name)
+    hash_function = hashlib.sha256()
+
+    def copy(f: BinaryIO, compressor: Any) -> None:
+      buffer = memoryview(bytearray(blocksize))
+      with open(source, 'rb', buffering=0) as source_file:
+        while size := source_file.readinto(buffer):
+          chunk = buffer[:size]
+          hash_function.update(chunk)
+          f.write(compressor.compress(chunk))
+
+    temporary_file = self._write_temporary(copy)
+    # *source* may have changed since it was first hashed.
+    sha256 = hash_function.hexdigest()
+    latest = self._latest(sha256, name)
+    if latest is not None or self._stored(sha256):
+      os.remove(temporary_file)
+    elif not self._publish(temporary_file, sha256, verify):
+      return None
+    return latest or self._record(sha256, name)
+
+  def _latest(self, sha256: str, name: str) -> BackupRef | None:
+    """Returns the latest reference if it already backs up *sha256*."""
+    refs = self._current_refs()
+    if refs and refs[-1].sha256 == sha256 and refs[-1].name == name:
+      if self._stored(sha256):
+        return refs[-1]
+    return None
+
+  def _record(self, sha256: str, name: str) -> BackupRef:
+    ref = BackupRef(datetime.datetime.now(), sha256, name)
+    self._refs_log.append([ref.to_line()])
+    refs = self._current_refs()
+    if len(refs) > COMPACTION_FACTOR * self._maximum_backups:
+      self._rotate(refs[-self._maximum_backups :])
+    return ref
+
+  def _write_temporary(
+      self,
+      write: Callable[[BinaryIO, Any], object],
+      codec: _Codec | None = None,
+  ) -> str:
+    """Writes a temporary object with *write*, passed the file and the
+    compressor of *codec*, which defaults to the codec of the store, the
+    content must go through."""
+    codec = codec if codec else self._codec
+    self._objects_directory.mkdir(parents=True, exist_ok=True)
+    file_descriptor, temporary_file = tempfile.mkstemp(
+        dir=self._objects_directory
+    )
+    try:
+      with os.fdopen(file_descriptor, 'wb') as f:
+        compressor = codec.compressor(self._level)
+        write(f, compressor)
+        f.write(compressor.flush())
+    except BaseException:
+      os.remove(temporary_file)
+      raise
+    return temporary_file
+
+  def _publish(self, temporary_file: str, sha256: str, verify: bool) -> bool:
+    """Moves *temporary_file* to the object *sha256*, unless *verify* is set
+    and its content does not match."""
+    object_path = self._objects_directory.joinpath(
+        f'{sha256}{self._codec.suffix}'
+    )
+    try:
+      if verify:
+        try:
+          digest = self._digest(pathlib.Path(temporary_file), self._codec)
+        except ValueError:
+          return False
+        if digest != sha256:
+          return False
+      os.replace(temporary_file, object_path)
+      self._list(object_path)
+    finally:
+      if os.path.exists(temporary_file):
+        os.remove(temporary_file)
+    return True
+
+  def _rotate(self, kept: list[BackupRef]) -> None:
+    self._refs_log.replace(ref.to_line() for ref in kept)
+    self._refs = kept
+    objects = self._current_objects()
+    referenced: set[str] = set()
+    for ref in kept:
+      dependency: str | None = ref.sha256
+      while dependency is not None and dependency not in referenced:
+        referenced.add(dependency)
+        dependency = self._base(dependency)
+    for sha256, listing in objects.items():
+      if sha256 not in referenced:
+        try:
+          os.remove(self._objects_directory.joinpath(listing.file_name))
+        except FileNotFoundError:
+          pass
+    self._objects = {
+        sha256: listing
+        for sha256, listing in objects.items()
+        if sha256 in referenced
+    }
+    self._bases = {
+        sha256: base
+        for sha256, base in self._bases.items()
+        if sha256 in referenced
+    }
+    self._manifest.replace(
+        listing.to_line() for listing in self._objects.values()
+    )
@@ -0,0 +1,209 @@
+# Copyright 2023 The Zero Saver Authors. All Rights Reserved.
+#
+# This file is part of Zero Saver.
+#
+# Zero Saver is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later
+# version.
+#
+# Zero Saver is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR
+# A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# Zero Saver. If not, see <https://www.gnu.org/licenses/>.
+"""Append-only journal of the edits made to a "ZERO Sievert" save.
+
+Recording an edit appends a single line to the journal, instead of rewriting
+the whole save file. The journal is replayed on top of the save file when the
+save is next loaded, and compacted by writing the save file.
+
+The journal is a JSON Lines file. Its first line identifies the save file it
+applies to:
+
+  {"base": "<SHA-256 of the save file, as hexadecimal>"}
+
+Each following line is an edit of the value at a key path:
+
+  {"set": ["data", "difficulty", "edited"], "value": "value"}
+  {"delete": ["data", "stash", "items", 3]}
+
+A line cut short by a crash is dropped on replay. Journals whose base does not
+match the save file, e.g. as the game saved in the meantime, are set aside
+with the suffix STALE_SUFFIX instead of being replayed.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import pathlib
+from collections.abc import Callable, Sequence
+from typing import Any, TYPE_CHECKING
+
+if TYPE_CHECKING:
+  from _typeshed import StrPath
+
+DEFAULT_MAXIMUM_SIZE = 2**20
+STALE_SUFFIX = '.stale'
+KeyPath = Sequence[str | int]
+Loads = Callable[..., Any]
+Dumps = Callable[[Any], str]
+
+
+def journal_path(directory: StrPath, save_path: StrPath) -> pathlib.Path:
+  """Returns the path of the journal of the save file *save_path* in
+  *directory*. Journals are named by the hash of the absolute path of their
+  save file, so that save files of the same name do not share journals."""
+  absolute_path = os.path.abspath(save_path)
+  name = hashlib.sha256(absolute_path.encode('utf-8')).hexdigest()[:32]
+  return pathlib.Path(directory, f'{name}.journal')
+
+
+def _parent(save: Any, key_path: KeyPath) -> Any:
+  if not key_path:
+    raise ValueError('Key path must not be empty.')
+  parent = save
+  for key in key_path[:-1]:
+    parent = parent[key]
+  return parent
+
+
+def _header(base: bytes) -> bytes:
+  return json.dumps({'base': base.hex()}).encode('utf-8') + b'\n'
+
+
+def apply_set(save: Any, key_path: KeyPath, value: Any) -> None:
+  """Sets the value at *key_path* of *save*. Setting the index one past the end
+  of a list appends to it.
+
+  Raises:
+    KeyError: If a parent of the value does not exist.
+    IndexError: If a list index is out of range.
+    TypeError: If a key does not match the type of its container.
+    ValueError: If *key_path* is empty.
+  """
+  parent = _parent(save, key_path)
+  key = key_path[-1]
+  if isinstance(parent, list) and key == len(parent):
+    parent.append(value)
+  else:
+    parent[key] = value
+
+
+def apply_delete(save: Any, key_path: KeyPath) -> None:
+  """Deletes the value at *key_path* of *save*.
+
+  Raises:
+    See zero_saver_core.edit_journal.apply_set().
+  """
+  del _parent(save, key_path)[key_path[-1]]
+
+
+class EditJournal:
+  """The journal file at *path*, holding at most about *maximum_size* bytes of
+  edits before self.is_full.
+
+  Each record is flushed to storage before returning, unless *fsync* is
+  unset.
+  """
+
+  def __init__(
+      self,
+      path: StrPath,
+      *,
+      maximum_size: int = DEFAULT_MAXIMUM_SIZE,
+      fsync: bool = True,
+  ):
+    self.path = pathlib.Path(path)
+    self._maximum_size = maximum_size
+    self._fsync = fsync
+    self._size = 0
+
+  @property
+  def size(self) -> int:
+    """The number of bytes of the journal file, as last read or written."""
+    return self._size
+
+  @property
+  def is_full(self) -> bool:
+    return self._size >= self._maximum_size
+
+  def start(self, base: bytes) -> None:
+    """Replaces the journal with an empty journal of the save file with the
+    SHA-256 hash *base*."""
+    header = _header(base)
+    self.path.parent.mkdir(parents=True, exist_ok=True)
+    with open(self.path, 'wb') as f:
+      self._write(f, header)
+    self._size = len(header)
+
+  def replay(
+      self,
+      save: Any,
+      base: bytes,
+      loads: Loads,
+      parse_float: Callable[[str], Any],
+  ) -> int:
+    """Applies the edits of the journal to *save*, decoded from the save file
+    with the SHA-256 hash *base*. Starts an empty journal if there is none,
+    or if the journal applies to another save file.
+
+    Returns:
+      The number of edits applied.
+
+    Raises:
+      OSError: If an error occurs while accessing the journal.
+      ValueError: If a complete line of the journal is not valid JSON, or
+        an edit does not apply to *save*.
+    """
+    try:
+      content = self.path.read_bytes()
+    except FileNotFoundError:
+      self.start(base)
+      return 0
+    complete = content[: content.rfind(b'\n') + 1]
+    lines = complete.splitlines()
+    if not complete.startswith(_header(base)):
+      os.replace(self.path, f'{self.path}{STALE_SUFFIX}')
+      self.start(base)
+      return 0
+    for line in lines[1:]:
+      edit = loads(line, parse_float=parse_float)
+      try:
+        if 'set' in edit:
+          apply_set(save, edit['set'], edit['value'])
+        else:
+          apply_delete(save, edit['delete'])
+      except (KeyError, IndexError, TypeError) as e:
+        raise ValueError(f'Edit does not apply to save: {line!r}') from e
+    if len(complete) != len(content):
+      # Drops the torn line of an interrupted record.
+      with open(self.path, 'r+b') as f:
+        f.truncate(len(complete))
+    self._size = len(complete)
+    return len(lines) - 1
+
+  def record_set(self, key_path: KeyPath, value: Any, dumps: Dumps) -> None:
+    """Appends setting the value at *key_path* to *value*, encoded by
+    *dumps*."""
+    self._append(
+        f'{{"set": {json.dumps(list(key_path))}, "value": {dumps(value)}}}\n'
+    )
+
+  def record_delete(self, key_path: KeyPath) -> None:
+    """Appends deleting the value at *key_path*."""
+    self._append(f'{{"delete": {json.dumps(list(key_path))}}}\n')
+
+  def _append(self, line: str) -> None:
+    encoded = line.encode('utf-8')
+    with open(self.path, 'ab') as f:
+      self._write(f, encoded)
+    self._size += len(encoded)
+
+  def _write(self, f: Any, content: bytes) -> None:
+    f.write(content)
+    if self._fsync:
+      f.flush()
+      os.fsync(f.fileno())
@@ -20,22 +20,23 @@ presenting lexed content.
 "ZERO Sievert" saves must be in the form of JSON."""
 from __future__ import annotations
 
+import asyncio
 import contextlib
-import datetime
+import dataclasses
 import decimal
 import enum
+import functools
 import hashlib
 import io
-import itertools
 import json
+import mmap
 import os
 import pathlib
 import platform
 import tempfile
-import uuid
 import winreg
-import cmath
-from collections.abc import Iterator, Mapping, Sequence
+from collections.abc import Callable, Iterable, Iterator, Mapping, Sequence
+from concurrent import futures
 from typing import Any, BinaryIO, Literal, overload, TextIO, TYPE_CHECKING, TypeAlias, TypeVar
 
 import pydantic
@@ -43,10 +44,21 @@ import pydantic
 from zero_saver_core.exceptions import winreg_errors
 from zero_saver_core.save_golden_files import verifier
 from zero_saver_core.save_golden_files import typed_dict_0_31_production
-from zero_saver_core import monkey_patch_json
+from zero_saver_core import backup_store
+from zero_saver_core import edit_journal
+from zero_saver_core import json_backend
+from zero_saver_core import lazy_decimal
+from zero_saver_core import lazy_save
+from zero_saver_core import number_pool
+from zero_saver_core import output_sink
+from zero_saver_core import parallel_encode
+from zero_saver_core import save_index
+from zero_saver_core import splice
+from zero_saver_core import tracing
+from zero_saver_core import tracked
 
 if TYPE_CHECKING:
-  from _typeshed import StrOrBytesPath, StrPath
+  from _typeshed import StrPath
 
   _T = TypeVar('_T')
   _S = TypeVar('_S')
@@ -61,10 +73,13 @@ if TYPE_CHECKING:
   ZeroSievertChest: TypeAlias = typed_dict_0_31_production.Chest
   ZeroSievertSave: TypeAlias = typed_dict_0_31_production.Model
 
-# The maximum number of files located in the backup repository used by
-# FileLocation. WARNING: Any files exceeding this limit will be deleted,
-# starting from oldest.
+# The maximum number of backups referenced by the backup store of
+# GameDataIO. WARNING: Any backups exceeding this limit will be deleted,
+# starting from oldest, once backup_store.COMPACTION_FACTOR times as many
+# accumulate.
 MAXIMUM_NUMBER_OF_BACKUPS = 10
+# The number of saves queued per worker process by GameDataIO.load_many().
+_LOAD_MANY_QUEUE_DEPTH = 4
 
 
 class WindowsArchitecture(enum.StrEnum):
@@ -72,6 +87,24 @@ class WindowsArchitecture(enum.StrEnum):
   BITS_32 = '32bit'
 
 
+class Durability(enum.StrEnum):
+  """How much of a write is flushed to storage before it is reported complete.
+
+  NONE leaves flushing to the operating system. Other processes still see
+  either the previous file or the whole write, but after a crash, the save file
+  may be empty or truncated, as the replacement may reach storage before the
+  written content. FILE flushes the written file before it replaces the
+  previous one, so that a crash leaves either file intact. FILE_AND_DIRECTORY
+  also flushes the directory entry of the replaced file, so that the write
+  survives a crash once completed. Windows does not allow directories to be
+  flushed, and is limited to FILE.
+  """
+
+  NONE = 'none'
+  FILE = 'file'
+  FILE_AND_DIRECTORY = 'file+directory'
+
+
 def _read_registry_value(
     key_path: StrPath,
     value_name: str,
@@ -191,66 +224,21 @@ class FileLocation:
         pass
 
 
-def _current_datetime_as_valid_filename() -> str:
-  current_datetime = datetime.datetime.now().isoformat(
-      sep='H', timespec='minutes'
-  )
-  return current_datetime.replace(':', 'M')
+# The size, modification time and inode of a file.
+_StatKey: TypeAlias = tuple[int, int, int]
+# A backup to read: the directory of its store, and its reference.
+_Backup: TypeAlias = tuple[pathlib.Path, backup_store.BackupRef]
 
 
-def _iterator_length(iterator: Iterator[Any]) -> int:
-  itertools_count = itertools.count()
-  for iteration in zip(iterator, itertools_count):
-    del iteration  # unused
-  return next(itertools_count)
+def _stat_key(stat: os.stat_result) -> _StatKey:
+  return stat.st_size, stat.st_mtime_ns, stat.st_ino
 
 
-def _delete_oldest_file(directory: StrPath) -> None:
-  """
-
-  Args:
-    directory:
-
-  Returns:
-
-  Raises:
-    ValueError: If directory specifies a an empty directory.
-  """
-  oldest_time = cmath.inf
-  oldest_file: os.DirEntry[str] | None = None
-  for file in os.scandir(directory):
-    last_modified_time = os.stat(file).st_mtime_ns
-    if last_modified_time < oldest_time:
-      oldest_time = last_modified_time
-      oldest_file = file
-  if oldest_file is None:
-    raise ValueError(f'Found an empty directory: {directory}')
-  try:
-    os.remove(oldest_file.path)
-  except FileNotFoundError:
-    pass
-
-
-def _files_match(*files: StrOrBytesPath, blocksize: int = 2**20) -> bool:
-  """
-
-  Args:
-    *files:
-    blocksize:
-
-  Returns:
-
-  Raises:
-    IndexError: If no files are passed in.
-  """
-  hashes: list[bytes] = []
-  for file in files:
-    hash_function = hashlib.sha256()
-    with open(file, 'rb') as f:
-      while chunk := f.read(blocksize):
-        hash_function.update(chunk)
-    hashes.append(hash_function.digest())
-  return hashes.count(hashes[0]) == len(hashes)
+def _file_sha256(f: BinaryIO, blocksize: int = 2**20) -> bytes:
+  hash_function = hashlib.sha256()
+  while chunk := f.read(blocksize):
+    hash_function.update(chunk)
+  return hash_function.digest()
 
 
 @overload
@@ -265,6 +253,9 @@ def _atomic_write(
     newline: str | None = '',
     closefd: bool = True,
     opener: Any = None,
+    *,
+    durability: Durability = Durability.FILE,
+    tracers: Sequence[tracing.Tracer] = (),
 ) -> Iterator[BinaryIO]:
   ...
 
@@ -281,6 +272,9 @@ def _atomic_write(
     newline: str | None = '',
     closefd: bool = True,
     opener: Any = None,
+    *,
+    durability: Durability = Durability.FILE,
+    tracers: Sequence[tracing.Tracer] = (),
 ) -> Iterator[TextIO]:
   ...
 
@@ -296,6 +290,9 @@ def _atomic_write(
     newline: str | None = None,
     closefd: bool = True,
     opener: Any = None,
+    *,
+    durability: Durability = Durability.FILE,
+    tracers: Sequence[tracing.Tracer] = (),
 ) -> Iterator[TextIO | BinaryIO]:
   directory = pathlib.PurePath(file_path).parent
   file_descriptor, temporary_file = tempfile.mkstemp(dir=directory)
@@ -318,66 +315,508 @@ def _atomic_write(
     raise e
   else:
     f.flush()
-    os.fsync(f.fileno())
+    if durability != Durability.NONE:
+      with tracing.trace(tracers, tracing.Stage.FSYNC):
+        os.fsync(f.fileno())
     f.close()
-  os.replace(temporary_file, file_path)
+  with tracing.trace(tracers, tracing.Stage.REPLACE):
+    os.replace(temporary_file, file_path)
+  if (
+      durability == Durability.FILE_AND_DIRECTORY
+      and platform.system() != 'Windows'
+  ):
+    with tracing.trace(tracers, tracing.Stage.FSYNC_DIRECTORY):
+      _fsync_directory(directory)
+
+
+def _fsync_directory(directory: StrPath) -> None:
+  file_descriptor = os.open(directory, os.O_RDONLY)
+  try:
+    os.fsync(file_descriptor)
+  finally:
+    os.close(file_descriptor)
 
 
 class GameDataIO:
   """Lexer for converting "ZERO Sievert" save files to python objects. All data
-  is preserved; self.save is 1:1 with the input save file."""
+  is preserved; self.save is 1:1 with the input save file.
+
+  If *lazy* is set, the sections of self.save['data'] are only decoded on first
+  access. See zero_saver_core.lazy_save.LazySections for implementation
+  details.
+
+  If *use_mmap* is set, the save file is memory-mapped and decoded directly from
+  the mapped bytes instead of being read into an intermediate buffer. Combined
+  with *lazy*, only the bytes of accessed sections are ever copied; the mapping
+  is kept open until the save is written.
+
+  If *lazy_numbers* is set, numbers are lexed as
+  zero_saver_core.lazy_decimal.LazyDecimal instead of decimal.Decimal. The
+  original lexeme of unmodified numbers is written back unchanged. Either way,
+  equal numbers share one object, interned in a process-wide pool of
+  zero_saver_core.number_pool.
+
+  If *track_changes* is set, self.save records which sections of
+  self.save['data'] are modified. The encoded text of unmodified sections is
+  reused by the next write, so that small edits are written without re-encoding
+  the whole save. See zero_saver_core.tracked for implementation details.
+  Cannot be combined with *lazy*.
+
+  If *splice_writes* is set, writes copy the bytes of the save file as last
+  read or written, replacing only the values of self.save that changed. The
+  formatting of the game is kept for every unmodified value. See
+  zero_saver_core.splice for implementation details. Cannot be combined with
+  *track_changes* or *encode_executor*.
+
+  If *encode_executor* is set, the sections of self.save['data'] are encoded
+  as separate tasks of *encode_executor*; only a
+  concurrent.futures.ProcessPoolExecutor encodes them simultaneously. See
+  zero_saver_core.parallel_encode for implementation details. Cannot be
+  combined with *splice_writes*.
+
+  If *write_executor* is set, self.write_save_file() verifies, backs up and
+  encodes the save as three concurrent tasks of *write_executor*, and writes
+  the save file only once all three succeed. Hashing, compression and file I/O
+  release the GIL, so the backup overlaps with verification and encoding.
+  Tracers are then called from the threads of *write_executor*. Cannot be
+  *encode_executor*, whose tasks would wait for workers of the same pool.
+
+  If *journal* is set, edits made through self.set_value() and
+  self.delete_value() are appended to a journal instead of rewriting the save
+  file, and replayed whenever the save file is read. The journal is compacted by
+  self.write_save_file(), which is called once the journal grows past
+  zero_saver_core.edit_journal.DEFAULT_MAXIMUM_SIZE bytes. It is kept in the
+  backup directory. See zero_saver_core.edit_journal for implementation
+  details.
+
+  Backups of the save file are hashed first, and only copied and compressed
+  with *backup_compression* at *backup_compression_level* if the backup store
+  does not hold that content yet. If *verify_backups* is set, each new backup
+  is also read back and compared to the hash of the save file. If
+  *backup_keyframe_interval* is greater than 1, backups are stored as
+  structural deltas against the previous backup, with a full backup every
+  *backup_keyframe_interval* backups. Deltas take less disk space than full
+  backups, but more time to write. See zero_saver_core.backup_store for
+  implementation details.
+
+  Each stage of reading and writing the save file, e.g. parsing or fsync, is
+  timed and reported to every tracer of self.tracers, starting with *tracers*.
+  See zero_saver_core.tracing for implementation details.
+
+  Saves are parsed and serialized by *backend*, which defaults to the fastest
+  installed backend reproducing saves exactly. See
+  zero_saver_core.json_backend.select_backend() for implementation details.
+
+  The default save and backup paths are only looked up, using
+  zero_saver_core.game_data_io.FileLocation, once they are needed.
+
+  Methods suffixed with "_async" run their blocking counterpart in an
+  executor, without blocking the event loop. self.save must not be modified
+  while such a method is awaited."""
 
   def __init__(
       self,
       save_path: StrPath | None = '',
       backup_path: StrPath | None = '',
+      *,
+      lazy: bool = False,
+      use_mmap: bool = False,
+      lazy_numbers: bool = False,
+      backend: json_backend.JsonBackend | None = None,
+      track_changes: bool = False,
+      splice_writes: bool = False,
+      encode_executor: futures.Executor | None = None,
+      write_executor: futures.ThreadPoolExecutor | None = None,
+      tracers: Iterable[tracing.Tracer] = (),
+      journal: bool = False,
+      verify_backups: bool = False,
+      backup_compression: backup_store.Compression = (
+          backup_store.Compression.NONE
+      ),
+      backup_compression_level: int | None = None,
+      backup_keyframe_interval: int = 1,
   ):
-    file_locations = FileLocation()
+    if lazy and track_changes:
+      raise ValueError('track_changes cannot be combined with lazy.')
+    if track_changes and splice_writes:
+      raise ValueError('track_changes cannot be combined with splice_writes.')
+    if splice_writes and encode_executor is not None:
+      raise ValueError('encode_executor cannot be combined with splice_writes.')
+    if write_executor is not None and write_executor is encode_executor:
+      raise ValueError('write_executor cannot be encode_executor.')
+    backup_store.check_level(backup_compression, backup_compression_level)
     self._save_path = (
-        pathlib.Path(save_path) if save_path else file_locations.save_path
+        pathlib.Path(save_path) if save_path else self._file_locations.save_path
     )
-    self._backup_path = (
-        pathlib.Path(backup_path) if backup_path else file_locations.backup_path
+    self._requested_backup_path = (
+        pathlib.Path(backup_path) if backup_path else None
     )
-    self.save: ZeroSievertSave = self._read_save_file()
+    self._lazy = lazy
+    self._use_mmap = use_mmap
+    self._lazy_numbers = lazy_numbers
+    self._backend = backend if backend else json_backend.default_backend()
+    self._save_mapping: mmap.mmap | None = None
+    # Serializes write_save_file_async() calls.
+    self._write_lock = asyncio.Lock()
+    # Identify the content of the save file self.save was last synchronized
+    # with. See self.reload().
+    self._loaded_stat: _StatKey | None = None
+    self._loaded_sha256: bytes | None = None
+    self._section_cache = tracked.SectionCache() if track_changes else None
+    self._splice_writes = splice_writes
+    self._encode_executor = encode_executor
+    self._write_executor = write_executor
+    # The bytes of the save file as last read or written, and the parse_float
+    # self.save was decoded with. See self.write_save_file().
+    self._splice_source: tuple[bytes, lazy_save.ParseFloat] | None = None
+    self.tracers: list[tracing.Tracer] = list(tracers)
+    self._verify_backups = verify_backups
+    self._backup_compression = backup_compression
+    self._backup_compression_level = backup_compression_level
+    self._backup_keyframe_interval = backup_keyframe_interval
+    self._journal = (
+        edit_journal.EditJournal(
+            edit_journal.journal_path(self._backup_path, self._save_path)
+        )
+        if journal
+        else None
+    )
+    self.save: ZeroSievertSave = self._load_save_file()
+
+  @functools.cached_property
+  def _file_locations(self) -> FileLocation:
+    return FileLocation()
+
+  @property
+  def _backup_path(self) -> pathlib.Path:
+    if self._requested_backup_path is None:
+      return self._file_locations.backup_path
+    return self._requested_backup_path
+
+  @functools.cached_property
+  def _backup_store(self) -> backup_store.BackupStore:
+    # Kept across backups, so that only the log lines appended since the last
+    # backup are read.
+    return backup_store.BackupStore(
+        self._backup_path,
+        maximum_backups=MAXIMUM_NUMBER_OF_BACKUPS,
+        compression=self._backup_compression,
+        level=self._backup_compression_level,
+        keyframe_interval=self._backup_keyframe_interval,
+    )
+
+  @classmethod
+  def load_many(
+      cls,
+      save_paths: StrPath | Iterable[StrPath],
+      *,
+      max_workers: int | None = None,
+      verify: bool = False,
+      extract: Callable[[ZeroSievertSave], Any] | None = None,
+      lazy_numbers: bool = False,
+      backend: json_backend.JsonBackend | None = None,
+  ) -> Iterator[LoadResult]:
+    """Reads many save files in parallel, using a process pool.
+
+    Saves are read in worker processes and yielded in order of completion, not
+    in the order of *save_paths*. Only a few saves per worker are queued at a
+    time, so *save_paths* may be an arbitrarily long iterable.
+
+    Sending a save back from a worker costs about as much as parsing it. Work
+    done per save, such as *verify* and *extract*, is what gets parallelized.
+
+    Args:
+      save_paths: The save files to read, or a directory whose files are all
+        read. The backups of a backup directory, holding a
+        zero_saver_core.backup_store.BackupStore, are read instead, oldest
+        first; LoadResult.save_path is then the object file of each backup,
+        decompressed or rebuilt from its deltas before being read.
+      max_workers: The number of worker processes. Defaults to the number of
+        processors.
+      verify: If set, each save is checked with
+        zero_saver_core.game_data_io.GameDataIO.verify_save_integrity() in
+        its worker. Failing saves are reported as errors.
+      extract: If set, called with each save in its worker. Only the returned
+        value is sent back, as LoadResult.save. Must be picklable, e.g. a
+        module-level function.
+      lazy_numbers: See zero_saver_core.game_data_io.GameDataIO.
+      backend: See zero_saver_core.game_data_io.GameDataIO. The backend is
+        selected once, in the calling process, and must be picklable.
+
+    Yields:
+      A zero_saver_core.game_data_io.LoadResult for every save file. Failing
+      to read a save file does not interrupt the remaining reads.
+
+    Raises:
+      OSError: If *save_paths* is a directory that cannot be listed.
+    """
+    sources: Iterable[tuple[pathlib.Path, _Backup | None]]
+    if isinstance(save_paths, (str, os.PathLike)):
+      directory = pathlib.Path(save_paths)
+      if directory.joinpath(backup_store.REFS_FILE).is_file():
+        sources = _list_backups(directory)
+      else:
+        sources = (
+            (path, None)
+            for path in sorted(directory.iterdir())
+            if path.is_file()
+        )
+    else:
+      sources = ((pathlib.Path(path), None) for path in save_paths)
+    if backend is None:
+      backend = json_backend.default_backend()
+    queue_depth = (max_workers or os.cpu_count() or 1) * _LOAD_MANY_QUEUE_DEPTH
+    with futures.ProcessPoolExecutor(max_workers) as executor:
+      pending: dict[futures.Future[LoadResult], pathlib.Path] = {}
+      for save_path, backup in sources:
+        if len(pending) >= queue_depth:
+          yield from _collect_completed(pending)
+        future = executor.submit(
+            _load_one_save_file,
+            save_path,
+            verify=verify,
+            extract=extract,
+            lazy_numbers=lazy_numbers,
+            backend=backend,
+            backup=backup,
+        )
+        pending[future] = save_path
+      while pending:
+        yield from _collect_completed(pending)
+
+  @classmethod
+  async def open_async(
+      cls,
+      save_path: StrPath | None = '',
+      backup_path: StrPath | None = '',
+      *,
+      executor: futures.Executor | None = None,
+      **options: Any,
+  ) -> GameDataIO:
+    """Asynchronous counterpart of the constructor. Reads the save file in
+    *executor*, which defaults to the default executor of the running loop.
+
+    Args:
+      save_path: See zero_saver_core.game_data_io.GameDataIO.
+      backup_path: See zero_saver_core.game_data_io.GameDataIO.
+      executor: The executor reading the save file.
+      **options: Keyword arguments of the constructor.
+
+    Returns:
+      The new instance.
+    """
+    return await _run_in_executor(
+        executor, cls, save_path, backup_path, **options
+    )
+
+  def _load_save_file(self) -> ZeroSievertSave:
+    save = self._read_save_file()
+    if self._journal is not None:
+      assert self._loaded_sha256 is not None
+      self._journal.replay(
+          save, self._loaded_sha256, self._loads, self._parse_float()
+      )
+    return self._track(save)
 
   def _read_save_file(
       self,
   ) -> ZeroSievertSave:
-    with open(self._save_path, 'r', encoding='utf-8') as f:
-      return json.load(f, parse_float=decimal.Decimal)
+    if self._use_mmap:
+      return self._read_mapped_save_file()
+    with tracing.trace(self.tracers, tracing.Stage.READ) as measurement:
+      with open(self._save_path, 'rb') as f:
+        stat = os.fstat(f.fileno())
+        raw = f.read()
+      measurement.size = len(raw)
+    parse_float = self._parse_float()
+    with tracing.trace(self.tracers, tracing.Stage.PARSE) as measurement:
+      measurement.size = len(raw)
+      if self._lazy:
+        save = lazy_save.loads(raw, parse_float=parse_float, loads=self._loads)
+      else:
+        save = self._loads(raw, parse_float=parse_float)
+    self._record_loaded_file(stat, raw, parse_float)
+    return save
+
+  @property
+  def _loads(self) -> json_backend.Loads:
+    loads = self._backend.loads
+    if loads is None:
+      raise ValueError(f'JSON backend cannot parse: {self._backend.name}')
+    return loads
+
+  @property
+  def _dumps(self) -> json_backend.Dumps:
+    dumps = self._backend.dumps
+    if dumps is None:
+      raise ValueError(f'JSON backend cannot serialize: {self._backend.name}')
+    return dumps
+
+  def _parse_float(self) -> lazy_save.ParseFloat:
+    if self._lazy_numbers:
+      return number_pool.LAZY_DECIMAL_POOL.__getitem__
+    return number_pool.DECIMAL_POOL.__getitem__
+
+  def _read_mapped_save_file(self) -> ZeroSievertSave:
+    parse_float = self._parse_float()
+    with tracing.trace(self.tracers, tracing.Stage.READ) as measurement:
+      with open(self._save_path, 'rb') as f:
+        stat = os.fstat(f.fileno())
+        try:
+          content: bytes | mmap.mmap = mmap.mmap(
+              f.fileno(), 0, access=mmap.ACCESS_READ
+          )
+        except ValueError:
+          # Empty files cannot be mapped.
+          content = f.read()
+      measurement.size = len(content)
+    if not isinstance(content, mmap.mmap):
+      with tracing.trace(self.tracers, tracing.Stage.PARSE) as measurement:
+        measurement.size = len(content)
+        save = self._loads(content, parse_float=parse_float)
+      self._record_loaded_file(stat, content, parse_float)
+      return save
+    mapping = content
+    if not self._lazy:
+      with mapping:
+        with tracing.trace(self.tracers, tracing.Stage.PARSE) as measurement:
+          measurement.size = len(mapping)
+          save = self._loads(str(mapping, 'utf-8'), parse_float=parse_float)
+        self._record_loaded_file(stat, mapping, parse_float)
+      return save
+    try:
+      with tracing.trace(self.tracers, tracing.Stage.PARSE) as measurement:
+        measurement.size = len(mapping)
+        save = lazy_save.loads(
+            mapping, parse_float=parse_float, loads=self._loads
+        )
+    except ValueError:
+      mapping.close()
+      raise
+    self._save_mapping = mapping
+    self._record_loaded_file(stat, mapping, parse_float)
+    return save
+
+  def _track(self, save: ZeroSievertSave) -> ZeroSievertSave:
+    if self._section_cache is None:
+      return save
+    return self._section_cache.track(save)
+
+  def _record_loaded_file(
+      self,
+      stat: os.stat_result,
+      content: bytes | mmap.mmap,
+      parse_float: lazy_save.ParseFloat,
+  ) -> None:
+    self._loaded_stat = _stat_key(stat)
+    self._loaded_sha256 = hashlib.sha256(content).digest()
+    if self._splice_writes:
+      self._splice_source = bytes(content), parse_float
 
-  def _backup_save_file(self, *, safe_uuid: Any = None) -> bool:
-    """Assumes that self._backup_path does not contain any files besides
-    backups. This includes subdirectories and symbolic links.
+  def reload(self) -> bool:
+    """Re-reads the save file if it changed since it was last read or written,
+    replacing self.save. Unsaved modifications of self.save are discarded.
 
-    Due to usage of uuid.uuid4(), this function is not multiprocessing-safe. If
-    multiprocessing, a user-generated *safe_uuid* can be provided.
+    The save file is assumed unchanged if its size, modification time and
+    inode are unchanged. Otherwise, its SHA-256 hash is compared, so that
+    rewriting identical content does not trigger a reparse.
+
+    Returns:
+      True if self.save was replaced, False if the save file is unchanged.
+
+    Raises:
+      OSError: If an error occurs while accessing the save file.
+      ValueError: If the save file is not valid JSON.
     """
-    backup_path = self._backup_path
-    save_path = self._save_path
-    backup_filename = (
-        f'{save_path.name}'
-        f'-{_current_datetime_as_valid_filename()}'
-        f'-{safe_uuid if safe_uuid else uuid.uuid4()}'
-        f'.dat'
+    stat = os.stat(self._save_path)
+    if self._loaded_stat == _stat_key(stat):
+      return False
+    with tracing.trace(self.tracers, tracing.Stage.READ) as measurement:
+      with open(self._save_path, 'rb') as f:
+        stat = os.fstat(f.fileno())
+        sha256 = _file_sha256(f)
+      measurement.size = stat.st_size
+    if sha256 == self._loaded_sha256:
+      self._loaded_stat = _stat_key(stat)
+      return False
+    self._release_save_mapping()
+    self.save = self._load_save_file()
+    return True
+
+  def forget_loaded_file(self) -> None:
+    """Forgets which version of the save file self.save was synchronized with,
+    so that the next self.reload() re-reads the save file."""
+    self._loaded_stat = None
+    self._loaded_sha256 = None
+
+  def _release_save_mapping(self) -> None:
+    """Decodes any sections still backed by the mapped save file and closes the
+    mapping. Windows does not allow a mapped file to be replaced."""
+    if self._save_mapping is None:
+      return
+    lazy_save.detach(self.save)
+    self._save_mapping.close()
+    self._save_mapping = None
+
+  def index_save_file(
+      self,
+      cache_directory: StrPath | None = None,
+      *,
+      max_depth: int | None = save_index.DEFAULT_MAX_DEPTH,
+  ) -> save_index.SaveIndex:
+    """Indexes the byte span of the values in the save file on disk, allowing
+    single values to be decoded without reading the whole save.
+
+    Args:
+      cache_directory: If set, the index is persisted in *cache_directory* and
+        reused while the save file is unchanged.
+      max_depth: Values nested deeper than *max_depth* keys are located within
+        their deepest indexed container when decoded. None indexes every value.
+
+    Returns:
+      The index of the save file. See zero_saver_core.save_index.load_index()
+      for implementation details.
+    """
+    return save_index.load_index(
+        self._save_path, cache_directory, max_depth=max_depth
     )
-    backup_file_path = backup_path.joinpath(backup_filename)
-    backup_file_path.write_bytes(save_path.read_bytes())
-    backup_matches_original = _files_match(save_path, backup_file_path)
-    if (
-        backup_matches_original
-        and _iterator_length(backup_path.iterdir()) >= MAXIMUM_NUMBER_OF_BACKUPS
-    ):
-      _delete_oldest_file(backup_path)
-    if not backup_matches_original:
-      os.remove(backup_file_path)
-    return backup_matches_original
 
-  def write_save_file(self) -> None:
+  def _backup_save_file(self) -> bool:
+    """Backs up the save file on disk to the backup store in self._backup_path.
+    See zero_saver_core.backup_store for implementation details.
+
+    Returns:
+      False if backups are verified and the stored backup does not match the
+      SHA-256 hash of the save file, True otherwise.
+    """
+    with tracing.trace(self.tracers, tracing.Stage.BACKUP) as measurement:
+      measurement.size = os.path.getsize(self._save_path)
+      ref = self._backup_store.add_file(
+          self._save_path, self._save_path.name, verify=self._verify_backups
+      )
+      return ref is not None
+
+  async def _backup_save_file_async(
+      self,
+      *,
+      executor: futures.Executor | None = None,
+  ) -> bool:
+    """Asynchronous counterpart of self._backup_save_file()."""
+    return await _run_in_executor(executor, self._backup_save_file)
+
+  def write_save_file(
+      self,
+      *,
+      durability: Durability = Durability.FILE,
+  ) -> None:
     """Overwrites the Zero Sievert save file on disk. Various possible errors
     are described in the Raises section.
 
+    Args:
+      durability: How much of the write is flushed to storage before returning.
+        Durability.NONE skips fsync, e.g. for batch jobs writing scratch copies.
+        See zero_saver_core.game_data_io.Durability.
+
     Returns:
       None.
 
@@ -394,12 +833,95 @@ class GameDataIO:
         If an error occurs during integrity check setup. See
           self.verify_save_integrity() for implementation details.
     """
+    self._release_save_mapping()
+    encoder = self._streaming_encoder()
+    encoded = self._prepare_write(encode=encoder is None)
+    hash_function = hashlib.sha256()
+    with _atomic_write(
+        self._save_path, 'wb', durability=durability, tracers=self.tracers
+    ) as f:
+      with tracing.trace(self.tracers, tracing.Stage.WRITE) as measurement:
+        if encoded is None:
+          assert encoder is not None
+          measurement.size = output_sink.dump(
+              lazy_save.materialize(self.save),
+              f,
+              cls=encoder,
+              hash_function=hash_function,
+          )
+        else:
+          measurement.size = len(encoded)
+          f.write(encoded)
+          hash_function.update(encoded)
+        f.flush()
+    # The replaced file is only stat'ed by the next reload(), as the game may
+    # modify it in the meantime.
+    self._loaded_stat = None
+    self._loaded_sha256 = hash_function.digest()
+    if self._splice_source is not None:
+      assert encoded is not None
+      self._splice_source = encoded, self._splice_source[1]
+    if self._journal is not None:
+      self._journal.start(self._loaded_sha256)
+
+  def _streaming_encoder(self) -> type[json.JSONEncoder] | None:
+    """Returns the encoder self.save is streamed to the save file with, or None
+    if it must be encoded first: by a serializer other than a
+    json.JSONEncoder, to splice it, to encode sections separately, or to
+    overlap encoding with the backup."""
+    if (
+        self._splice_source is not None
+        or self._section_cache is not None
+        or self._encode_executor is not None
+        or self._write_executor is not None
+    ):
+      return None
+    return self._backend.encoder
+
+  def _prepare_write(self, *, encode: bool = True) -> bytes | None:
+    """Verifies, backs up and, if *encode* is set, encodes self.save, one after
+    another or, with self._write_executor, concurrently.
+
+    Returns:
+      self.save encoded as UTF-8, or None if not *encode*.
+
+    Raises:
+      See self.write_save_file(). If several stages fail, the error of the
+      first one, in the order above, is raised.
+    """
+    if self._write_executor is None:
+      self._verify_for_write()
+      self._backup_for_write()
+      return self._encode() if encode else None
+    # Decodes any lazy section once, before the stages read it concurrently.
+    lazy_save.materialize(self.save)
+    stages: list[Callable[[], bytes | None]] = [
+        self._verify_for_write,
+        self._backup_for_write,
+    ]
+    if encode:
+      stages.append(self._encode)
+    pending = [self._write_executor.submit(stage) for stage in stages]
+    done, _ = futures.wait(pending, return_when=futures.FIRST_EXCEPTION)
+    if any(future.exception() is not None for future in done):
+      for future in pending:
+        future.cancel()
+    # The stages read self.save, which callers may modify once this returns.
+    futures.wait(pending)
+    for future in pending:
+      if not future.cancelled():
+        future.result()
+    return pending[-1].result() if encode else None
+
+  def _verify_for_write(self) -> None:
     try:
       self.verify_save_integrity()
     except (KeyError, ModuleNotFoundError) as e:
       raise RuntimeError('Failed during set up of integrity check.') from e
     except pydantic.ValidationError as e:
       raise ValueError('Save not formatted properly.') from e
+
+  def _backup_for_write(self) -> None:
     try:
       if not self._backup_save_file():
         raise RuntimeError(
@@ -408,8 +930,92 @@ class GameDataIO:
         )
     except OSError as e:
       raise RuntimeError('Failed to create a backup file.') from e
-    with _atomic_write(self._save_path, 'w', encoding='utf-8') as f:
-      json.dump(self.save, f, cls=monkey_patch_json.ZeroSievertJsonEncoder)
+
+  def _encode(self) -> bytes:
+    with tracing.trace(self.tracers, tracing.Stage.ENCODE) as measurement:
+      encoded = self._encode_save()
+      measurement.size = len(encoded)
+    return encoded
+
+  def set_value(
+      self,
+      key_path: edit_journal.KeyPath,
+      value: ZeroSievertJsonValue | NestedStructure[ZeroSievertJsonValue],
+  ) -> None:
+    """Sets the value at *key_path* of self.save, e.g.
+    ('data', 'difficulty', 'edited'). Setting the index one past the end of a
+    list appends to it. If journaling, the edit is appended to the journal.
+
+    Raises:
+      KeyError: If a parent of the value does not exist.
+      IndexError: If a list index is out of range.
+      TypeError: If a key does not match the type of its container.
+      ValueError: If *key_path* is empty.
+      OSError: If an error occurs while appending to the journal.
+      See self.write_save_file(), if the journal is compacted.
+    """
+    edit_journal.apply_set(self.save, key_path, value)
+    if self._journal is not None:
+      self._journal.record_set(key_path, value, self._dumps)
+      self._compact_full_journal()
+
+  def delete_value(self, key_path: edit_journal.KeyPath) -> None:
+    """Deletes the value at *key_path* of self.save. If journaling, the edit is
+    appended to the journal.
+
+    Raises:
+      See self.set_value().
+    """
+    edit_journal.apply_delete(self.save, key_path)
+    if self._journal is not None:
+      self._journal.record_delete(key_path)
+      self._compact_full_journal()
+
+  def _compact_full_journal(self) -> None:
+    assert self._journal is not None
+    if self._journal.is_full:
+      self.write_save_file()
+
+  def _encode_save(self) -> bytes:
+    """Returns self.save encoded as UTF-8, the way self.write_save_file()
+    writes it."""
+    if self._splice_source is not None:
+      raw, parse_float = self._splice_source
+      # Decoded with the original parse_float, so that numbers interned by a
+      # zero_saver_core.number_pool.InternPool compare by identity.
+      original = self._loads(raw, parse_float=parse_float)
+      return splice.splice(
+          raw, original, lazy_save.materialize(self.save), self._dumps
+      )
+    save = lazy_save.materialize(self.save)
+    if self._section_cache is not None:
+      text = self._section_cache.encode(
+          save, self._dumps, self._encode_executor
+      )
+    elif self._encode_executor is not None:
+      text = parallel_encode.encode(save, self._dumps, self._encode_executor)
+    else:
+      text = self._dumps(save)
+    # Encoded once, and written in a single call without a text layer.
+    return text.encode('utf-8')
+
+  async def write_save_file_async(
+      self,
+      *,
+      executor: futures.Executor | None = None,
+      durability: Durability = Durability.FILE,
+  ) -> None:
+    """Asynchronous counterpart of self.write_save_file(). Validation, backup,
+    encoding and writing all run in *executor*, which defaults to the default
+    executor of the running loop. Concurrent calls are written one at a time.
+
+    Raises:
+      See self.write_save_file().
+    """
+    async with self._write_lock:
+      await _run_in_executor(
+          executor, self.write_save_file, durability=durability
+      )
 
   def verify_save_integrity(self) -> None:
     """Compares the save file to the JSON Schema corresponding to supported
@@ -427,7 +1033,134 @@ class GameDataIO:
         implementation details.
 
     """
-    save_version = self.save['save_version']
-    verifier.get_json_validator(save_version).validate_python(
-        self.save, strict=True
+    with tracing.trace(self.tracers, tracing.Stage.VERIFY):
+      save_version = self.save['save_version']
+      save = lazy_save.materialize(self.save)
+      if self._lazy_numbers:
+        save = lazy_decimal.resolve(save)
+      verifier.get_json_validator(save_version).validate_python(
+          save, strict=True
+      )
+
+  async def verify_save_integrity_async(
+      self,
+      *,
+      executor: futures.Executor | None = None,
+  ) -> None:
+    """Asynchronous counterpart of self.verify_save_integrity().
+
+    Raises:
+      See self.verify_save_integrity().
+    """
+    await _run_in_executor(executor, self.verify_save_integrity)
+
+
+async def _run_in_executor(
+    executor: futures.Executor | None,
+    function: Callable[..., _T],
+    *args: Any,
+    **kwargs: Any,
+) -> _T:
+  loop = asyncio.get_running_loop()
+  return await loop.run_in_executor(
+      executor, functools.partial(function, *args, **kwargs)
+  )
+
+
+@dataclasses.dataclass(frozen=True)
+class LoadResult:
+  """The outcome of reading a single save file with
+  zero_saver_core.game_data_io.GameDataIO.load_many().
+
+  Attributes:
+    save_path: The save file that was read.
+    save: The content of the save file, or the value extracted from it. None if
+      the save file could not be read.
+    error: The exception raised while reading the save file, if any.
+    backup: The reference of the backup that was read, if read from a backup
+      directory.
+  """
+
+  save_path: pathlib.Path
+  save: Any = None
+  error: BaseException | None = None
+  backup: backup_store.BackupRef | None = None
+
+
+def _open_backup_store(directory: pathlib.Path) -> backup_store.BackupStore:
+  # Only read; the store is never rotated.
+  return backup_store.BackupStore(
+      directory, maximum_backups=MAXIMUM_NUMBER_OF_BACKUPS
+  )
+
+
+def _list_backups(
+    directory: pathlib.Path,
+) -> Iterator[tuple[pathlib.Path, _Backup]]:
+  """Yields the object file of each backup stored in *directory*, oldest
+  first, with the backup."""
+  store = _open_backup_store(directory)
+  for ref in store.refs():
+    object_path = store.object_path(ref.sha256)
+    if object_path is None:
+      # Reported as missing by the worker.
+      object_path = directory.joinpath(
+          backup_store.OBJECTS_DIRECTORY, ref.sha256
+      )
+    yield object_path, (directory, ref)
+
+
+def _load_one_save_file(
+    save_path: pathlib.Path,
+    *,
+    verify: bool,
+    extract: Callable[[ZeroSievertSave], Any] | None,
+    lazy_numbers: bool,
+    backend: json_backend.JsonBackend,
+    backup: _Backup | None = None,
+) -> LoadResult:
+  if backup is not None:
+    directory, ref = backup
+    with tempfile.TemporaryDirectory() as temporary_directory:
+      restored = pathlib.Path(temporary_directory, ref.name)
+      try:
+        _open_backup_store(directory).restore(ref, restored)
+      except (OSError, ValueError) as e:
+        return LoadResult(save_path, error=e, backup=ref)
+      result = _load_one_save_file(
+          restored,
+          verify=verify,
+          extract=extract,
+          lazy_numbers=lazy_numbers,
+          backend=backend,
+      )
+    return dataclasses.replace(result, save_path=save_path, backup=ref)
+  try:
+    game_data_io = GameDataIO(
+        save_path, lazy_numbers=lazy_numbers, backend=backend
     )
+    if verify:
+      game_data_io.verify_save_integrity()
+  except (OSError, ValueError, KeyError, ModuleNotFoundError) as e:
+    # pydantic.ValidationError is a ValueError.
+    return LoadResult(save_path, error=e)
+  if extract is None:
+    return LoadResult(save_path, save=game_data_io.save)
+  return LoadResult(save_path, save=extract(game_data_io.save))
+
+
+def _collect_completed(
+    pending: dict[futures.Future[LoadResult], pathlib.Path],
+) -> Iterator[LoadResult]:
+  """Waits for at least one of *pending* to complete, then removes and yields
+  every completed result."""
+  done, not_done = futures.wait(pending, return_when=futures.FIRST_COMPLETED)
+  del not_done  # unused
+  for future in done:
+    save_path = pending.pop(future)
+    try:
+      yield future.result()
+    except Exception as e:  # pylint: disable=broad-exception-caught
+      # Raised outside of reading the save, e.g. if a worker process died or
+      # the save cannot be pickled.
+      yield LoadResult(save_path, error=e)
@@ -0,0 +1,242 @@
+# Copyright 2023 The Zero Saver Authors. All Rights Reserved.
+#
+# This file is part of Zero Saver.
+#
+# Zero Saver is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later
+# version.
+#
+# Zero Saver is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR
+# A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# Zero Saver. If not, see <https://www.gnu.org/licenses/>.
+"""Pluggable JSON parsers and serializers for "ZERO Sievert" saves.
+
+Any installed backend may be used, as long as saves survive a round trip
+unchanged: numbers must be parsed through parse_float and written back with
+the exact formatting of zero_saver_core.monkey_patch_json. Candidates are
+checked against the golden save files, and the fastest passing parser and
+serializer are selected independently."""
+from __future__ import annotations
+
+import dataclasses
+import decimal
+import functools
+import importlib
+import json
+import pathlib
+import time
+from collections.abc import Callable, Iterable
+from typing import Any
+
+from zero_saver_core import monkey_patch_json
+from zero_saver_core.save_golden_files import verifier
+
+# Called as loads(document, parse_float=parse_float), where document is bytes
+# or str.
+Loads = Callable[..., Any]
+Dumps = Callable[[Any], str]
+
+# Optional parsers accepting parse_float, keyed by module name. Parsers without
+# parse_float support, such as orjson, cannot keep numbers exact.
+_OPTIONAL_PARSERS = ('simplejson',)
+# Numbers and strings absent from the golden save files, written in the style
+# of zero_saver_core.monkey_patch_json.
+_FIDELITY_PROBE = (
+    b'{ "numbers": [ 0.0, 1.0, -1.0, 2.5, 100.0, 0.30000000000000004, '
+    b'123456789.123456789, 1.000, 8.5e-05, -1.25e-10 ], '
+    b'"integers": [ 0, -7, 12345678901234567890 ], '
+    b'"strings": [ "", "a \\"quoted\\" \\\\ value", "\\u00e9\\u4e2d" ], '
+    b'"empty": [ [ ], {} ] }'
+)
+_TIMING_REPEATS = 3
+_TIMING_GIVE_UP_RATIO = 1.5
+
+
+@dataclasses.dataclass(frozen=True)
+class JsonBackend:
+  """A JSON parser and/or serializer.
+
+  Attributes:
+    name: A human-readable name, used in logs and error messages.
+    loads: Deserializes a document. Must accept a parse_float keyword.
+    dumps: Serializes a save in the format expected by "ZERO Sievert".
+    encoder: The json.JSONEncoder subclass dumps serializes with, if any, so
+      that saves may be streamed to a file instead. See
+      zero_saver_core.output_sink.dump().
+  """
+
+  name: str
+  loads: Loads | None = None
+  dumps: Dumps | None = None
+  encoder: type[json.JSONEncoder] | None = None
+
+
+def _stdlib_dumps(value: Any) -> str:
+  return json.dumps(value, cls=monkey_patch_json.ZeroSievertJsonEncoder)
+
+
+def _fast_stdlib_dumps(value: Any) -> str:
+  return json.dumps(value, cls=monkey_patch_json.ZeroSievertFastJsonEncoder)
+
+
+STDLIB_BACKEND = JsonBackend(
+    'json',
+    json.loads,
+    _stdlib_dumps,
+    monkey_patch_json.ZeroSievertJsonEncoder,
+)
+FAST_ENCODER_BACKEND = JsonBackend(
+    'json-fast',
+    dumps=_fast_stdlib_dumps,
+    encoder=monkey_patch_json.ZeroSievertFastJsonEncoder,
+)
+
+
+def candidate_backends() -> list[JsonBackend]:
+  """Returns the backends installed on this machine, starting with
+  zero_saver_core.json_backend.STDLIB_BACKEND."""
+  candidates = [STDLIB_BACKEND, FAST_ENCODER_BACKEND]
+  for module_name in _OPTIONAL_PARSERS:
+    try:
+      module = importlib.import_module(module_name)
+    except ImportError:
+      continue
+    candidates.append(JsonBackend(module_name, loads=module.loads))
+  return candidates
+
+
+def _fidelity_documents() -> list[bytes]:
+  golden_files = sorted(
+      pathlib.Path(verifier.GOLDEN_FILE_DIRECTORY).glob(
+          f'{verifier.GoldenFilePrefix.SAVE}*.json'
+      )
+  )
+  return [file.read_bytes() for file in golden_files] + [_FIDELITY_PROBE]
+
+
+def passes_fidelity_check(
+    loads: Loads,
+    dumps: Dumps,
+    documents: Iterable[bytes] | None = None,
+) -> bool:
+  """Checks that every document is reproduced byte for byte when parsed with
+  decimal.Decimal numbers and serialized again.
+
+  Args:
+    loads: The parser under test.
+    dumps: The serializer under test.
+    documents: The documents to round trip. Defaults to the golden save files
+      and a probe of hard to reproduce numbers and strings.
+  """
+  if documents is None:
+    documents = _fidelity_documents()
+  for document in documents:
+    try:
+      encoded = dumps(loads(document, parse_float=decimal.Decimal))
+    except (TypeError, ValueError):
+      return False
+    if encoded.encode('utf-8') != document:
+      return False
+  return True
+
+
+def _timed(function: Callable[[], Any]) -> float:
+  start = time.perf_counter()
+  function()
+  return time.perf_counter() - start
+
+
+def _parse_all(loads: Loads, documents: list[bytes]) -> None:
+  for document in documents:
+    loads(document, parse_float=decimal.Decimal)
+
+
+def _dump_all(dumps: Dumps, values: list[Any]) -> None:
+  for value in values:
+    dumps(value)
+
+
+def _fastest(
+    benchmarks: dict[JsonBackend, Callable[[], Any]],
+) -> JsonBackend | None:
+  """Runs each benchmark up to _TIMING_REPEATS times, keeping the fastest run.
+  Candidates clearly slower than the fastest are not run again."""
+  if len(benchmarks) <= 1:
+    return next(iter(benchmarks), None)
+  timings = dict.fromkeys(benchmarks, float('inf'))
+  for _ in range(_TIMING_REPEATS):
+    limit = min(timings.values()) * _TIMING_GIVE_UP_RATIO
+    for candidate, benchmark in benchmarks.items():
+      if timings[candidate] <= limit:
+        timings[candidate] = min(timings[candidate], _timed(benchmark))
+  return min(timings, key=timings.__getitem__)
+
+
+def select_backend(
+    candidates: Iterable[JsonBackend] | None = None,
+) -> JsonBackend:
+  """Selects the fastest parser and the fastest serializer among *candidates*
+  that pass zero_saver_core.json_backend.passes_fidelity_check().
+
+  Parsers are checked using the serializer of
+  zero_saver_core.json_backend.STDLIB_BACKEND, and vice versa.
+
+  Args:
+    candidates: The backends to choose from. Defaults to
+      zero_saver_core.json_backend.candidate_backends().
+
+  Returns:
+    A backend combining the selected parser and serializer.
+
+  Raises:
+    RuntimeError: If no candidate parser or serializer passes the check.
+  """
+  candidates = (
+      candidate_backends() if candidates is None else list(candidates)
+  )
+  documents = _fidelity_documents()
+  parsed = [
+      json.loads(document, parse_float=decimal.Decimal)
+      for document in documents
+  ]
+  reference_loads, reference_dumps = STDLIB_BACKEND.loads, STDLIB_BACKEND.dumps
+  assert reference_loads is not None and reference_dumps is not None
+  # The reference parser and serializer are checked together only once.
+  passes = functools.cache(
+      lambda loads, dumps: passes_fidelity_check(loads, dumps, documents)
+  )
+  parsers: dict[JsonBackend, Callable[[], Any]] = {}
+  serializers: dict[JsonBackend, Callable[[], Any]] = {}
+  for candidate in candidates:
+    loads, dumps = candidate.loads, candidate.dumps
+    if loads and passes(loads, reference_dumps):
+      parsers[candidate] = functools.partial(_parse_all, loads, documents)
+    if dumps and passes(reference_loads, dumps):
+      serializers[candidate] = functools.partial(_dump_all, dumps, parsed)
+  parser = _fastest(parsers)
+  serializer = _fastest(serializers)
+  if parser is None or serializer is None:
+    raise RuntimeError(
+        'No JSON backend reproduces the golden save files: '
+        f'{[candidate.name for candidate in candidates]}'
+    )
+  if parser is serializer:
+    return parser
+  return JsonBackend(
+      f'{parser.name}+{serializer.name}',
+      parser.loads,
+      serializer.dumps,
+      serializer.encoder,
+  )
+
+
+@functools.cache
+def default_backend() -> JsonBackend:
+  """Returns the backend selected by
+  zero_saver_core.json_backend.select_backend() among the installed
+  candidates. Selection happens once per process."""
+  return select_backend()
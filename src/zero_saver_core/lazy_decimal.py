@@ -0,0 +1,145 @@
+# Copyright 2023 The Zero Saver Authors. All Rights Reserved.
+#
+# This file is part of Zero Saver.
+#
+# Zero Saver is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later
+# version.
+#
+# Zero Saver is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR
+# A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# Zero Saver. If not, see <https://www.gnu.org/licenses/>.
+"""A lossless, lazily evaluated representation of JSON numbers.
+
+Used as the parse_float of the json module. The lexeme read from the save is
+kept as is; a decimal.Decimal is only built once arithmetic or comparison is
+performed. Unmodified numbers are written back using their original lexeme."""
+from __future__ import annotations
+
+import decimal
+from collections.abc import Callable
+from typing import Any
+
+
+def _unwrap(value: Any) -> Any:
+  if isinstance(value, LazyDecimal):
+    return value.decimal
+  return value
+
+
+def _binary_operator(name: str) -> Callable[[LazyDecimal, Any], Any]:
+  decimal_operator = getattr(decimal.Decimal, name)
+
+  def operator(self: LazyDecimal, other: Any) -> Any:
+    return decimal_operator(self.decimal, _unwrap(other))
+
+  operator.__name__ = name
+  return operator
+
+
+def _unary_operator(name: str) -> Callable[[LazyDecimal], Any]:
+  decimal_operator = getattr(decimal.Decimal, name)
+
+  def operator(self: LazyDecimal) -> Any:
+    return decimal_operator(self.decimal)
+
+  operator.__name__ = name
+  return operator
+
+
+class LazyDecimal:
+  """A JSON number retaining its original lexeme. Behaves like the
+  decimal.Decimal of the lexeme, which is built on first use.
+
+  Results of arithmetic are decimal.Decimal. Instances are immutable; edits
+  replace the LazyDecimal, after which the new value is written instead of the
+  lexeme."""
+
+  __slots__ = ('lexeme', '_decimal')
+
+  def __init__(self, lexeme: str):
+    self.lexeme = lexeme
+    self._decimal: decimal.Decimal | None = None
+
+  @property
+  def decimal(self) -> decimal.Decimal:
+    if self._decimal is None:
+      self._decimal = decimal.Decimal(self.lexeme)
+    return self._decimal
+
+  def __str__(self) -> str:
+    return self.lexeme
+
+  def __repr__(self) -> str:
+    return f"{self.__class__.__name__}('{self.lexeme}')"
+
+  def __format__(self, format_spec: str) -> str:
+    return format(self.decimal, format_spec)
+
+  def __hash__(self) -> int:
+    return hash(self.decimal)
+
+  def __bool__(self) -> bool:
+    return bool(self.decimal)
+
+  def __float__(self) -> float:
+    return float(self.lexeme)
+
+  def __int__(self) -> int:
+    return int(self.decimal)
+
+  def __round__(self, ndigits: int | None = None) -> Any:
+    if ndigits is None:
+      return round(self.decimal)
+    return round(self.decimal, ndigits)
+
+  def __reduce__(self) -> tuple[type[LazyDecimal], tuple[str]]:
+    return self.__class__, (self.lexeme,)
+
+  __eq__ = _binary_operator('__eq__')
+  __ne__ = _binary_operator('__ne__')
+  __lt__ = _binary_operator('__lt__')
+  __le__ = _binary_operator('__le__')
+  __gt__ = _binary_operator('__gt__')
+  __ge__ = _binary_operator('__ge__')
+  __add__ = _binary_operator('__add__')
+  __radd__ = _binary_operator('__radd__')
+  __sub__ = _binary_operator('__sub__')
+  __rsub__ = _binary_operator('__rsub__')
+  __mul__ = _binary_operator('__mul__')
+  __rmul__ = _binary_operator('__rmul__')
+  __truediv__ = _binary_operator('__truediv__')
+  __rtruediv__ = _binary_operator('__rtruediv__')
+  __floordiv__ = _binary_operator('__floordiv__')
+  __rfloordiv__ = _binary_operator('__rfloordiv__')
+  __mod__ = _binary_operator('__mod__')
+  __rmod__ = _binary_operator('__rmod__')
+  __divmod__ = _binary_operator('__divmod__')
+  __rdivmod__ = _binary_operator('__rdivmod__')
+  __pow__ = _binary_operator('__pow__')
+  __rpow__ = _binary_operator('__rpow__')
+  __neg__ = _unary_operator('__neg__')
+  __pos__ = _unary_operator('__pos__')
+  __abs__ = _unary_operator('__abs__')
+  __trunc__ = _unary_operator('__trunc__')
+  __floor__ = _unary_operator('__floor__')
+  __ceil__ = _unary_operator('__ceil__')
+
+
+def resolve(value: Any) -> Any:
+  """Returns a copy of *value* where every zero_saver_core.lazy_decimal.
+  LazyDecimal is replaced by its decimal.Decimal.
+
+  Required before handing lexed data to pydantic, which only accepts
+  decimal.Decimal for decimal fields. Only dict and list are traversed."""
+  if isinstance(value, LazyDecimal):
+    return value.decimal
+  if isinstance(value, dict):
+    return {key: resolve(child) for key, child in value.items()}
+  if isinstance(value, list):
+    return [resolve(child) for child in value]
+  return value
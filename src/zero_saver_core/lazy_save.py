@@ -0,0 +1,189 @@
+# Copyright 2023 The Zero Saver Authors. All Rights Reserved.
+#
+# This file is part of Zero Saver.
+#
+# Zero Saver is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later
+# version.
+#
+# Zero Saver is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR
+# A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# Zero Saver. If not, see <https://www.gnu.org/licenses/>.
+"""Deferred decoding of "ZERO Sievert" saves.
+
+The sections of "data" (difficulty, general, chest and pre_raid) are located in
+the raw save without building python objects and are only decoded on first
+access."""
+from __future__ import annotations
+
+import decimal
+import json
+import re
+from collections.abc import Callable, Iterator, MutableMapping
+from typing import Any
+
+from zero_saver_core import save_index
+
+# The member of the top-level object whose value is decoded lazily.
+LAZY_MEMBER = 'data'
+_OBJECT = ord('{')
+# Whitespace as defined by JSON, allowed after the top-level object.
+_WHITESPACE = re.compile(rb'[ \t\n\r]*')
+
+ParseFloat = Callable[[str], Any]
+# Called as loads(document, parse_float=parse_float). See
+# zero_saver_core.json_backend.JsonBackend.
+Loads = Callable[..., Any]
+
+
+class LazySections(MutableMapping[str, Any]):
+  """A mapping proxy over the members of a JSON object. Each member is decoded
+  from the raw bytes the first time it is accessed and cached afterwards.
+
+  Mutations only apply to the decoded values; the raw bytes are never
+  modified."""
+
+  def __init__(
+      self,
+      raw: bytes,
+      spans: dict[str, save_index.Span],
+      *,
+      parse_float: ParseFloat = decimal.Decimal,
+      loads: Loads = json.loads,
+  ):
+    self._raw = raw
+    self._spans = spans
+    self._parse_float = parse_float
+    self._loads = loads
+    # Preserves document order for members added after initialisation.
+    self._keys: dict[str, None] = dict.fromkeys(spans)
+    self._decoded: dict[str, Any] = {}
+
+  def __getitem__(self, key: str) -> Any:
+    try:
+      return self._decoded[key]
+    except KeyError:
+      pass
+    start, end = self._spans[key]
+    value = self._loads(self._raw[start:end], parse_float=self._parse_float)
+    self._decoded[key] = value
+    return value
+
+  def __setitem__(self, key: str, value: Any) -> None:
+    self._keys[key] = None
+    self._decoded[key] = value
+
+  def __delitem__(self, key: str) -> None:
+    del self._keys[key]
+    self._decoded.pop(key, None)
+    self._spans.pop(key, None)
+
+  def __contains__(self, key: object) -> bool:
+    # Avoids decoding *key*, unlike the default implementation.
+    return key in self._keys
+
+  def __iter__(self) -> Iterator[str]:
+    return iter(self._keys)
+
+  def __len__(self) -> int:
+    return len(self._keys)
+
+  def __repr__(self) -> str:
+    return (
+        f'{self.__class__.__name__}(keys={list(self._keys)}, '
+        f'decoded={list(self._decoded)})'
+    )
+
+  def is_decoded(self, key: str) -> bool:
+    return key in self._decoded
+
+  def raw(self, key: str) -> bytes | None:
+    """Returns the raw bytes of *key*, or None if *key* was decoded or added,
+    as its value may have been modified since."""
+    if key in self._decoded or key not in self._spans:
+      return None
+    start, end = self._spans[key]
+    return bytes(self._raw[start:end])
+
+  def materialize(self) -> dict[str, Any]:
+    """Decodes any remaining members.
+
+    Returns:
+      A dict containing every member, sharing the values held by self.
+    """
+    return {key: self[key] for key in self}
+
+
+def loads(
+    raw: bytes,
+    *,
+    parse_float: ParseFloat = decimal.Decimal,
+    loads: Loads = json.loads,
+) -> dict[str, Any]:
+  """Deserializes a save, deferring the decoding of each section of
+  zero_saver_core.lazy_save.LAZY_MEMBER.
+
+  Members of the top-level object other than LAZY_MEMBER are small and are
+  decoded immediately. Every member is decoded using *loads*.
+
+  Raises:
+    json.JSONDecodeError: If anything but whitespace follows the top-level
+      object, as json.loads() would.
+    ValueError: If *raw* is not a JSON object or a member cannot be decoded.
+  """
+  sections: dict[str, save_index.Span] = {}
+
+  def skip_value(key: str, position: int) -> int:
+    if key != LAZY_MEMBER or raw[position] != _OBJECT:
+      return save_index.value_end(raw, position)
+    # Locating the sections also locates the end of LAZY_MEMBER, avoiding a
+    # second pass over the largest value in the save.
+    spans, end = save_index.scan_object(raw, position, skip_value=None)
+    sections.update(spans)
+    return end
+
+  save: dict[str, Any] = {}
+  spans, end = save_index.scan_object(raw, 0, skip_value)
+  match = _WHITESPACE.match(raw, end)
+  assert match is not None  # Matches the empty string.
+  if match.end() != len(raw):
+    # Decoded as latin-1, so that offsets in the message are byte offsets.
+    raise json.JSONDecodeError(
+        'Extra data', bytes(raw).decode('latin-1'), match.end()
+    )
+  for key, (start, end) in spans.items():
+    if key == LAZY_MEMBER and raw[start] == _OBJECT:
+      save[key] = LazySections(
+          raw, sections, parse_float=parse_float, loads=loads
+      )
+    else:
+      save[key] = loads(raw[start:end], parse_float=parse_float)
+  return save
+
+
+def materialize(save: Any) -> Any:
+  """Returns *save* with any zero_saver_core.lazy_save.LazySections replaced by
+  a fully decoded dict. Saves without lazy sections are returned unchanged."""
+  if not isinstance(save, dict):
+    return save
+  data = save.get(LAZY_MEMBER)
+  if not isinstance(data, LazySections):
+    return save
+  materialized = dict(save)
+  materialized[LAZY_MEMBER] = data.materialize()
+  return materialized
+
+
+def detach(save: Any) -> None:
+  """Decodes any remaining sections of *save* in place, so that *save* no
+  longer references the raw bytes it was loaded from. Decoded sections keep
+  their identity."""
+  if not isinstance(save, dict):
+    return
+  data = save.get(LAZY_MEMBER)
+  if isinstance(data, LazySections):
+    save[LAZY_MEMBER] = data.materialize()
@@ -0,0 +1,68 @@
+# Copyright 2023 The Zero Saver Authors. All Rights Reserved.
+#
+# This file is part of Zero Saver.
+#
+# Zero Saver is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later
+# version.
+#
+# Zero Saver is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR
+# A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# Zero Saver. If not, see <https://www.gnu.org/licenses/>.
+"""Bounded pools sharing one number object between equal JSON lexemes.
+
+Saves repeat a few dozen lexemes, such as "0.0" and "1.0", thousands of times.
+Passing pool.__getitem__ as parse_float builds each of them once, shared by
+every save loaded in the process, and lets zero_saver_core.monkey_patch_json
+reuse their encoded text."""
+from __future__ import annotations
+
+import decimal
+from collections.abc import Callable
+from typing import Any
+
+from zero_saver_core import lazy_decimal
+
+DEFAULT_MAXIMUM_SIZE = 2**12
+
+
+class InternPool(dict[str, Any]):
+  """Maps each lexeme to a shared number, built by *factory* on first use.
+
+  At most 2 * *maximum_size* lexemes are retained. Once *maximum_size*
+  lexemes were added, they become the previous generation, and a new
+  generation is started. Lexemes found in the previous generation are moved to
+  the new one; any others are dropped at the next rotation. Lookups of
+  retained lexemes are a single dict lookup, in C.
+
+  Numbers are immutable and safe to share between saves and threads. Threads
+  racing on a new lexeme may build it twice, which is harmless.
+  """
+
+  def __init__(
+      self,
+      factory: Callable[[str], Any],
+      maximum_size: int = DEFAULT_MAXIMUM_SIZE,
+  ):
+    super().__init__()
+    self._factory = factory
+    self._maximum_size = maximum_size
+    self._previous: dict[str, Any] = {}
+
+  def __missing__(self, lexeme: str) -> Any:
+    value = self._previous.get(lexeme)
+    if value is None:
+      value = self._factory(lexeme)
+    if len(self) >= self._maximum_size:
+      self._previous = dict(self)
+      self.clear()
+    self[lexeme] = value
+    return value
+
+
+DECIMAL_POOL = InternPool(decimal.Decimal)
+LAZY_DECIMAL_POOL = InternPool(lazy_decimal.LazyDecimal)
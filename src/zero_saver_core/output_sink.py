@@ -0,0 +1,148 @@
+# Copyright 2023 The Zero Saver Authors. All Rights Reserved.
+#
+# This file is part of Zero Saver.
+#
+# Zero Saver is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later
+# version.
+#
+# Zero Saver is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR
+# A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# Zero Saver. If not, see <https://www.gnu.org/licenses/>.
+"""Writes serialized saves to binary streams in a few large writes.
+
+The JSON encoders produce thousands of short str chunks. Writing each of them
+through a text stream pays for a method call, an encoding and a buffer copy per
+chunk. zero_saver_core.output_sink.BufferedSink collects the chunks instead,
+and encodes and writes them once per *buffer_size* characters."""
+from __future__ import annotations
+
+import json
+import types
+from typing import Any, Protocol
+
+from zero_saver_core import monkey_patch_json
+
+DEFAULT_BUFFER_SIZE = 2**18
+
+
+class BinaryWriter(Protocol):
+  """Any binary stream, such as a file, a pipe or sys.stdout.buffer. Raw
+  streams may write fewer bytes than requested."""
+
+  def write(self, data: bytes, /) -> int | None:
+    ...
+
+
+class HashFunction(Protocol):
+  """Any hash object of hashlib, such as hashlib.sha256()."""
+
+  def update(self, data: bytes, /) -> None:
+    ...
+
+
+class BufferedSink:
+  """A write-only text stream encoding to UTF-8, coalescing short writes.
+
+  Chunks are held until *buffer_size* characters are pending, then joined,
+  encoded and written to *stream* in a single call. self.flush() writes any
+  pending chunks, but does not flush *stream*. When used as a context manager,
+  pending chunks are written on exit, unless an exception was raised.
+
+  Args:
+    stream: The binary stream receiving the encoded chunks. Partial writes,
+      as made by raw streams, are completed. Streams returning None are
+      assumed to have written everything.
+    buffer_size: The number of pending characters causing a write.
+    hash_function: Updated with the encoded chunks as they are written, e.g.
+      hashlib.sha256(), so that the output is hashed without being kept.
+  """
+
+  def __init__(
+      self,
+      stream: BinaryWriter,
+      buffer_size: int = DEFAULT_BUFFER_SIZE,
+      *,
+      hash_function: HashFunction | None = None,
+  ):
+    self._stream = stream
+    self._buffer_size = buffer_size
+    self._hash_function = hash_function
+    self._chunks: list[str] = []
+    self._pending = 0
+    self.bytes_written = 0
+
+  def write(self, chunk: str) -> int:
+    self._chunks.append(chunk)
+    self._pending += len(chunk)
+    if self._pending >= self._buffer_size:
+      self.flush()
+    return len(chunk)
+
+  def flush(self) -> None:
+    if not self._chunks:
+      return
+    data = ''.join(self._chunks).encode('utf-8')
+    self._chunks.clear()
+    self._pending = 0
+    if self._hash_function is not None:
+      self._hash_function.update(data)
+    view = memoryview(data)
+    while view:
+      written = self._stream.write(view)
+      if written is None:
+        break
+      view = view[written:]
+    self.bytes_written += len(data)
+
+  def __enter__(self) -> BufferedSink:
+    return self
+
+  def __exit__(
+      self,
+      exc_type: type[BaseException] | None,
+      exc_value: BaseException | None,
+      traceback: types.TracebackType | None,
+  ) -> None:
+    if exc_type is None:
+      self.flush()
+
+
+def dump(
+    value: Any,
+    stream: BinaryWriter,
+    *,
+    cls: type[json.JSONEncoder] = monkey_patch_json.ZeroSievertFastJsonEncoder,
+    buffer_size: int = DEFAULT_BUFFER_SIZE,
+    hash_function: HashFunction | None = None,
+) -> int:
+  """Serializes *value* to *stream* as UTF-8, through a
+  zero_saver_core.output_sink.BufferedSink.
+
+  Args:
+    value: The value to serialize, usually a save.
+    stream: See zero_saver_core.output_sink.BufferedSink.
+    cls: The encoder. zero_saver_core.monkey_patch_json.
+      ZeroSievertFastJsonEncoder and its subclasses pass their chunks to the
+      sink in batches, joined as they are encoded; other encoders are
+      iterated.
+    buffer_size: See zero_saver_core.output_sink.BufferedSink.
+    hash_function: See zero_saver_core.output_sink.BufferedSink.
+
+  Returns:
+    The number of bytes written.
+  """
+  encoder = cls()
+  with BufferedSink(
+      stream, buffer_size, hash_function=hash_function
+  ) as sink:
+    if isinstance(encoder, monkey_patch_json.ZeroSievertFastJsonEncoder):
+      encoder.encode_into(value, sink.write)
+    else:
+      for chunk in encoder.iterencode(value):
+        sink.write(chunk)
+  return sink.bytes_written
@@ -0,0 +1,110 @@
+# Copyright 2023 The Zero Saver Authors. All Rights Reserved.
+#
+# This file is part of Zero Saver.
+#
+# Zero Saver is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later
+# version.
+#
+# Zero Saver is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR
+# A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# Zero Saver. If not, see <https://www.gnu.org/licenses/>.
+"""Encodes the sections of large "ZERO Sievert" saves in parallel.
+
+Each section of save['data'] is encoded as a separate task of an executor, and
+the encoded sections are joined in key order. The output is identical to
+encoding the save as a whole.
+
+The encoders are pure python and hold the GIL, so only a
+concurrent.futures.ProcessPoolExecutor encodes sections simultaneously.
+Sections are then pickled to the worker processes, which pays off for large
+sections only. Threads merely keep the calling thread responsive."""
+from __future__ import annotations
+
+from collections.abc import Callable
+from concurrent import futures
+from typing import Any
+
+from zero_saver_core import monkey_patch_json
+
+# The member of the top-level object holding the sections.
+SECTIONS_MEMBER = 'data'
+Dumps = Callable[[Any], str]
+# Nested dicts of pending tasks, mirroring the objects split by _submit().
+_Pending = futures.Future[str] | dict[str, '_Pending']
+
+
+def _submit(
+    value: Any,
+    depth: int,
+    dumps: Dumps,
+    executor: futures.Executor,
+) -> _Pending:
+  if depth and isinstance(value, dict) and value:
+    return {
+        key: _submit(child, depth - 1, dumps, executor)
+        for key, child in value.items()
+    }
+  return executor.submit(dumps, value)
+
+
+def _assemble(pending: _Pending, dumps: Dumps) -> str:
+  if isinstance(pending, futures.Future):
+    return pending.result()
+  return monkey_patch_json.encode_object(
+      ((key, _assemble(child, dumps)) for key, child in pending.items()),
+      dumps,
+  )
+
+
+def encode(
+    save: Any,
+    dumps: Dumps,
+    executor: futures.Executor,
+    *,
+    depth: int = 1,
+) -> str:
+  """Encodes *save*, producing the same text as dumps(save).
+
+  Args:
+    save: The save to encode. Saves without a save['data'] object are encoded
+      with dumps as a whole.
+    dumps: Encodes each task. Must be picklable, e.g. a module-level function,
+      if *executor* runs tasks in other processes.
+    executor: Runs the tasks.
+    depth: The number of object levels below save['data'] split into
+      separate tasks. 1 encodes each section as one task; 2 encodes each
+      member of each section, e.g. each trader, as one task.
+
+  Raises:
+    TypeError: If a value cannot be encoded by *dumps*.
+    ValueError: If a value is out of range, or contains a circular reference.
+  """
+  sections = save.get(SECTIONS_MEMBER) if isinstance(save, dict) else None
+  if not isinstance(sections, dict) or depth < 1:
+    return dumps(save)
+  pending = _submit(sections, depth, dumps, executor)
+  try:
+    encoded_sections = _assemble(pending, dumps)
+  except BaseException:
+    _cancel(pending)
+    raise
+  return monkey_patch_json.encode_object(
+      (
+          (key, encoded_sections if value is sections else dumps(value))
+          for key, value in save.items()
+      ),
+      dumps,
+  )
+
+
+def _cancel(pending: _Pending) -> None:
+  if isinstance(pending, futures.Future):
+    pending.cancel()
+    return
+  for child in pending.values():
+    _cancel(child)
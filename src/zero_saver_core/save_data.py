@@ -19,6 +19,7 @@ from __future__ import annotations
 import typing
 
 from zero_saver_core import game_data_io
+from zero_saver_core import lazy_decimal
 from zero_saver_core import player
 from zero_saver_core import stash
 from zero_saver_core import quest
@@ -76,8 +77,11 @@ class _Version031Production(SaveDataFactory):
   SUPPORTED_VERSIONS = frozenset(['0.31 production'])
 
   def get_player(self) -> player.Player:
-    player_stats = self.save['data']['pre_raid']['player']
-    player_inventory = self.save['data']['pre_raid']['Inventory']['items']
+    # pydantic only accepts decimal.Decimal for decimal fields.
+    player_stats = lazy_decimal.resolve(self.save['data']['pre_raid']['player'])
+    player_inventory = lazy_decimal.resolve(
+        self.save['data']['pre_raid']['Inventory']['items']
+    )
     return player.Player(
         stats=typing.cast(player.Stats, player_stats),
         inventory=typing.cast(player.Inventory, player_inventory),
@@ -94,7 +98,7 @@ class _Version031Production(SaveDataFactory):
     player_inventory['items'] = player_data.inventory.model_dump(by_alias=True)
 
   def get_storage(self) -> stash.Stash:
-    player_storage = self.save['data']['chest']
+    player_storage = lazy_decimal.resolve(self.save['data']['chest'])
     return stash.Stash(chest=typing.cast(dict[str, typing.Any], player_storage))
 
   def set_storage(self, storage_data: stash.Stash) -> None:
@@ -21,6 +21,7 @@ as desired."""
 from __future__ import annotations
 
 import enum
+import functools
 import importlib
 import pathlib
 from typing import Any, TextIO, TYPE_CHECKING, TypeAlias
@@ -93,6 +94,7 @@ def golden_save_file_from_version(version: str) -> TextIO:
   return open_golden_file(filename)
 
 
+@functools.cache
 def get_json_validator(version: str) -> Validator:
   """Interface for accessing the pydantic.TypeAdapter corresponding to a save
   *version*.
@@ -101,7 +103,8 @@ def get_json_validator(version: str) -> Validator:
     version: The version of the save to be validated.
 
   Returns:
-    A pydantic.TypeAdapter corresponding to the TypedDict of *version*.
+    A pydantic.TypeAdapter corresponding to the TypedDict of *version*. Built
+    once per version, as building it takes much longer than validating.
   """
   clean_version_name = version.translate(str.maketrans('. ', '__'))
   file_name = f'typed_dict_{clean_version_name}'
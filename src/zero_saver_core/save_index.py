@@ -0,0 +1,692 @@
+# Copyright 2023 The Zero Saver Authors. All Rights Reserved.
+#
+# This file is part of Zero Saver.
+#
+# Zero Saver is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later
+# version.
+#
+# Zero Saver is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR
+# A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# Zero Saver. If not, see <https://www.gnu.org/licenses/>.
+"""Structural byte-offset index of "ZERO Sievert" save files.
+
+The raw save is scanned once without building python objects. The byte span of
+every value is recorded by its key path; e.g., ('data', 'pre_raid',
+'Inventory', 'items'). Object members are identified by str and array elements
+by int. Any single value can then be decoded without decoding the whole save.
+
+Persisted indexes only record values up to DEFAULT_MAX_DEPTH keys deep, so
+that loading one stays much cheaper than decoding the save. Deeper values are
+located within the bytes of their deepest indexed container."""
+from __future__ import annotations
+
+import decimal
+import hashlib
+import json
+import os
+import pathlib
+import re
+from collections.abc import Callable, Iterable, Iterator, Mapping, Sequence
+from typing import Any, TYPE_CHECKING, TypeAlias
+
+if TYPE_CHECKING:
+  from _typeshed import StrPath
+
+KeyPath: TypeAlias = tuple[str | int, ...]
+Span: TypeAlias = tuple[int, int]
+ParseFloat = Callable[[str], Any]
+
+_STRING = rb'"[^"\\]*+(?:\\.[^"\\]*+)*+"'
+# The deepest nesting of containers skipped by a single regular expression
+# match. Deeper containers fall back to _skip_container().
+_MAXIMUM_PATTERN_DEPTH = 16
+
+
+def _container_pattern(depth: int) -> re.Pattern[bytes]:
+  # Bracket types are not paired; malformed values are rejected by the decoder
+  # once the value is accessed.
+  inner = rb'(?:[^\[\]{}"]++|' + _STRING + rb')*+'
+  for _ in range(depth):
+    inner = (
+        rb'(?:[^\[\]{}"]++|' + _STRING + rb'|[\[{]' + inner + rb'[\]}])*+'
+    )
+  return re.compile(rb'[\[{]' + inner + rb'[\]}]')
+
+
+_CONTAINER = _container_pattern(_MAXIMUM_PATTERN_DEPTH)
+_STRING_VALUE = re.compile(_STRING)
+_SCALAR_VALUE = re.compile(rb'[^\[\]{}",:\s]++')
+_MEMBER_NAME = re.compile(rb'\s*(' + _STRING + rb')\s*:\s*')
+_OBJECT_START = re.compile(rb'\s*\{\s*(\}?)')
+_OBJECT_SEPARATOR = re.compile(rb'\s*([,}])')
+_ARRAY_START = re.compile(rb'\s*\[\s*(\]?)')
+_ARRAY_SEPARATOR = re.compile(rb'\s*(?:(\])|,\s*)')
+_WHITESPACE = re.compile(rb'\s*')
+# Matches JSON strings and the structural characters outside of strings.
+_STRUCTURAL_TOKEN = re.compile(_STRING + rb'|[\[\]{}]')
+_QUOTE = ord('"')
+_OBJECT = ord('{')
+_ARRAY = ord('[')
+_OPENING_BRACKETS = b'{['
+# Bumped whenever the persisted format changes, invalidating existing caches.
+_INDEX_FORMAT_VERSION = 2
+# Indexes values down to the members of each section of data, e.g.
+# ('data', 'pre_raid', 'Inventory', 'items').
+DEFAULT_MAX_DEPTH = 4
+
+
+def _decode_key(token: bytes) -> str:
+  if b'\\' in token:
+    return json.loads(token)
+  return token[1:-1].decode('utf-8')
+
+
+def _document_start(raw: bytes) -> int:
+  """Returns the offset of the value of *raw*, after any whitespace."""
+  match = _WHITESPACE.match(raw)
+  assert match is not None  # Matches the empty string.
+  return match.end()
+
+
+def _skip_container(raw: bytes, position: int) -> int:
+  depth = 0
+  for match in _STRUCTURAL_TOKEN.finditer(raw, position):
+    character = raw[match.start()]
+    if character == _QUOTE:
+      continue
+    if character in _OPENING_BRACKETS:
+      depth += 1
+    else:
+      depth -= 1
+      if depth == 0:
+        return match.end()
+  raise ValueError(f'Unterminated JSON value at offset: {position}')
+
+
+def value_end(raw: bytes, position: int) -> int:
+  """Returns the offset one past the end of the JSON value beginning at
+  *position*.
+
+  Raises:
+    ValueError: If no value begins at *position*.
+  """
+  character = raw[position]
+  if character in _OPENING_BRACKETS:
+    match = _CONTAINER.match(raw, position)
+    if match is None:
+      return _skip_container(raw, position)
+  elif character == _QUOTE:
+    match = _STRING_VALUE.match(raw, position)
+  else:
+    match = _SCALAR_VALUE.match(raw, position)
+  if match is None:
+    raise ValueError(f'Expected a JSON value at offset: {position}')
+  return match.end()
+
+
+def scan_object(
+    raw: bytes,
+    start: int,
+    skip_value: Callable[[str, int], int] | None = None,
+) -> tuple[dict[str, Span], int]:
+  """Locates the members of the JSON object beginning at *start*, ignoring
+  leading whitespace.
+
+  Args:
+    raw: The UTF-8 encoded JSON document. Any object supporting the buffer
+      protocol may be used, such as mmap.mmap.
+    start: The offset of the object.
+    skip_value: Called with each member name and the offset of its value.
+      Returns the offset one past the end of the value. Defaults to
+      zero_saver_core.save_index.value_end().
+
+  Returns:
+    A mapping of each member name to the half-open byte span of its value, in
+    document order, and the offset one past the end of the object.
+
+  Raises:
+    ValueError: If the object is malformed or not terminated.
+  """
+  spans: dict[str, Span] = {}
+  match = _OBJECT_START.match(raw, start)
+  if match is None:
+    raise ValueError(f'Expected a JSON object at offset: {start}')
+  if match.group(1):
+    return spans, match.end()
+  position = match.end()
+  while True:
+    match = _MEMBER_NAME.match(raw, position)
+    if match is None:
+      raise ValueError(f'Expected a member name at offset: {position}')
+    key = _decode_key(match.group(1))
+    value_start = match.end()
+    if skip_value is None:
+      position = value_end(raw, value_start)
+    else:
+      position = skip_value(key, value_start)
+    spans[key] = (value_start, position)
+    match = _OBJECT_SEPARATOR.match(raw, position)
+    if match is None:
+      raise ValueError(f'Expected "," or "}}" at offset: {position}')
+    position = match.end()
+    if match.group(1) == b'}':
+      return spans, position
+
+
+def scan_array(
+    raw: bytes,
+    start: int,
+    skip_value: Callable[[int, int], int] | None = None,
+) -> tuple[list[Span], int]:
+  """Locates the elements of the JSON array beginning at *start*. Equivalent to
+  zero_saver_core.save_index.scan_object() for arrays."""
+  spans: list[Span] = []
+  match = _ARRAY_START.match(raw, start)
+  if match is None:
+    raise ValueError(f'Expected a JSON array at offset: {start}')
+  if match.group(1):
+    return spans, match.end()
+  position = match.end()
+  while True:
+    value_start = position
+    if skip_value is None:
+      position = value_end(raw, value_start)
+    else:
+      position = skip_value(len(spans), value_start)
+    spans.append((value_start, position))
+    match = _ARRAY_SEPARATOR.match(raw, position)
+    if match is None:
+      raise ValueError(f'Expected "," or "]" at offset: {position}')
+    position = match.end()
+    if match.group(1):
+      return spans, position
+
+
+def member_spans(raw: bytes, start: int = 0) -> dict[str, Span]:
+  """Locates the members of the JSON object beginning at *start*, ignoring
+  leading whitespace. Nested values are skipped without being decoded.
+
+  Returns:
+    A mapping of each member name to the half-open byte span of its value, in
+    document order.
+
+  Raises:
+    ValueError: If the object is malformed or not terminated.
+  """
+  spans, end = scan_object(raw, start)
+  del end  # unused
+  return spans
+
+
+def _member_start(raw: bytes, start: int, key: str) -> int:
+  match = _OBJECT_START.match(raw, start)
+  if match is None:
+    raise ValueError(f'Expected a JSON object at offset: {start}')
+  if match.group(1):
+    raise KeyError(key)
+  position = match.end()
+  while True:
+    match = _MEMBER_NAME.match(raw, position)
+    if match is None:
+      raise ValueError(f'Expected a member name at offset: {position}')
+    if _decode_key(match.group(1)) == key:
+      return match.end()
+    position = value_end(raw, match.end())
+    match = _OBJECT_SEPARATOR.match(raw, position)
+    if match is None:
+      raise ValueError(f'Expected "," or "}}" at offset: {position}')
+    position = match.end()
+    if match.group(1) == b'}':
+      raise KeyError(key)
+
+
+def _element_start(raw: bytes, start: int, index: int) -> int:
+  match = _ARRAY_START.match(raw, start)
+  if match is None:
+    raise ValueError(f'Expected a JSON array at offset: {start}')
+  if match.group(1):
+    raise KeyError(index)
+  position = match.end()
+  for _ in range(index):
+    position = value_end(raw, position)
+    match = _ARRAY_SEPARATOR.match(raw, position)
+    if match is None:
+      raise ValueError(f'Expected "," or "]" at offset: {position}')
+    if match.group(1):
+      raise KeyError(index)
+    position = match.end()
+  return position
+
+
+def locate(raw: bytes, key_path: KeyPath) -> Span:
+  """Returns the byte span of the value at *key_path* in *raw*. Only the
+  containers along *key_path* are scanned, and only up to the member or
+  element sought; everything else is skipped.
+
+  Objects with duplicate member names resolve to the first member.
+
+  Raises:
+    KeyError: If *raw* has no value at *key_path*.
+    ValueError: If *raw* is malformed along *key_path*.
+  """
+  return _locate(raw, key_path)
+
+
+def locate_all(
+    raw: bytes, key_paths: Iterable[KeyPath]
+) -> dict[KeyPath, Span]:
+  """Returns the byte span of the value at each of *key_paths* in *raw*, in a
+  single pass. Only the containers along *key_paths* are scanned; everything
+  else is skipped.
+
+  Unlike zero_saver_core.save_index.locate(), objects with duplicate member
+  names resolve to the last member, as in json.loads().
+
+  Raises:
+    KeyError: If *raw* has no value at one of *key_paths*.
+    ValueError: If *raw* is malformed along *key_paths*.
+  """
+  # Each node maps the keys of its container to be scanned to their nodes.
+  tree: dict[str | int, Any] = {}
+  requested: list[KeyPath] = []
+  for key_path in key_paths:
+    requested.append(key_path)
+    node = tree
+    for key in key_path:
+      node = node.setdefault(key, {})
+  spans: dict[KeyPath, Span] = {}
+
+  def locate_value(position: int, path: KeyPath, node: dict[Any, Any]) -> int:
+    if not node:
+      return value_end(raw, position)
+
+    def skip_value(key: str | int, value_start: int) -> int:
+      child = node.get(key)
+      if child is None:
+        return value_end(raw, value_start)
+      return locate_value(value_start, (*path, key), child)
+
+    character = raw[position]
+    if character == _OBJECT:
+      members, end = scan_object(raw, position, skip_value)
+      items: Iterable[tuple[str | int, Span]] = members.items()
+    elif character == _ARRAY:
+      elements, end = scan_array(raw, position, skip_value)
+      items = enumerate(elements)
+    else:
+      # Missing keys are reported once every value was located.
+      return value_end(raw, position)
+    for key, span in items:
+      if key in node:
+        spans[(*path, key)] = span
+    return end
+
+  start = _document_start(raw)
+  spans[()] = start, locate_value(start, (), tree)
+  for key_path in requested:
+    if key_path not in spans:
+      raise KeyError(key_path[-1])
+  return {key_path: spans[key_path] for key_path in requested}
+
+
+def _locate(
+    raw: bytes,
+    key_path: Sequence[str | int],
+    *,
+    dotted: bool = False,
+) -> Span:
+  """zero_saver_core.save_index.locate(). If *dotted* is set, str keys of
+  array elements are converted to int, as in SaveIndex.resolve()."""
+  position = _document_start(raw)
+  for key in key_path:
+    if isinstance(key, str) and not (dotted and raw[position] == _ARRAY):
+      position = _member_start(raw, position, key)
+    elif isinstance(key, str):
+      if not key.isdigit():
+        raise KeyError(key)
+      position = _element_start(raw, position, int(key))
+    else:
+      position = _element_start(raw, position, key)
+  return position, value_end(raw, position)
+
+
+def _index_value(
+    raw: bytes,
+    position: int,
+    path: KeyPath,
+    spans: dict[KeyPath, Span],
+    max_depth: int | None,
+) -> int:
+  character = raw[position]
+  if character not in _OPENING_BRACKETS or (
+      max_depth is not None and len(path) >= max_depth
+  ):
+    return value_end(raw, position)
+
+  def skip_value(key: str | int, value_start: int) -> int:
+    return _index_value(raw, value_start, (*path, key), spans, max_depth)
+
+  if character == _OBJECT:
+    members, end = scan_object(raw, position, skip_value)
+    for key, span in members.items():
+      spans[(*path, key)] = span
+  else:
+    elements, end = scan_array(raw, position, skip_value)
+    for key, span in enumerate(elements):
+      spans[(*path, key)] = span
+  return end
+
+
+def index_bytes(
+    raw: bytes, *, max_depth: int | None = None
+) -> dict[KeyPath, Span]:
+  """Records the byte span of every value in *raw*.
+
+  Args:
+    raw: The UTF-8 encoded JSON document.
+    max_depth: If set, values nested deeper than *max_depth* keys are not
+      indexed individually.
+
+  Returns:
+    A mapping of each key path to the half-open byte span of its value. The
+    document itself is stored under the empty key path.
+
+  Raises:
+    ValueError: If *raw* is not well-formed JSON.
+  """
+  spans: dict[KeyPath, Span] = {}
+  start = _document_start(raw)
+  end = _index_value(raw, start, (), spans, max_depth)
+  spans[()] = (start, end)
+  return spans
+
+
+def _stat_key(stat: os.stat_result) -> tuple[int, int]:
+  return stat.st_size, stat.st_mtime_ns
+
+
+def _to_tree(spans: dict[KeyPath, Span]) -> list[Any]:
+  """Nests *spans* as the persisted tree of nodes [start, end] and
+  [start, end, children], children being keyed like the indexed container.
+  Key paths are not repeated for every value."""
+  nodes: dict[KeyPath, list[Any]] = {
+      path: [start, end] for path, (start, end) in spans.items()
+  }
+  for path, node in nodes.items():
+    if not path:
+      continue
+    parent = nodes[path[:-1]]
+    if len(parent) == 2:
+      parent.append({} if isinstance(path[-1], str) else [])
+    if isinstance(path[-1], str):
+      parent[2][path[-1]] = node
+    else:
+      parent[2].append(node)
+  return nodes[()]
+
+
+def _from_tree(
+    node: list[Any],
+    path: KeyPath,
+    spans: dict[KeyPath, Span],
+) -> None:
+  spans[path] = (node[0], node[1])
+  if len(node) == 2:
+    return
+  children = node[2]
+  items = (
+      children.items() if isinstance(children, dict) else enumerate(children)
+  )
+  for key, child in items:
+    _from_tree(child, (*path, key), spans)
+
+
+class SaveIndex(Mapping[KeyPath, Span]):
+  """The byte spans of the values in a save, keyed by key path, down to
+  *max_depth* keys deep if set. Records the size, modification time and SHA-256
+  hash of the indexed file so that stale indexes can be detected."""
+
+  def __init__(
+      self,
+      spans: dict[KeyPath, Span],
+      *,
+      size: int,
+      mtime_ns: int,
+      sha256: str,
+      max_depth: int | None = None,
+  ):
+    self._spans = spans
+    self.size = size
+    self.mtime_ns = mtime_ns
+    self.sha256 = sha256
+    self.max_depth = max_depth
+
+  @classmethod
+  def from_bytes(
+      cls,
+      raw: bytes,
+      *,
+      mtime_ns: int = 0,
+      max_depth: int | None = None,
+  ) -> SaveIndex:
+    return cls(
+        index_bytes(raw, max_depth=max_depth),
+        size=len(raw),
+        mtime_ns=mtime_ns,
+        sha256=hashlib.sha256(raw).hexdigest(),
+        max_depth=max_depth,
+    )
+
+  def __getitem__(self, key_path: KeyPath) -> Span:
+    return self._spans[key_path]
+
+  def __iter__(self) -> Iterator[KeyPath]:
+    return iter(self._spans)
+
+  def __len__(self) -> int:
+    return len(self._spans)
+
+  def resolve(self, dotted_path: str) -> KeyPath:
+    """Converts a dotted key path, such as "data.pre_raid.Inventory.items.0",
+    to the key path used by the index. Components naming array elements are
+    converted to int.
+
+    Raises:
+      KeyError: If *dotted_path* is not indexed.
+    """
+    key_path: KeyPath = ()
+    for component in dotted_path.split('.') if dotted_path else ():
+      if (*key_path, component) in self._spans:
+        key_path = (*key_path, component)
+      elif component.isdigit() and (*key_path, int(component)) in self._spans:
+        key_path = (*key_path, int(component))
+      else:
+        raise KeyError(f'Key path not indexed: {dotted_path}')
+    return key_path
+
+  def container(
+      self, key_path: KeyPath | str
+  ) -> tuple[Span, Sequence[str | int], bool]:
+    """Returns the span of the deepest indexed value along *key_path*, the keys
+    leading from it to the value at *key_path*, and whether these keys come
+    from a dotted key path. See self.resolve()."""
+    dotted = isinstance(key_path, str)
+    keys: Sequence[str | int]
+    if isinstance(key_path, str):
+      keys = key_path.split('.') if key_path else []
+    else:
+      keys = key_path
+    indexed: KeyPath = ()
+    for depth, key in enumerate(keys):
+      if (*indexed, key) in self._spans:
+        indexed = (*indexed, key)
+      elif (
+          dotted
+          and isinstance(key, str)
+          and key.isdigit()
+          and (*indexed, int(key)) in self._spans
+      ):
+        indexed = (*indexed, int(key))
+      else:
+        return self._spans[indexed], keys[depth:], dotted
+    return self._spans[indexed], (), dotted
+
+  def decode(
+      self,
+      raw: bytes,
+      key_path: KeyPath | str,
+      *,
+      parse_float: ParseFloat = decimal.Decimal,
+  ) -> Any:
+    """Decodes the value at *key_path* from *raw*, the indexed document.
+
+    Raises:
+      KeyError: If *raw* has no value at *key_path*.
+    """
+    (start, end), keys, dotted = self.container(key_path)
+    if keys:
+      offset = start
+      start, end = _locate(raw[start:end], keys, dotted=dotted)
+      start, end = start + offset, end + offset
+    return json.loads(raw[start:end], parse_float=parse_float)
+
+  def matches(self, stat: os.stat_result) -> bool:
+    return (self.size, self.mtime_ns) == _stat_key(stat)
+
+  def to_json(self) -> dict[str, Any]:
+    return {
+        'version': _INDEX_FORMAT_VERSION,
+        'size': self.size,
+        'mtime_ns': self.mtime_ns,
+        'sha256': self.sha256,
+        'max_depth': self.max_depth,
+        'spans': _to_tree(self._spans),
+    }
+
+  @classmethod
+  def from_json(cls, value: Mapping[str, Any]) -> SaveIndex:
+    """Raises:
+    ValueError: If *value* was persisted by an incompatible version.
+    """
+    if value.get('version') != _INDEX_FORMAT_VERSION:
+      raise ValueError(f'Unsupported index version: {value.get("version")}')
+    spans: dict[KeyPath, Span] = {}
+    _from_tree(value['spans'], (), spans)
+    return cls(
+        spans,
+        size=value['size'],
+        mtime_ns=value['mtime_ns'],
+        sha256=value['sha256'],
+        max_depth=value['max_depth'],
+    )
+
+
+def _cache_file(save_path: StrPath, cache_directory: StrPath) -> pathlib.Path:
+  absolute_path = os.path.abspath(save_path)
+  name = hashlib.sha256(absolute_path.encode('utf-8')).hexdigest()[:32]
+  return pathlib.Path(cache_directory, f'{name}.json')
+
+
+def _read_cached_index(cache_file: pathlib.Path) -> SaveIndex | None:
+  try:
+    with open(cache_file, 'r', encoding='utf-8') as f:
+      return SaveIndex.from_json(json.load(f))
+  except (OSError, ValueError, KeyError, TypeError):
+    # A missing, partially written or outdated cache is rebuilt.
+    return None
+
+
+def _write_cached_index(cache_file: pathlib.Path, index: SaveIndex) -> None:
+  temporary_file = cache_file.with_suffix(f'.{os.getpid()}.tmp')
+  temporary_file.write_text(json.dumps(index.to_json()), encoding='utf-8')
+  os.replace(temporary_file, cache_file)
+
+
+def load_index(
+    save_path: StrPath,
+    cache_directory: StrPath | None = None,
+    *,
+    max_depth: int | None = DEFAULT_MAX_DEPTH,
+) -> SaveIndex:
+  """Returns the index of *save_path*, down to *max_depth* keys deep, reusing a
+  persisted index of the same depth if one exists.
+
+  A persisted index is reused without reading *save_path* if the size and
+  modification time of the file are unchanged. If only the modification time
+  changed, the SHA-256 hash of the file is compared before reusing the index.
+  Otherwise, the file is indexed again and the result persisted.
+
+  Args:
+    save_path: The save file to index.
+    cache_directory: The directory in which indexes are persisted. If None,
+      the index is built without being persisted.
+    max_depth: If set, values nested deeper than *max_depth* keys are not
+      indexed individually. None indexes every value, which costs more to
+      load than decoding the whole save.
+
+  Raises:
+    OSError: If *save_path* cannot be read.
+    ValueError: If *save_path* is not well-formed JSON.
+  """
+  cache_file = None
+  cached = None
+  if cache_directory is not None:
+    cache_file = _cache_file(save_path, cache_directory)
+    cached = _read_cached_index(cache_file)
+    if cached is not None and cached.max_depth != max_depth:
+      cached = None
+    if cached is not None and cached.matches(os.stat(save_path)):
+      return cached
+  with open(save_path, 'rb') as f:
+    stat = os.fstat(f.fileno())
+    raw = f.read()
+  digest = hashlib.sha256(raw).hexdigest()
+  if cached is not None and (cached.size, cached.sha256) == (len(raw), digest):
+    index = cached
+    index.mtime_ns = stat.st_mtime_ns
+  else:
+    index = SaveIndex(
+        index_bytes(raw, max_depth=max_depth),
+        size=len(raw),
+        mtime_ns=stat.st_mtime_ns,
+        sha256=digest,
+        max_depth=max_depth,
+    )
+  if cache_file is not None:
+    _write_cached_index(cache_file, index)
+  return index
+
+
+def read_value(
+    save_path: StrPath,
+    key_path: KeyPath | str,
+    *,
+    cache_directory: StrPath | None = None,
+    parse_float: ParseFloat = decimal.Decimal,
+) -> Any:
+  """Decodes a single value from *save_path*. Once the index is persisted in
+  *cache_directory*, only the bytes of the value are read, or those of its
+  deepest indexed container.
+
+  Examples:
+    >>> read_value(path, 'data.pre_raid.player.hp', cache_directory=cache)
+
+  Raises:
+    KeyError: If *key_path* does not exist in the save.
+    OSError: If *save_path* cannot be read.
+    ValueError: If *save_path* is not well-formed JSON.
+  """
+  index = load_index(save_path, cache_directory)
+  (start, end), keys, dotted = index.container(key_path)
+  with open(save_path, 'rb') as f:
+    f.seek(start)
+    raw = f.read(end - start)
+  if keys:
+    start, end = _locate(raw, keys, dotted=dotted)
+    raw = raw[start:end]
+  return json.loads(raw, parse_float=parse_float)
@@ -0,0 +1,130 @@
+# Copyright 2023 The Zero Saver Authors. All Rights Reserved.
+#
+# This file is part of Zero Saver.
+#
+# Zero Saver is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later
+# version.
+#
+# Zero Saver is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR
+# A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# Zero Saver. If not, see <https://www.gnu.org/licenses/>.
+"""Rewrites a save file by splicing the modified values into its original
+bytes.
+
+Unmodified regions keep the exact bytes written by the game, including its
+compact formatting. Only the modified values are encoded, in the format of
+zero_saver_core.monkey_patch_json; JSON parsers read both alike."""
+from __future__ import annotations
+
+from collections.abc import Callable
+from typing import Any
+
+from zero_saver_core import save_index
+
+Dumps = Callable[[Any], str]
+
+
+def changed_paths(old: Any, new: Any) -> list[save_index.KeyPath]:
+  """Lists the most specific values of *new* differing from *old*, in
+  document order.
+
+  Values are compared by type and equality, so that a value replaced by an
+  equal one of the same type, such as Decimal('1.50') for Decimal('1.5'), keeps
+  its original bytes, while True for 1.0, or 75 for 75.0, is written. An object
+  whose member names or their order changed, or an array whose length
+  changed, is reported as a whole.
+
+  Returns:
+    The key paths of the differing values. The empty key path is returned if
+    the saves differ at the top level.
+  """
+  changed: list[save_index.KeyPath] = []
+  _diff(old, new, (), changed)
+  return changed
+
+
+def _equal(old: Any, new: Any) -> bool:
+  """Whether *old* and *new* are equal, and of the same type throughout."""
+  if isinstance(old, dict):
+    return (
+        isinstance(new, dict)
+        and list(old) == list(new)
+        and all(map(_equal, old.values(), new.values()))
+    )
+  if isinstance(old, list):
+    return (
+        isinstance(new, list)
+        and len(old) == len(new)
+        and all(map(_equal, old, new))
+    )
+  # 1.0 == True and 0 == False, but they are encoded differently.
+  return type(old) is type(new) and old == new
+
+
+def _diff(
+    old: Any,
+    new: Any,
+    key_path: save_index.KeyPath,
+    changed: list[save_index.KeyPath],
+) -> None:
+  if isinstance(old, dict) and isinstance(new, dict):
+    if list(old) != list(new):
+      changed.append(key_path)
+      return
+    for key, value in new.items():
+      if not _equal(old[key], value):
+        _diff(old[key], value, (*key_path, key), changed)
+  elif isinstance(old, list) and isinstance(new, list):
+    if len(old) != len(new):
+      changed.append(key_path)
+      return
+    for index, (old_value, value) in enumerate(zip(old, new)):
+      if not _equal(old_value, value):
+        _diff(old_value, value, (*key_path, index), changed)
+  elif not _equal(old, new):
+    changed.append(key_path)
+
+
+def _value_at(save: Any, key_path: save_index.KeyPath) -> Any:
+  value = save
+  for key in key_path:
+    value = value[key]
+  return value
+
+
+def splice(raw: bytes, old: Any, new: Any, dumps: Dumps) -> bytes:
+  """Encodes *new* by replacing, in *raw*, the values differing from *old*.
+
+  Args:
+    raw: The UTF-8 encoded save file *old* was decoded from.
+    old: The save decoded from *raw*.
+    new: The save to encode.
+    dumps: Encodes each modified value.
+
+  Returns:
+    The UTF-8 encoded *new*. If the saves differ at the top level, *new* is
+    encoded as a whole.
+
+  Raises:
+    ValueError: If *raw* is malformed.
+  """
+  paths = changed_paths(old, new)
+  if () in paths:
+    return dumps(new).encode('utf-8')
+  spans = save_index.locate_all(raw, paths)
+  pieces: list[bytes] = []
+  position = 0
+  # Duplicate member names resolve to their last member, as in json.loads(),
+  # which may come after the members following the first one.
+  for key_path in sorted(paths, key=spans.__getitem__):
+    start, end = spans[key_path]
+    pieces.append(raw[position:start])
+    pieces.append(dumps(_value_at(new, key_path)).encode('utf-8'))
+    position = end
+  pieces.append(raw[position:])
+  return b''.join(pieces)
@@ -0,0 +1,107 @@
+# Copyright 2023 The Zero Saver Authors. All Rights Reserved.
+#
+# This file is part of Zero Saver.
+#
+# Zero Saver is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later
+# version.
+#
+# Zero Saver is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR
+# A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# Zero Saver. If not, see <https://www.gnu.org/licenses/>.
+"""Timing of the stages of reading and writing "ZERO Sievert" saves.
+
+Every stage reports a zero_saver_core.tracing.Span to each registered tracer,
+once the stage completes or fails. See
+zero_saver_core.game_data_io.GameDataIO.tracers.
+
+Examples:
+  >>> data = GameDataIO(tracers=[print])
+  >>> data.tracers.append(lambda span: stats[span.stage].append(span.duration))
+"""
+from __future__ import annotations
+
+import contextlib
+import dataclasses
+import enum
+import time
+from collections.abc import Callable, Iterator, Sequence
+
+
+class Stage(enum.StrEnum):
+  READ = 'read'
+  PARSE = 'parse'
+  VERIFY = 'verify'
+  BACKUP = 'backup'
+  ENCODE = 'encode'
+  WRITE = 'write'
+  FSYNC = 'fsync'
+  REPLACE = 'replace'
+  FSYNC_DIRECTORY = 'fsync_directory'
+
+
+@dataclasses.dataclass(frozen=True)
+class Span:
+  """A completed stage.
+
+  Attributes:
+    stage: The stage.
+    start: The time.perf_counter() value at which the stage started.
+    duration: The wall time of the stage, in seconds.
+    size: The number of bytes read, decoded, copied, encoded or written by the
+      stage, if applicable.
+    error: The exception raised by the stage, if any.
+  """
+
+  stage: Stage
+  start: float
+  duration: float
+  size: int | None = None
+  error: BaseException | None = None
+
+
+Tracer = Callable[[Span], object]
+
+
+class Measurement:
+  """Collects the byte count of a stage in progress.
+
+  Attributes:
+    size: See zero_saver_core.tracing.Span.
+  """
+
+  __slots__ = ('size',)
+
+  def __init__(self):
+    self.size: int | None = None
+
+
+@contextlib.contextmanager
+def trace(tracers: Sequence[Tracer], stage: Stage) -> Iterator[Measurement]:
+  """Times the body of the with statement as *stage*, reporting it to each of
+  *tracers*. Exceptions raised by the body are reported, then re-raised.
+
+  Tracers are called on the thread running the stage, and must not raise.
+  Without tracers, nothing is timed.
+  """
+  measurement = Measurement()
+  if not tracers:
+    yield measurement
+    return
+  error: BaseException | None = None
+  start = time.perf_counter()
+  try:
+    yield measurement
+  except BaseException as e:
+    error = e
+    raise
+  finally:
+    span = Span(
+        stage, start, time.perf_counter() - start, measurement.size, error
+    )
+    for tracer in tracers:
+      tracer(span)
@@ -0,0 +1,350 @@
+# Copyright 2023 The Zero Saver Authors. All Rights Reserved.
+#
+# This file is part of Zero Saver.
+#
+# Zero Saver is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later
+# version.
+#
+# Zero Saver is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR
+# A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# Zero Saver. If not, see <https://www.gnu.org/licenses/>.
+"""Tracks which sections of a "ZERO Sievert" save were modified, so that the
+encoded text of unmodified sections can be reused between writes.
+
+A section is a member of save['data'], such as "general" or "pre_raid". Every
+dict and list of a tracked save is replaced by a TrackedDict or TrackedList,
+which reports its mutations to the section containing it.
+
+Containers inserted into a tracked save are stored as is, to preserve their
+identity. As their mutations cannot be observed, the section they are inserted
+into is tainted and re-encoded on every write."""
+from __future__ import annotations
+
+import decimal
+from collections.abc import Callable, Iterable
+from concurrent import futures
+from typing import Any, SupportsIndex
+
+from zero_saver_core import lazy_decimal
+from zero_saver_core import monkey_patch_json
+from zero_saver_core import parallel_encode
+
+# The member of the top-level object holding the sections.
+SECTIONS_MEMBER = 'data'
+Dumps = Callable[[Any], str]
+
+_IMMUTABLE = (str, int, float, decimal.Decimal, lazy_decimal.LazyDecimal)
+
+
+class SectionTracker:
+  """Records the sections modified since the last call to self.reset().
+
+  Attributes:
+    modified: The sections modified since the last reset.
+    tainted: The sections containing containers that are not tracked. Tainted
+      sections are never reset.
+  """
+
+  def __init__(self):
+    self.modified: set[str | None] = set()
+    self.tainted: set[str | None] = set()
+
+  def is_clean(self, section: str) -> bool:
+    return section not in self.modified and section not in self.tainted
+
+  def reset(self) -> None:
+    self.modified.clear()
+
+
+class TrackedDict(dict[Any, Any]):
+  """A dict reporting its mutations to a zero_saver_core.tracked.SectionTracker.
+  """
+
+  __slots__ = ('_tracker', '_section')
+
+  def __init__(
+      self,
+      tracker: SectionTracker,
+      section: str | None,
+      items: Iterable[tuple[Any, Any]] = (),
+  ):
+    super().__init__(items)
+    self._tracker = tracker
+    self._section = section
+
+  def __reduce__(self) -> Any:
+    # Pickled and copied as plain dicts; the tracker is not shared.
+    return dict, (dict(self),)
+
+  def _modified(self, key: Any, values: Iterable[Any] = ()) -> None:
+    del key  # used by subclasses
+    self._tracker.modified.add(self._section)
+    for value in values:
+      if not _is_owned(value, self._tracker, self._section):
+        self._tracker.tainted.add(self._section)
+
+  def __setitem__(self, key: Any, value: Any) -> None:
+    self._modified(key, (value,))
+    super().__setitem__(key, value)
+
+  def __delitem__(self, key: Any) -> None:
+    self._modified(key)
+    super().__delitem__(key)
+
+  def __ior__(self, other: Any) -> TrackedDict:
+    self.update(other)
+    return self
+
+  def clear(self) -> None:
+    for key in self:
+      self._modified(key)
+    super().clear()
+
+  def pop(self, key: Any, *default: Any) -> Any:
+    if key in self:
+      self._modified(key)
+    return super().pop(key, *default)
+
+  def popitem(self) -> tuple[Any, Any]:
+    if self:
+      self._modified(next(reversed(self.keys())))
+    return super().popitem()
+
+  def setdefault(self, key: Any, default: Any = None) -> Any:
+    if key not in self:
+      self._modified(key, (default,))
+    return super().setdefault(key, default)
+
+  def update(self, *args: Any, **kwargs: Any) -> None:
+    for key, value in dict(*args, **kwargs).items():
+      self[key] = value
+
+
+class TrackedSections(TrackedDict):
+  """The tracked save['data'], whose members are the sections. Mutations are
+  reported for the section inserted, replaced or removed."""
+
+  __slots__ = ()
+
+  def _modified(self, key: Any, values: Iterable[Any] = ()) -> None:
+    self._tracker.modified.add(key)
+    for value in values:
+      if not _is_owned(value, self._tracker, key):
+        self._tracker.tainted.add(key)
+
+
+class TrackedList(list[Any]):
+  """A list reporting its mutations to a zero_saver_core.tracked.SectionTracker.
+  """
+
+  __slots__ = ('_tracker', '_section')
+
+  def __init__(
+      self,
+      tracker: SectionTracker,
+      section: str | None,
+      items: Iterable[Any] = (),
+  ):
+    super().__init__(items)
+    self._tracker = tracker
+    self._section = section
+
+  def __reduce__(self) -> Any:
+    return list, (list(self),)
+
+  def _modified(self, values: Iterable[Any] = ()) -> None:
+    self._tracker.modified.add(self._section)
+    for value in values:
+      if not _is_owned(value, self._tracker, self._section):
+        self._tracker.tainted.add(self._section)
+
+  def __setitem__(self, index: Any, value: Any) -> None:
+    if isinstance(index, slice):
+      value = list(value)
+      self._modified(value)
+    else:
+      self._modified((value,))
+    super().__setitem__(index, value)
+
+  def __delitem__(self, index: SupportsIndex | slice) -> None:
+    self._modified()
+    super().__delitem__(index)
+
+  def __iadd__(  # type: ignore[override]
+      self, other: Iterable[Any]
+  ) -> TrackedList:
+    self.extend(other)
+    return self
+
+  def __imul__(self, count: SupportsIndex) -> TrackedList:
+    self._modified()
+    if count > 0:  # type: ignore[operator]
+      # Repeated containers are shared between positions.
+      self._modified(self)
+    return super().__imul__(count)
+
+  def append(self, value: Any) -> None:
+    self._modified((value,))
+    super().append(value)
+
+  def extend(self, values: Iterable[Any]) -> None:
+    values = list(values)
+    self._modified(values)
+    super().extend(values)
+
+  def insert(self, index: SupportsIndex, value: Any) -> None:
+    self._modified((value,))
+    super().insert(index, value)
+
+  def pop(self, index: SupportsIndex = -1) -> Any:
+    self._modified()
+    return super().pop(index)
+
+  def remove(self, value: Any) -> None:
+    self._modified()
+    super().remove(value)
+
+  def clear(self) -> None:
+    self._modified()
+    super().clear()
+
+  def reverse(self) -> None:
+    self._modified()
+    super().reverse()
+
+  def sort(self, *args: Any, **kwargs: Any) -> None:
+    self._modified()
+    super().sort(*args, **kwargs)
+
+
+def _is_owned(value: Any, tracker: SectionTracker, section: str | None) -> bool:
+  if value is None or isinstance(value, _IMMUTABLE):
+    return True
+  if isinstance(value, (TrackedDict, TrackedList)):
+    # pylint: disable-next=protected-access
+    return value._tracker is tracker and value._section == section
+  return False
+
+
+def _track(value: Any, tracker: SectionTracker, section: str | None) -> Any:
+  value_type = type(value)
+  if value_type is dict:
+    return TrackedDict(
+        tracker,
+        section,
+        [
+            (key, _track(child, tracker, section))
+            for key, child in value.items()
+        ],
+    )
+  if value_type is list:
+    return TrackedList(
+        tracker, section, [_track(child, tracker, section) for child in value]
+    )
+  return value
+
+
+def track_save(save: Any, tracker: SectionTracker) -> Any:
+  """Returns a copy of *save* whose dicts and lists report their mutations to
+  *tracker*. The members of save['data'] are tracked as separate sections;
+  anything else is tracked as the section None."""
+  # Exact types, like _track(): a save that is already tracked, or any other
+  # dict subclass, is returned as is.
+  # pylint: disable-next=unidiomatic-typecheck
+  if type(save) is not dict:
+    return save
+  tracked = TrackedDict(tracker, None)
+  for key, value in save.items():
+    # pylint: disable-next=unidiomatic-typecheck
+    if key == SECTIONS_MEMBER and type(value) is dict:
+      dict.__setitem__(
+          tracked,
+          key,
+          TrackedSections(
+              tracker,
+              None,
+              [
+                  (section, _track(child, tracker, section))
+                  for section, child in value.items()
+              ],
+          ),
+      )
+    else:
+      dict.__setitem__(tracked, key, _track(value, tracker, None))
+  return tracked
+
+
+class SectionCache:
+  """Encodes tracked saves, reusing the encoded text of every section left
+  unmodified since the previous encoding.
+
+  Attributes:
+    tracker: The tracker of the saves encoded by self.
+  """
+
+  def __init__(self):
+    self.tracker = SectionTracker()
+    self._encoded: dict[str, str] = {}
+
+  def track(self, save: Any) -> Any:
+    """Returns a tracked copy of *save*, forgetting any encoded sections."""
+    self.tracker = SectionTracker()
+    self._encoded.clear()
+    return track_save(save, self.tracker)
+
+  def encode(
+      self,
+      save: Any,
+      dumps: Dumps,
+      executor: futures.Executor | None = None,
+  ) -> str:
+    """Encodes *save*, producing the same text as dumps(save).
+
+    Saves not tracked by self.tracker are encoded with dumps as a whole. If
+    *executor* is set, modified sections are encoded as separate tasks of
+    *executor*. See zero_saver_core.parallel_encode for details.
+    """
+    sections = save.get(SECTIONS_MEMBER) if isinstance(save, dict) else None
+    if (
+        not isinstance(save, TrackedDict)
+        or not isinstance(sections, TrackedSections)
+        # pylint: disable-next=protected-access
+        or sections._tracker is not self.tracker
+        or None in self.tracker.tainted
+    ):
+      self._encoded.clear()
+      if executor is not None:
+        return parallel_encode.encode(save, dumps, executor)
+      return dumps(save)
+    pending: dict[str, str | futures.Future[str]] = {}
+    for section, value in sections.items():
+      text = self._encoded.get(section)
+      if text is not None and self.tracker.is_clean(section):
+        pending[section] = text
+      elif executor is not None:
+        pending[section] = executor.submit(dumps, value)
+      else:
+        pending[section] = dumps(value)
+    encoded = {
+        section: text if isinstance(text, str) else text.result()
+        for section, text in pending.items()
+    }
+    self._encoded = encoded
+    self.tracker.reset()
+    return monkey_patch_json.encode_object(
+        (
+            (
+                key,
+                monkey_patch_json.encode_object(encoded.items(), dumps)
+                if value is sections
+                else dumps(value),
+            )
+            for key, value in save.items()
+        ),
+        dumps,
+    )
@@ -0,0 +1,307 @@
+# Copyright 2023 The Zero Saver Authors. All Rights Reserved.
+#
+# This file is part of Zero Saver.
+#
+# Zero Saver is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later
+# version.
+#
+# Zero Saver is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR
+# A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# Zero Saver. If not, see <https://www.gnu.org/licenses/>.
+"""Watches a "ZERO Sievert" save file, streaming the changes made by the game.
+
+On Linux, the save directory is watched with inotify. Other platforms poll the
+save file, which is cheap as unchanged files are detected by
+zero_saver_core.game_data_io.GameDataIO.reload() without reading them."""
+from __future__ import annotations
+
+import ctypes
+import ctypes.util
+import dataclasses
+import enum
+import os
+import pathlib
+import select
+import struct
+import sys
+import threading
+from collections.abc import Iterator, Mapping
+from typing import Any, Protocol, TYPE_CHECKING
+
+from zero_saver_core import game_data_io
+from zero_saver_core import lazy_save
+from zero_saver_core import save_index
+
+if TYPE_CHECKING:
+  from _typeshed import StrPath
+
+# See inotify(7).
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_TO = 0x00000080
+_IN_NONBLOCK = os.O_NONBLOCK
+_IN_CLOEXEC = os.O_CLOEXEC
+# struct inotify_event, excluding the trailing name.
+_INOTIFY_EVENT = struct.Struct('iIII')
+_INOTIFY_BUFFER_SIZE = 2**16
+
+
+class Missing(enum.Enum):
+  """Marks the absent side of an added or removed key."""
+
+  MISSING = enum.auto()
+
+  def __repr__(self) -> str:
+    return self.name
+
+
+MISSING = Missing.MISSING
+
+
+@dataclasses.dataclass(frozen=True)
+class Change:
+  """A value of a save that differs between two versions of the save.
+
+  Attributes:
+    key_path: The path of the value, as in zero_saver_core.save_index.
+    old: The previous value, or MISSING if the value was added.
+    new: The current value, or MISSING if the value was removed.
+  """
+
+  key_path: save_index.KeyPath
+  old: Any
+  new: Any
+
+
+def diff_saves(old: Any, new: Any) -> list[Change]:
+  """Lists the values differing between two saves, in document order.
+
+  Objects are compared member by member and arrays element by element, so
+  inserting into an array reports every following element as changed.
+  Sections of zero_saver_core.lazy_save.LazySections whose raw bytes are
+  identical are skipped without being decoded.
+
+  Args:
+    old: The previous version of the save.
+    new: The current version of the save.
+
+  Returns:
+    The most specific changes; a changed object only reports its changed
+    members.
+  """
+  changes: list[Change] = []
+  _diff(old, new, (), changes)
+  return changes
+
+
+def _raw_equal(
+    old: Mapping[str, Any],
+    new: Mapping[str, Any],
+    key: str,
+) -> bool:
+  if not isinstance(old, lazy_save.LazySections):
+    return False
+  if not isinstance(new, lazy_save.LazySections):
+    return False
+  old_raw = old.raw(key)
+  return old_raw is not None and old_raw == new.raw(key)
+
+
+def _diff(
+    old: Any,
+    new: Any,
+    key_path: save_index.KeyPath,
+    changes: list[Change],
+) -> None:
+  if isinstance(old, Mapping) and isinstance(new, Mapping):
+    for key in old:
+      if key not in new:
+        changes.append(Change((*key_path, key), old[key], MISSING))
+    for key in new:
+      if key not in old:
+        changes.append(Change((*key_path, key), MISSING, new[key]))
+      elif not _raw_equal(old, new, key):
+        _diff(old[key], new[key], (*key_path, key), changes)
+  elif isinstance(old, list) and isinstance(new, list):
+    for index, (old_value, new_value) in enumerate(zip(old, new)):
+      _diff(old_value, new_value, (*key_path, index), changes)
+    for index in range(len(new), len(old)):
+      changes.append(Change((*key_path, index), old[index], MISSING))
+    for index in range(len(old), len(new)):
+      changes.append(Change((*key_path, index), MISSING, new[index]))
+  elif old != new:
+    changes.append(Change(key_path, old, new))
+
+
+class _Events(Protocol):
+
+  def wait(self, timeout: float) -> bool:
+    """Blocks for at most *timeout* seconds. Returns True if the save file may
+    have changed."""
+
+  def close(self) -> None:
+    ...
+
+
+class _PollingEvents:
+  """Reports a possible change every *timeout* seconds."""
+
+  def __init__(self):
+    self._closed = threading.Event()
+
+  def wait(self, timeout: float) -> bool:
+    return not self._closed.wait(timeout)
+
+  def close(self) -> None:
+    self._closed.set()
+
+
+class _InotifyEvents:
+  """Reports writes and renames to *save_path*, by watching its directory.
+  The game replaces the save file, so the file itself cannot be watched.
+
+  Raises:
+    OSError: If inotify is not available.
+  """
+
+  def __init__(self, save_path: pathlib.Path):
+    library = ctypes.util.find_library('c')
+    if sys.platform != 'linux' or library is None:
+      raise OSError('inotify is not available')
+    libc = ctypes.CDLL(library, use_errno=True)
+    self._file_name = os.fsencode(save_path.name)
+    self._file_descriptor = libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+    if self._file_descriptor < 0:
+      error = ctypes.get_errno()
+      raise OSError(error, os.strerror(error))
+    watch = libc.inotify_add_watch(
+        self._file_descriptor,
+        os.fsencode(save_path.parent),
+        _IN_CLOSE_WRITE | _IN_MOVED_TO,
+    )
+    if watch < 0:
+      error = ctypes.get_errno()
+      os.close(self._file_descriptor)
+      raise OSError(error, os.strerror(error), str(save_path.parent))
+
+  def wait(self, timeout: float) -> bool:
+    readable, _, _ = select.select([self._file_descriptor], [], [], timeout)
+    if not readable:
+      return False
+    changed = False
+    while True:
+      try:
+        buffer = os.read(self._file_descriptor, _INOTIFY_BUFFER_SIZE)
+      except BlockingIOError:
+        return changed
+      changed |= self._file_name in self._event_names(buffer)
+
+  @staticmethod
+  def _event_names(buffer: bytes) -> Iterator[bytes]:
+    offset = 0
+    while offset < len(buffer):
+      _, _, _, length = _INOTIFY_EVENT.unpack_from(buffer, offset)
+      offset += _INOTIFY_EVENT.size
+      yield buffer[offset:offset + length].rstrip(b'\0')
+      offset += length
+
+  def close(self) -> None:
+    os.close(self._file_descriptor)
+
+
+class SaveWatcher:
+  """Reloads a save file whenever it is rewritten, and reports what changed.
+
+  The save is read lazily; sections the game did not rewrite are compared as
+  raw bytes and never decoded.
+
+  Examples:
+    >>> with SaveWatcher() as watcher:
+    >>>   for changes in watcher.changes():
+    >>>     redraw(changes)
+
+  Args:
+    save_path: The save file to watch. Defaults to the save file of the
+      current user. See zero_saver_core.game_data_io.FileLocation.
+    poll_interval: The maximum delay in seconds before a change, or a call to
+      self.stop(), is noticed.
+    use_inotify: If set, inotify is used where available. Otherwise, the save
+      file is polled every *poll_interval* seconds.
+  """
+
+  def __init__(
+      self,
+      save_path: StrPath | None = None,
+      *,
+      poll_interval: float = 1.0,
+      use_inotify: bool = True,
+  ):
+    save_path = (
+        pathlib.Path(save_path)
+        if save_path
+        else game_data_io.FileLocation().save_path
+    )
+    self._poll_interval = poll_interval
+    self._stopped = threading.Event()
+    # Events are watched before the first read, so that no write is missed.
+    self._events: _Events = _PollingEvents()
+    if use_inotify:
+      try:
+        self._events = _InotifyEvents(save_path)
+      except OSError:
+        pass
+    try:
+      self._game_data_io = game_data_io.GameDataIO(save_path, lazy=True)
+    except Exception:
+      self._events.close()
+      raise
+
+  @property
+  def save(self) -> game_data_io.ZeroSievertSave:
+    """The latest successfully read version of the save."""
+    return self._game_data_io.save
+
+  def changes(self) -> Iterator[list[Change]]:
+    """Yields the changes of every rewrite of the save file, until self.stop()
+    is called. Rewrites without changes are not reported.
+
+    A save file that cannot be read, e.g. as the game is writing it, is
+    skipped until its next rewrite.
+    """
+    while not self._stopped.is_set():
+      if not self._events.wait(self._poll_interval):
+        continue
+      previous = self._game_data_io.save
+      try:
+        if not self._game_data_io.reload():
+          continue
+      except (OSError, ValueError):
+        continue
+      try:
+        changes = diff_saves(previous, self._game_data_io.save)
+      except ValueError:
+        # Only the structure is checked by reload(); sections are decoded by
+        # the diff. The rewrite is skipped, and read again once rewritten.
+        self._game_data_io.save = previous
+        self._game_data_io.forget_loaded_file()
+        continue
+      if changes:
+        yield changes
+
+  def stop(self) -> None:
+    """Ends self.changes() within *poll_interval* seconds. Thread-safe."""
+    self._stopped.set()
+
+  def close(self) -> None:
+    self.stop()
+    self._events.close()
+
+  def __enter__(self) -> SaveWatcher:
+    return self
+
+  def __exit__(self, *exc_info: object) -> None:
+    self.close()
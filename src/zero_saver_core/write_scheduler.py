@@ -0,0 +1,188 @@
+# Copyright 2023 The Zero Saver Authors. All Rights Reserved.
+#
+# This file is part of Zero Saver.
+#
+# Zero Saver is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later
+# version.
+#
+# Zero Saver is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR
+# A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# Zero Saver. If not, see <https://www.gnu.org/licenses/>.
+"""Coalesces rapid successive writes of a "ZERO Sievert" save.
+
+Each zero_saver_core.game_data_io.GameDataIO.write_save_file() call verifies,
+backs up, encodes and replaces the whole save. Editors requesting a write on
+every change instead call WriteScheduler.request_write(); requests arriving
+within *delay* of each other share a single write.
+
+Examples:
+  >>> with WriteScheduler(GameDataIO(), delay=0.5) as scheduler:
+  ...   with scheduler.lock:
+  ...     scheduler.data.save['data']['difficulty']['edited'] = 'value'
+  ...   scheduler.request_write().result()  # Waits until written.
+"""
+from __future__ import annotations
+
+import threading
+import time
+from concurrent import futures
+
+from zero_saver_core import game_data_io
+
+DEFAULT_DELAY = 0.5
+DEFAULT_MAXIMUM_DELAY = 2.0
+
+
+class WriteScheduler:
+  """Writes *data* on a background thread once no write was requested for
+  *delay* seconds, or at the latest *maximum_delay* seconds after the oldest
+  unwritten request.
+
+  self.lock is held while self.data is written, on the background thread.
+  Every thread modifying self.data.save, including the one requesting writes,
+  must hold it while doing so.
+
+  Attributes:
+    data: The save written by the scheduler.
+    lock: Held while self.data is written.
+  """
+
+  def __init__(
+      self,
+      data: game_data_io.GameDataIO,
+      *,
+      delay: float = DEFAULT_DELAY,
+      maximum_delay: float = DEFAULT_MAXIMUM_DELAY,
+      durability: game_data_io.Durability = game_data_io.Durability.FILE,
+  ):
+    if delay < 0 or maximum_delay < delay:
+      raise ValueError(
+          f'Invalid delays: {delay=}, {maximum_delay=}. Expected'
+          ' 0 <= delay <= maximum_delay.'
+      )
+    self.data = data
+    self.lock = threading.RLock()
+    self._delay = delay
+    self._maximum_delay = maximum_delay
+    self._durability = durability
+    self._condition = threading.Condition()
+    # Requests not yet picked up by a write, and those of the write in
+    # progress.
+    self._pending: list[futures.Future[None]] = []
+    self._writing: list[futures.Future[None]] = []
+    self._first_request = 0.0
+    self._last_request = 0.0
+    self._flush_requested = False
+    self._closed = False
+    self._thread = threading.Thread(
+        target=self._run, name='WriteScheduler', daemon=True
+    )
+    self._thread.start()
+
+  def request_write(self) -> futures.Future[None]:
+    """Schedules a write of self.data, including every modification made
+    before this call.
+
+    Returns:
+      A future completed once the write is durable, at the level of
+      *durability*. Its exception is the exception raised by
+      zero_saver_core.game_data_io.GameDataIO.write_save_file(), if any.
+      Cancelling it drops the request; the write is skipped if no other request
+      shares it.
+
+    Raises:
+      RuntimeError: If the scheduler is closed.
+    """
+    future: futures.Future[None] = futures.Future()
+    with self._condition:
+      if self._closed:
+        raise RuntimeError('Cannot request writes of a closed WriteScheduler.')
+      now = time.monotonic()
+      if not self._pending:
+        self._first_request = now
+      self._last_request = now
+      self._pending.append(future)
+      self._condition.notify()
+    return future
+
+  def flush(self) -> None:
+    """Writes pending requests without further delay, and waits for every
+    requested write to complete.
+
+    Raises:
+      Exception: The exception raised by any of the awaited writes.
+    """
+    with self._condition:
+      awaited = self._writing + self._pending
+      self._flush_requested = bool(self._pending)
+      self._condition.notify()
+    for future in awaited:
+      if not future.cancelled():
+        future.result()
+
+  def close(self) -> None:
+    """Writes pending requests, then stops the background thread. Errors of
+    these writes are reported through their futures only."""
+    with self._condition:
+      self._closed = True
+      self._condition.notify()
+    self._thread.join()
+
+  def __enter__(self) -> WriteScheduler:
+    return self
+
+  def __exit__(self, *exc_info) -> None:
+    self.close()
+
+  def _run(self) -> None:
+    while True:
+      with self._condition:
+        while not self._is_due():
+          if self._closed and not self._pending:
+            return
+          self._condition.wait(self._timeout())
+        batch, self._pending = self._pending, []
+        self._writing = batch
+        self._flush_requested = False
+      self._write(batch)
+      with self._condition:
+        self._writing = []
+
+  def _due_time(self) -> float:
+    return min(
+        self._last_request + self._delay,
+        self._first_request + self._maximum_delay,
+    )
+
+  def _is_due(self) -> bool:
+    if not self._pending:
+      return False
+    if self._flush_requested or self._closed:
+      return True
+    return time.monotonic() >= self._due_time()
+
+  def _timeout(self) -> float | None:
+    if not self._pending:
+      return None
+    return max(self._due_time() - time.monotonic(), 0)
+
+  def _write(self, batch: list[futures.Future[None]]) -> None:
+    batch = [
+        future for future in batch if future.set_running_or_notify_cancel()
+    ]
+    if not batch:
+      return
+    try:
+      with self.lock:
+        self.data.write_save_file(durability=self._durability)
+    except Exception as e:  # pylint: disable=broad-exception-caught
+      for future in batch:
+        future.set_exception(e)
+    else:
+      for future in batch:
+        future.set_result(None)
@@ -0,0 +1,79 @@
+#  Copyright 2023 The Zero Saver Authors. All Rights Reserved.
+#
+#  This file is part of Zero Saver.
+#
+#  Zero Saver is free software: you can redistribute it and/or modify it under
+#  the terms of the GNU General Public License as published by the Free Software
+#  Foundation, either version 3 of the License, or (at your option) any later
+#  version.
+#
+#  Zero Saver is distributed in the hope that it will be useful, but WITHOUT ANY
+#  WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR
+#  A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+#  You should have received a copy of the GNU General Public License along with
+#  Zero Saver. If not, see <https://www.gnu.org/licenses/>.
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-class-docstring
+import json
+
+import pytest
+import pytest_cases
+
+from zero_saver_core import backup_delta
+from zero_saver_core import save_index
+
+_CASES = 'case_game_data_io.case_game_data_io'
+_OLD = b'{"a": {"b": 1.5, "c": [1, 2, 3]}, "d": "x", "e": []}'
+
+
+class TestBackupDelta:
+
+  @pytest.mark.parametrize(
+      'new, expected',
+      (
+          (_OLD, []),
+          (
+              b'{"a": {"b": 1.50, "c": [1, 2, 3]}, "d": "x", "e": []}',
+              [(('a', 'b'), '1.50')],
+          ),
+          (
+              b'{"a": {"b": 1.5, "c": [1, 7, 3]}, "d": "y", "e": [{}]}',
+              [(('a', 'c', 1), '7'), (('d',), '"y"'), (('e',), '[{}]')],
+          ),
+      ),
+  )
+  def test_backup_delta_diff_and_patch(self, new, expected):
+    edits = backup_delta.diff(_OLD, new)
+    assert edits == expected
+    assert backup_delta.patch(_OLD, edits) == new
+
+  @pytest.mark.parametrize(
+      'new',
+      (
+          b'{"a": {"b": 1.5, "c": [1, 2, 3]}, "d": "x"}',
+          b'{"a":{"b":1.5,"c":[1,2,3]},"d":"y","e":[]}',
+      ),
+  )
+  def test_backup_delta_diff_irreproducible_returns_none(self, new):
+    assert backup_delta.diff(_OLD, new) is None
+
+  def test_backup_delta_patch_missing_key_raises_key_error(self):
+    with pytest.raises(KeyError):
+      backup_delta.patch(_OLD, [(('z',), '1')])
+
+  @pytest_cases.parametrize_with_cases(
+      'save_file',
+      cases=_CASES,
+      prefix='save_file_path_',
+      has_tag=['Well-Formed'],
+  )
+  def test_backup_delta_save_file_edit(self, save_file):
+    with open(save_file, 'rb') as f:
+      old = f.read()
+    difficulty = json.loads(old)['data']['difficulty']
+    key_path = ('data', 'difficulty', next(iter(difficulty)))
+    start, end = save_index.locate(old, key_path)
+    new = old[:start] + b'"edited"' + old[end:]
+    edits = backup_delta.diff(old, new)
+    assert edits == [(key_path, '"edited"')]
+    assert backup_delta.patch(old, edits) == new
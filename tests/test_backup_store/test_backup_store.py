@@ -0,0 +1,415 @@
+#  Copyright 2023 The Zero Saver Authors. All Rights Reserved.
+#
+#  This file is part of Zero Saver.
+#
+#  Zero Saver is free software: you can redistribute it and/or modify it under
+#  the terms of the GNU General Public License as published by the Free Software
+#  Foundation, either version 3 of the License, or (at your option) any later
+#  version.
+#
+#  Zero Saver is distributed in the hope that it will be useful, but WITHOUT ANY
+#  WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR
+#  A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+#  You should have received a copy of the GNU General Public License along with
+#  Zero Saver. If not, see <https://www.gnu.org/licenses/>.
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-class-docstring
+import hashlib
+
+import pytest
+
+from zero_saver_core import backup_store
+
+_NAME = 'save_shared_1.dat'
+
+
+@pytest.fixture
+def store(tmp_path):
+  return backup_store.BackupStore(
+      tmp_path.joinpath('backup'), maximum_backups=3
+  )
+
+
+def objects(store):
+  directory = store.directory.joinpath(backup_store.OBJECTS_DIRECTORY)
+  return sorted(path.name for path in directory.iterdir())
+
+
+class TestBackupStore:
+
+  def test_backup_store_add_stores_content_by_hash(self, store):
+    ref = store.add(b'first', _NAME)
+    assert ref.sha256 == hashlib.sha256(b'first').hexdigest()
+    assert ref.name == _NAME
+    assert store.read(ref) == b'first'
+    assert store.refs() == [ref]
+
+  def test_backup_store_deduplicates_content(self, store):
+    first = store.add(b'first', _NAME)
+    store.add(b'second', _NAME)
+    third = store.add(b'first', _NAME)
+    assert third.sha256 == first.sha256
+    assert len(store.refs()) == 3
+    assert len(objects(store)) == 2
+
+  def test_backup_store_latest_content_writes_nothing(self, store):
+    ref = store.add(b'first', _NAME)
+    refs_log = store.directory.joinpath(backup_store.REFS_FILE)
+    log = refs_log.read_bytes()
+    assert store.add(b'first', _NAME) == ref
+    assert refs_log.read_bytes() == log
+
+  def test_backup_store_rotates_refs_and_unreferenced_objects(self, store):
+    for content in (b'1', b'2', b'3', b'4', b'5', b'6', b'5'):
+      store.add(content, _NAME)
+    assert [store.read(ref) for ref in store.refs()] == [b'5', b'6', b'5']
+    assert objects(store) == sorted(
+        hashlib.sha256(content).hexdigest() for content in (b'5', b'6')
+    )
+    refs_log = store.directory.joinpath(backup_store.REFS_FILE)
+    assert len(refs_log.read_text().splitlines()) == 3
+
+  def test_backup_store_rotates_once_log_is_compaction_factor_full(
+      self, store
+  ):
+    for content in (b'1', b'2', b'3', b'4', b'5', b'6'):
+      store.add(content, _NAME)
+    assert [store.read(ref) for ref in store.refs()] == [b'4', b'5', b'6']
+    assert len(objects(store)) == 6
+    store.add(b'7', _NAME)
+    assert [store.read(ref) for ref in store.refs()] == [b'5', b'6', b'7']
+    assert len(objects(store)) == 3
+
+  def test_backup_store_skips_malformed_refs(self, store):
+    ref = store.add(b'first', _NAME)
+    with open(
+        store.directory.joinpath(backup_store.REFS_FILE), 'a', encoding='utf-8'
+    ) as f:
+      f.write('2023-01-01T00:00:00 abc')
+    assert store.refs() == [ref]
+
+  def test_backup_store_add_mismatched_copy_returns_none(self, mocker, store):
+    mocker.patch.object(
+        backup_store.BackupStore, '_digest', return_value='0' * 64
+    )
+    assert store.add(b'first', _NAME, verify=True) is None
+    assert store.add_file(self.source(store), _NAME, verify=True) is None
+    assert not store.refs()
+    assert not objects(store)
+
+  def test_backup_store_reads_back_only_if_verifying(self, mocker, store):
+    digest = mocker.spy(backup_store.BackupStore, '_digest')
+    store.add_file(self.source(store), _NAME)
+    digest.assert_not_called()
+    store.add_file(self.source(store, b'second'), _NAME, verify=True)
+    digest.assert_called_once()
+
+  @staticmethod
+  def source(store, content=b'first'):
+    source = store.directory.parent.joinpath('source.dat')
+    source.write_bytes(content)
+    return source
+
+  def test_backup_store_add_file_copies_and_hashes(self, store):
+    ref = store.add_file(self.source(store, b'x' * 10), _NAME, blocksize=3)
+    assert ref.sha256 == hashlib.sha256(b'x' * 10).hexdigest()
+    assert store.read(ref) == b'x' * 10
+
+  def test_backup_store_add_file_deduplicates_content(self, store):
+    store.add_file(self.source(store), _NAME)
+    store.add_file(self.source(store, b'second'), _NAME)
+    store.add_file(self.source(store), _NAME)
+    assert len(store.refs()) == 3
+    assert len(objects(store)) == 2
+
+  def test_backup_store_add_file_stored_content_writes_nothing(
+      self, mocker, store
+  ):
+    store.add_file(self.source(store), _NAME)
+    store.add_file(self.source(store, b'second'), _NAME)
+    mkstemp = mocker.spy(backup_store.tempfile, 'mkstemp')
+    assert store.add_file(self.source(store, b'second'), _NAME)
+    assert store.add_file(self.source(store), _NAME)
+    mkstemp.assert_not_called()
+    assert [store.read(ref) for ref in store.refs()] == [
+        b'first',
+        b'second',
+        b'first',
+    ]
+
+
+class TestBackupStoreCompression:
+
+  @pytest.fixture(params=list(backup_store.Compression))
+  def compression(self, request):
+    return request.param
+
+  @pytest.mark.parametrize('level', (None, 1))
+  @pytest.mark.parametrize('verify', (False, True))
+  def test_backup_store_compression_round_trips(
+      self, tmp_path, compression, level, verify
+  ):
+    store = backup_store.BackupStore(
+        tmp_path.joinpath('backup'),
+        maximum_backups=3,
+        compression=compression,
+        level=level,
+    )
+    source = tmp_path.joinpath(_NAME)
+    source.write_bytes(b'{"a": 0.0, "b": 0.0}' * 1000)
+    ref = store.add_file(source, _NAME, verify=verify, blocksize=1000)
+    assert store.read(ref) == source.read_bytes()
+    restored = tmp_path.joinpath('restored.dat')
+    store.restore(ref, restored)
+    assert restored.read_bytes() == source.read_bytes()
+    stored_size = store.object_path(ref.sha256).stat().st_size
+    if compression == backup_store.Compression.NONE:
+      assert stored_size == source.stat().st_size
+    else:
+      assert stored_size * 10 < source.stat().st_size
+    assert ref.sha256 == hashlib.sha256(source.read_bytes()).hexdigest()
+
+  @pytest.mark.parametrize(
+      ('compression', 'level'),
+      (
+          (backup_store.Compression.NONE, 100),
+          (backup_store.Compression.ZLIB, -1),
+          (backup_store.Compression.ZLIB, 0),
+          (backup_store.Compression.BZ2, 1),
+          (backup_store.Compression.LZMA, 0),
+          (backup_store.Compression.LZMA, 9),
+      ),
+  )
+  def test_backup_store_compression_valid_levels(
+      self, tmp_path, compression, level
+  ):
+    store = backup_store.BackupStore(
+        tmp_path, maximum_backups=3, compression=compression, level=level
+    )
+    ref = store.add(b'first' * 100, _NAME)
+    assert store.read(ref) == b'first' * 100
+
+  @pytest.mark.parametrize(
+      ('compression', 'level'),
+      (
+          (backup_store.Compression.ZLIB, -2),
+          (backup_store.Compression.ZLIB, 10),
+          (backup_store.Compression.BZ2, 0),
+          (backup_store.Compression.BZ2, 10),
+          (backup_store.Compression.LZMA, -1),
+          (backup_store.Compression.LZMA, 10),
+      ),
+  )
+  def test_backup_store_compression_invalid_level_raises_value_error(
+      self, tmp_path, compression, level
+  ):
+    with pytest.raises(ValueError):
+      backup_store.BackupStore(
+          tmp_path, maximum_backups=3, compression=compression, level=level
+      )
+
+  def test_backup_store_reads_objects_of_other_compressions(
+      self, tmp_path, compression
+  ):
+    directory = tmp_path.joinpath('backup')
+    refs = [
+        backup_store.BackupStore(
+            directory, maximum_backups=10, compression=other
+        ).add(other.encode('utf-8'), _NAME)
+        for other in backup_store.Compression
+    ]
+    store = backup_store.BackupStore(
+        directory, maximum_backups=10, compression=compression
+    )
+    assert [store.read(ref) for ref in refs] == [
+        other.encode('utf-8') for other in backup_store.Compression
+    ]
+    assert store.add(b'zlib', _NAME) == store.refs()[-1]
+    assert len(list(directory.joinpath('objects').iterdir())) == len(refs)
+
+  def test_backup_store_rotates_compressed_objects(self, tmp_path, compression):
+    store = backup_store.BackupStore(
+        tmp_path, maximum_backups=1, compression=compression
+    )
+    store.add(b'first', _NAME)
+    store.add(b'second', _NAME)
+    ref = store.add(b'third', _NAME)
+    assert [path.name for path in tmp_path.joinpath('objects').iterdir()] == [
+        store.object_path(ref.sha256).name
+    ]
+
+  @pytest.mark.parametrize(
+      'compression',
+      [
+          compression
+          for compression in backup_store.Compression
+          if compression != backup_store.Compression.NONE
+      ],
+  )
+  def test_backup_store_corrupt_object_raises_value_error(
+      self, tmp_path, compression
+  ):
+    store = backup_store.BackupStore(
+        tmp_path, maximum_backups=3, compression=compression
+    )
+    ref = store.add(b'first' * 100, _NAME)
+    path = store.object_path(ref.sha256)
+    path.write_bytes(path.read_bytes()[:-4])
+    with pytest.raises(ValueError):
+      store.read(ref)
+
+
+class TestBackupStoreDelta:
+
+  @staticmethod
+  def version(value):
+    return b'{"a": {"b": %d, "c": [1, 2, 3]}, "d": "x"}' % value
+
+  @staticmethod
+  def suffixes(store, refs):
+    return [store.object_path(ref.sha256).suffix for ref in refs]
+
+  def test_backup_store_delta_chain_with_keyframes(self, tmp_path):
+    store = backup_store.BackupStore(
+        tmp_path, maximum_backups=10, keyframe_interval=3
+    )
+    refs = [store.add(self.version(value), _NAME) for value in range(5)]
+    assert self.suffixes(store, refs) == [
+        '',
+        backup_store.DELTA_SUFFIX,
+        backup_store.DELTA_SUFFIX,
+        '',
+        backup_store.DELTA_SUFFIX,
+    ]
+    assert [store.read(ref) for ref in refs] == [
+        self.version(value) for value in range(5)
+    ]
+    restored = tmp_path.joinpath('restored.dat')
+    store.restore(refs[2], restored)
+    assert restored.read_bytes() == self.version(2)
+
+  def test_backup_store_delta_of_reformatted_save_is_keyframe(self, tmp_path):
+    store = backup_store.BackupStore(
+        tmp_path, maximum_backups=10, keyframe_interval=10
+    )
+    store.add(self.version(0), _NAME)
+    ref = store.add(self.version(1).replace(b' ', b''), _NAME)
+    assert self.suffixes(store, [ref]) == ['']
+
+  def test_backup_store_delta_per_save_name(self, tmp_path):
+    store = backup_store.BackupStore(
+        tmp_path, maximum_backups=10, keyframe_interval=10
+    )
+    store.add(self.version(0), _NAME)
+    other = store.add(self.version(1), 'other.dat')
+    ref = store.add(self.version(2), _NAME)
+    assert self.suffixes(store, [other, ref]) == [
+        '',
+        backup_store.DELTA_SUFFIX,
+    ]
+
+  def test_backup_store_delta_reuses_previous_content(self, tmp_path, mocker):
+    store = backup_store.BackupStore(
+        tmp_path, maximum_backups=10, keyframe_interval=10
+    )
+    content = mocker.spy(store, '_content')
+    refs = [store.add(self.version(value), _NAME) for value in range(4)]
+    assert self.suffixes(store, refs[1:]) == [backup_store.DELTA_SUFFIX] * 3
+    content.assert_not_called()
+
+  def test_backup_store_rotation_keeps_delta_bases(self, tmp_path):
+    store = backup_store.BackupStore(
+        tmp_path,
+        maximum_backups=2,
+        keyframe_interval=10,
+        compression=backup_store.Compression.ZLIB,
+    )
+    for value in range(6):
+      store.add_file(self.source(tmp_path, self.version(value)), _NAME)
+    refs = store.refs()
+    assert [store.read(ref) for ref in refs] == [
+        self.version(4),
+        self.version(5),
+    ]
+    assert len(list(tmp_path.joinpath('objects').iterdir())) == 6
+
+  def test_backup_store_corrupt_delta_raises_value_error(self, tmp_path):
+    store = backup_store.BackupStore(
+        tmp_path, maximum_backups=10, keyframe_interval=10
+    )
+    base = store.add(self.version(0), _NAME)
+    ref = store.add(self.version(1), _NAME)
+    corrupt = self.version(0).replace(b'"x"', b'"z"')
+    store.object_path(base.sha256).write_bytes(corrupt)
+    with pytest.raises(ValueError):
+      store.read(ref)
+
+  @staticmethod
+  def source(tmp_path, content):
+    source = tmp_path.joinpath(_NAME)
+    source.write_bytes(content)
+    return source
+
+
+class TestBackupStoreManifest:
+
+  def test_backup_store_manifest_lists_objects(self, store):
+    ref = store.add(b'first', _NAME)
+    (listing,) = store.objects()
+    assert listing.sha256 == ref.sha256
+    assert listing.size == store.object_path(ref.sha256).stat().st_size
+    manifest = store.directory.joinpath(backup_store.MANIFEST_FILE)
+    assert manifest.read_text() == listing.to_line()
+
+  def test_backup_store_rotation_does_not_scan(self, mocker, store):
+    for content in (b'1', b'2', b'3'):
+      store.add(content, _NAME)
+    scandir = mocker.spy(backup_store.os, 'scandir')
+    for content in (b'4', b'5', b'6', b'7'):
+      store.add(content, _NAME)
+    scandir.assert_not_called()
+    assert objects(store) == sorted(
+        listing.file_name for listing in store.objects()
+    )
+    assert len(objects(store)) == 3
+
+  def test_backup_store_reads_logs_of_other_stores(self, store):
+    other = backup_store.BackupStore(store.directory, maximum_backups=3)
+    first = store.add(b'first', _NAME)
+    assert other.refs() == [first]
+    for content in (b'2', b'3', b'4'):
+      store.add(content, _NAME)
+    assert other.refs() == store.refs()
+    assert other.objects() == store.objects()
+
+  def test_backup_store_repairs_missing_manifest(self, store):
+    first = store.add(b'first', _NAME)
+    store.add(b'second', _NAME)
+    store.directory.joinpath(backup_store.MANIFEST_FILE).unlink()
+    store = backup_store.BackupStore(store.directory, maximum_backups=1)
+    assert len(store.objects()) == 2
+    third = store.add(b'third', _NAME)
+    assert objects(store) == [third.sha256]
+    assert first.sha256 not in objects(store)
+
+  def test_backup_store_repairs_deleted_object(self, store):
+    ref = store.add(b'first', _NAME)
+    store.object_path(ref.sha256).unlink()
+    assert store.add(b'first', _NAME) != ref
+    assert store.read(store.refs()[-1]) == b'first'
+    assert [listing.sha256 for listing in store.objects()] == [ref.sha256]
+
+  def test_backup_store_lists_unlisted_object_on_read(self, store):
+    ref = store.add(b'first', _NAME)
+    store.directory.joinpath(backup_store.MANIFEST_FILE).write_text('')
+    assert store.read(ref) == b'first'
+    assert len(store.objects()) == 1
+
+  def test_backup_store_appends_after_torn_ref(self, store):
+    first = store.add(b'first', _NAME)
+    with open(
+        store.directory.joinpath(backup_store.REFS_FILE), 'a', encoding='utf-8'
+    ) as f:
+      f.write('2023-01-01T00:00:00 abc')
+    second = store.add(b'second', _NAME)
+    assert store.refs() == [first, second]
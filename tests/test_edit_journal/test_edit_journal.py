@@ -0,0 +1,133 @@
+#  Copyright 2023 The Zero Saver Authors. All Rights Reserved.
+#
+#  This file is part of Zero Saver.
+#
+#  Zero Saver is free software: you can redistribute it and/or modify it under
+#  the terms of the GNU General Public License as published by the Free Software
+#  Foundation, either version 3 of the License, or (at your option) any later
+#  version.
+#
+#  Zero Saver is distributed in the hope that it will be useful, but WITHOUT ANY
+#  WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR
+#  A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+#  You should have received a copy of the GNU General Public License along with
+#  Zero Saver. If not, see <https://www.gnu.org/licenses/>.
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-class-docstring
+import decimal
+import json
+import pathlib
+
+import pytest
+
+from zero_saver_core import edit_journal
+from zero_saver_core import monkey_patch_json
+
+_BASE = b'\x01' * 32
+_B = decimal.Decimal('1.5')
+
+
+def dumps(value):
+  return json.dumps(value, cls=monkey_patch_json.ZeroSievertJsonEncoder)
+
+
+def new_save():
+  return {'a': {'b': _B, 'c': [1, 2]}, 'd': 'x'}
+
+
+def replay(journal, save, base=_BASE):
+  return journal.replay(save, base, json.loads, decimal.Decimal)
+
+
+class TestEditJournal:
+
+  @pytest.mark.parametrize(
+      'key_path, expected',
+      (
+          (('a', 'b'), {'a': {'b': 0, 'c': [1, 2]}, 'd': 'x'}),
+          (('a', 'c', 0), {'a': {'b': _B, 'c': [0, 2]}, 'd': 'x'}),
+          (('a', 'c', 2), {'a': {'b': _B, 'c': [1, 2, 0]}, 'd': 'x'}),
+          (('e',), {'a': {'b': _B, 'c': [1, 2]}, 'd': 'x', 'e': 0}),
+      ),
+  )
+  def test_edit_journal_apply_set(self, key_path, expected):
+    save = new_save()
+    edit_journal.apply_set(save, key_path, 0)
+    assert save == expected
+
+  @pytest.mark.parametrize(
+      'key_path, error',
+      (
+          (('z', 'b'), KeyError),
+          (('a', 'c', 3), IndexError),
+          (('a', 'c', 'b'), TypeError),
+          ((), ValueError),
+      ),
+  )
+  def test_edit_journal_apply_set_invalid_key_path(self, key_path, error):
+    with pytest.raises(error):
+      edit_journal.apply_set(new_save(), key_path, 0)
+
+  def test_edit_journal_replays_records(self, tmp_path):
+    journal = edit_journal.EditJournal(tmp_path.joinpath('save.journal'))
+    assert replay(journal, new_save()) == 0
+    journal.record_set(('a', 'b'), decimal.Decimal('2.50'), dumps)
+    journal.record_set(('a', 'c', 2), {'é': None}, dumps)
+    journal.record_delete(('d',))
+    expected = {'a': {'b': decimal.Decimal('2.50'), 'c': [1, 2, {'é': None}]}}
+    save = new_save()
+    journal = edit_journal.EditJournal(journal.path)
+    assert replay(journal, save) == 3
+    assert save == expected
+    assert str(save['a']['b']) == '2.50'
+    assert journal.size == journal.path.stat().st_size
+
+  def test_edit_journal_drops_torn_record(self, tmp_path):
+    journal = edit_journal.EditJournal(tmp_path.joinpath('save.journal'))
+    replay(journal, new_save())
+    journal.record_set(('d',), 'y', dumps)
+    with open(journal.path, 'ab') as f:
+      f.write(b'{"set": ["d"], "va')
+    save = new_save()
+    assert replay(journal, save) == 1
+    assert save['d'] == 'y'
+    assert journal.path.read_bytes().endswith(b'"y"}\n')
+
+  def test_edit_journal_sets_aside_stale_journal(self, tmp_path):
+    journal = edit_journal.EditJournal(tmp_path.joinpath('save.journal'))
+    replay(journal, new_save())
+    journal.record_set(('d',), 'y', dumps)
+    recorded = journal.path.read_bytes()
+    save = new_save()
+    assert replay(journal, save, base=b'\x02' * 32) == 0
+    assert save == new_save()
+    stale = tmp_path.joinpath('save.journal' + edit_journal.STALE_SUFFIX)
+    assert stale.read_bytes() == recorded
+    assert replay(journal, save, base=b'\x02' * 32) == 0
+
+  def test_edit_journal_journal_path_per_save_path(self, tmp_path):
+    first = edit_journal.journal_path(tmp_path, 'a/save_shared_1.dat')
+    second = edit_journal.journal_path(tmp_path, 'b/save_shared_1.dat')
+    assert first != second
+    assert first.parent == second.parent == tmp_path
+    assert first == edit_journal.journal_path(
+        tmp_path, pathlib.Path('a/save_shared_1.dat').absolute()
+    )
+
+  def test_edit_journal_is_full(self, tmp_path):
+    journal = edit_journal.EditJournal(
+        tmp_path.joinpath('save.journal'), maximum_size=100
+    )
+    journal.start(_BASE)
+    assert not journal.is_full
+    journal.record_set(('d',), 'y' * 100, dumps)
+    assert journal.is_full
+    journal.start(_BASE)
+    assert not journal.is_full
+
+  def test_edit_journal_unappliable_record_raises_value_error(self, tmp_path):
+    journal = edit_journal.EditJournal(tmp_path.joinpath('save.journal'))
+    journal.start(_BASE)
+    journal.record_delete(('z',))
+    with pytest.raises(ValueError):
+      replay(journal, new_save())
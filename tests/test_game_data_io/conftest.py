@@ -15,11 +15,14 @@
 # pylint: disable=missing-module-docstring
 # pylint: disable=missing-class-docstring
 import io
+import shutil
 
 import pytest
 
+from resources import file_util
 
-class FileLikeStringIO(io.StringIO):
+
+class FileLikeBytesIO(io.BytesIO):
 
   def __call__(self, *args, **kwargs):
     """Mimics call to open()"""
@@ -40,6 +43,22 @@ class FileLikeStringIO(io.StringIO):
 
 @pytest.fixture
 def file_like_fixture():
-  in_memory_file = FileLikeStringIO()
+  in_memory_file = FileLikeBytesIO()
   yield in_memory_file
   in_memory_file.true_close()
+
+
+@pytest.fixture
+def save_file(tmp_path):
+  save_file = tmp_path.joinpath('save_shared_1.dat')
+  shutil.copy(
+      file_util.full_file_path('0_31_save_new_hunter_equipment1'), save_file
+  )
+  return save_file
+
+
+@pytest.fixture
+def backup_directory(tmp_path):
+  backup_directory = tmp_path.joinpath('backup')
+  backup_directory.mkdir()
+  return backup_directory
@@ -17,16 +17,31 @@
 # pylint: disable=redefined-outer-name
 # pylint: disable=protected-access
 # pylint: disable=line-too-long
+import asyncio
+import dataclasses
+import os
 import pathlib
 import re
+import shutil
+import threading
+from concurrent import futures
 
 import pydantic
 import pytest
 import pytest_cases
 import pytest_mock
 
+from zero_saver_core import backup_store
+from zero_saver_core import edit_journal
 from zero_saver_core import game_data_io
+from zero_saver_core import json_backend
+from zero_saver_core import lazy_decimal
+from zero_saver_core import lazy_save
+from zero_saver_core import output_sink
+from zero_saver_core import save_index
+from zero_saver_core import tracing
 from zero_saver_core.save_golden_files import typed_dict_0_31_production
+from resources import file_util
 
 _CASES = 'case_game_data_io.case_game_data_io'
 
@@ -145,7 +160,12 @@ class TestGameDataIOSave:
     mocked_open = mocker.patch('zero_saver_core.game_data_io._atomic_write')
     game_data_io_, expected_save_path = game_data_io_fixture
     game_data_io_.write_save_file()
-    mocked_open.assert_called_with(expected_save_path, 'w', encoding='utf-8')
+    mocked_open.assert_called_with(
+        expected_save_path,
+        'wb',
+        durability=game_data_io.Durability.FILE,
+        tracers=[],
+    )
 
   @pytest.mark.slow
   def test_game_data_io_write_save_file_well_formed_writes_to_file_stream(
@@ -179,5 +199,820 @@ class TestGameDataIOSave:
     game_data_io_.write_save_file()
     expected_data = pathlib.Path(expected_save_path).read_text(encoding='utf-8')
     file_like_fixture.go_to_start()
-    actual_data = file_like_fixture.read()
+    actual_data = file_like_fixture.read().decode('utf-8')
     assert strip_white_space(actual_data) == strip_white_space(expected_data)
+
+
+class TestGameDataIOLazy:
+
+  @pytest_cases.parametrize_with_cases(
+      'save_file',
+      cases=_CASES,
+      prefix='save_file_path_',
+      has_tag=['Well-Formed'],
+  )
+  def test_game_data_io_lazy_save_matches_eager_save(self, mocker, save_file):
+    mocker.patch('zero_saver_core.game_data_io.FileLocation')
+    eager = game_data_io.GameDataIO(save_file)
+    lazy = game_data_io.GameDataIO(save_file, lazy=True)
+    assert lazy.save['data']['pre_raid'] == eager.save['data']['pre_raid']
+    assert lazy_save.materialize(lazy.save) == eager.save
+
+  @pytest.mark.slow
+  @pytest_cases.parametrize_with_cases(
+      'save_file',
+      cases=_CASES,
+      prefix='save_file_path_',
+      has_tag=['Well-Formed'],
+  )
+  def test_game_data_io_lazy_verify_save_integrity_no_error_well_formed(
+      self, mocker, save_file
+  ):
+    mocker.patch('zero_saver_core.game_data_io.FileLocation')
+    game_data_io.GameDataIO(save_file, lazy=True).verify_save_integrity()
+
+
+class TestGameDataIOIndex:
+
+  def test_game_data_io_index_save_file_decodes_save_values(
+      self, game_data_io_fixture
+  ):
+    game_data_io_, save_file = game_data_io_fixture
+    raw = pathlib.Path(save_file).read_bytes()
+    index = game_data_io_.index_save_file()
+    assert (
+        index.decode(raw, 'data.pre_raid')
+        == game_data_io_.save['data']['pre_raid']
+    )
+
+
+class TestGameDataIOMmap:
+
+  @pytest.mark.parametrize('lazy', (False, True))
+  @pytest_cases.parametrize_with_cases(
+      'save_file',
+      cases=_CASES,
+      prefix='save_file_path_',
+      has_tag=['Well-Formed'],
+  )
+  def test_game_data_io_mmap_save_matches_eager_save(
+      self, mocker, save_file, lazy
+  ):
+    mocker.patch('zero_saver_core.game_data_io.FileLocation')
+    eager = game_data_io.GameDataIO(save_file)
+    mapped = game_data_io.GameDataIO(save_file, lazy=lazy, use_mmap=True)
+    assert lazy_save.materialize(mapped.save) == eager.save
+
+  def test_game_data_io_mmap_eager_closes_mapping(self, game_data_io_fixture):
+    game_data_io_, save_file = game_data_io_fixture
+    mapped = game_data_io.GameDataIO(save_file, use_mmap=True)
+    assert mapped._save_mapping is None
+    del game_data_io_  # Unused
+
+  def test_game_data_io_mmap_release_save_mapping_detaches_sections(
+      self, game_data_io_fixture
+  ):
+    game_data_io_, save_file = game_data_io_fixture
+    mapped = game_data_io.GameDataIO(save_file, lazy=True, use_mmap=True)
+    pre_raid = mapped.save['data']['pre_raid']
+    mapping = mapped._save_mapping
+    mapped._release_save_mapping()
+    assert mapping.closed
+    assert mapped._save_mapping is None
+    assert mapped.save['data']['pre_raid'] is pre_raid
+    assert mapped.save == game_data_io_.save
+
+
+class TestGameDataIOLazyNumbers:
+
+  @pytest.mark.slow
+  @pytest_cases.parametrize_with_cases(
+      'save_file',
+      cases=_CASES,
+      prefix='save_file_path_',
+      has_tag=['Well-Formed'],
+  )
+  def test_game_data_io_lazy_numbers_verify_save_integrity_no_error_well_formed(
+      self, mocker, save_file
+  ):
+    mocker.patch('zero_saver_core.game_data_io.FileLocation')
+    game_data_io.GameDataIO(
+        save_file, lazy_numbers=True
+    ).verify_save_integrity()
+
+  @pytest_cases.parametrize_with_cases(
+      'save_file',
+      cases=_CASES,
+      prefix='save_file_path_',
+      has_tag=['Well-Formed'],
+  )
+  def test_game_data_io_lazy_numbers_save_equals_eager_save(
+      self, mocker, save_file
+  ):
+    mocker.patch('zero_saver_core.game_data_io.FileLocation')
+    eager = game_data_io.GameDataIO(save_file)
+    lazy = game_data_io.GameDataIO(save_file, lazy=True, lazy_numbers=True)
+    hp = lazy.save['data']['pre_raid']['player']['hp']
+    assert isinstance(hp, lazy_decimal.LazyDecimal)
+    assert hp == eager.save['data']['pre_raid']['player']['hp']
+
+
+class TestGameDataIOJsonBackend:
+
+  @pytest_cases.parametrize_with_cases(
+      'save_file',
+      cases=_CASES,
+      prefix='save_file_path_',
+      has_tag=['Well-Formed'],
+  )
+  @pytest.mark.parametrize('lazy', (False, True))
+  def test_game_data_io_backend_is_used_for_reading(
+      self, mocker, save_file, lazy
+  ):
+    mocker.patch('zero_saver_core.game_data_io.FileLocation')
+    loads = mocker.Mock(wraps=json_backend.STDLIB_BACKEND.loads)
+    backend = json_backend.JsonBackend(
+        'mock', loads, json_backend.STDLIB_BACKEND.dumps
+    )
+    game_data_io_ = game_data_io.GameDataIO(
+        save_file, lazy=lazy, backend=backend
+    )
+    expected = game_data_io.GameDataIO(save_file).save
+    assert lazy_save.materialize(game_data_io_.save) == expected
+    loads.assert_called()
+
+
+class TestGameDataIOLoadMany:
+
+  @pytest.fixture
+  def save_directory(self, tmp_path):
+    for file_name in (
+        '0_31_save_new_hunter_equipment1',
+        '0_31_save_new_rookie_equipment1',
+    ):
+      shutil.copy(file_util.full_file_path(file_name), tmp_path)
+    tmp_path.joinpath('broken.json').write_text('{', encoding='utf-8')
+    return tmp_path
+
+  def test_game_data_io_init_does_not_build_file_location(self, mocker):
+    file_location = mocker.patch('zero_saver_core.game_data_io.FileLocation')
+    game_data_io.GameDataIO(
+        file_util.full_file_path('0_31_save_new_hunter_equipment1')
+    )
+    file_location.assert_not_called()
+
+  @pytest.mark.slow
+  def test_game_data_io_load_many_directory(self, save_directory):
+    results = {
+        result.save_path.name: result
+        for result in game_data_io.GameDataIO.load_many(
+            save_directory, max_workers=2
+        )
+    }
+    assert sorted(results) == [
+        '0_31_save_new_hunter_equipment1.json',
+        '0_31_save_new_rookie_equipment1.json',
+        'broken.json',
+    ]
+    hunter = results['0_31_save_new_hunter_equipment1.json']
+    assert hunter.error is None
+    assert hunter.save == game_data_io.GameDataIO(hunter.save_path).save
+    assert isinstance(results['broken.json'].error, ValueError)
+    assert results['broken.json'].save is None
+
+  @pytest.mark.slow
+  def test_game_data_io_load_many_verify_and_extract(self, save_directory):
+    save_paths = sorted(save_directory.iterdir())
+    save_paths.append(save_directory.joinpath('missing.json'))
+    results = {
+        result.save_path.name: result
+        for result in game_data_io.GameDataIO.load_many(
+            save_paths, max_workers=2, verify=True, extract=len
+        )
+    }
+    assert results['0_31_save_new_rookie_equipment1.json'].save == 4
+    assert isinstance(results['missing.json'].error, OSError)
+    assert isinstance(results['broken.json'].error, ValueError)
+
+  @pytest.mark.slow
+  def test_game_data_io_load_many_backup_directory(self, save_directory):
+    save_file = save_directory.joinpath('0_31_save_new_hunter_equipment1.json')
+    backup_directory = save_directory.joinpath('backup')
+    store = backup_store.BackupStore(
+        backup_directory,
+        maximum_backups=10,
+        compression=backup_store.Compression.ZLIB,
+        keyframe_interval=4,
+    )
+    save = game_data_io.GameDataIO(save_file).save
+    expected = []
+    for value in ('first', 'second', 'third'):
+      save['data']['difficulty']['edited'] = value
+      save_file.write_text(
+          json_backend.STDLIB_BACKEND.dumps(save), encoding='utf-8'
+      )
+      store.add_file(save_file, save_file.name)
+      expected.append(game_data_io.GameDataIO(save_file).save)
+    assert any(
+        listing.file_name.endswith(backup_store.DELTA_SUFFIX)
+        for listing in store.objects()
+    )
+    results = sorted(
+        game_data_io.GameDataIO.load_many(backup_directory, max_workers=1),
+        key=lambda result: result.backup.timestamp,
+    )
+    assert [result.error for result in results] == [None] * 3
+    assert [result.save for result in results] == expected
+    assert [result.backup for result in results] == store.refs()
+    assert results[-1].save_path == store.object_path(
+        results[-1].backup.sha256
+    )
+
+
+class TestGameDataIOAsync:
+
+  def test_game_data_io_open_async_matches_game_data_io(self, mocker):
+    mocker.patch('zero_saver_core.game_data_io.FileLocation')
+    save_file = file_util.full_file_path('0_31_save_new_hunter_equipment1')
+    game_data_io_ = asyncio.run(
+        game_data_io.GameDataIO.open_async(save_file, lazy=True)
+    )
+    expected = game_data_io.GameDataIO(save_file).save
+    assert lazy_save.materialize(game_data_io_.save) == expected
+
+  def test_game_data_io_write_save_file_async_runs_in_executor(
+      self, mocker, mocked_game_data_io
+  ):
+    event_loop_thread = threading.get_ident()
+    write_threads = []
+    mocker.patch.object(
+        game_data_io.GameDataIO,
+        'write_save_file',
+        side_effect=lambda durability: write_threads.append(
+            threading.get_ident()
+        ),
+    )
+
+    async def write_twice():
+      await asyncio.gather(
+          mocked_game_data_io.write_save_file_async(),
+          mocked_game_data_io.write_save_file_async(),
+      )
+
+    asyncio.run(write_twice())
+    assert len(write_threads) == 2
+    assert event_loop_thread not in write_threads
+
+  def test_game_data_io_verify_save_integrity_async_error_unsupported_version(
+      self, mocked_game_data_io
+  ):
+    mocked_game_data_io.save.save_version = 'Unsupported save version'
+    with pytest.raises(ModuleNotFoundError):
+      asyncio.run(mocked_game_data_io.verify_save_integrity_async())
+
+  def test_game_data_io_backup_save_file_async_runs_backup(
+      self, mocker, mocked_game_data_io
+  ):
+    backup = mocker.patch.object(
+        game_data_io.GameDataIO, '_backup_save_file', return_value=True
+    )
+    assert asyncio.run(mocked_game_data_io._backup_save_file_async())
+    backup.assert_called_once_with()
+
+
+class TestGameDataIOReload:
+
+  @pytest.mark.parametrize('use_mmap', (False, True))
+  def test_game_data_io_reload_unchanged_does_not_read(
+      self, mocker, save_file, use_mmap
+  ):
+    game_data_io_ = game_data_io.GameDataIO(
+        save_file, save_file.parent, use_mmap=use_mmap
+    )
+    read_save_file = mocker.spy(game_data_io.GameDataIO, '_read_save_file')
+    file_sha256 = mocker.spy(game_data_io, '_file_sha256')
+    assert not game_data_io_.reload()
+    read_save_file.assert_not_called()
+    file_sha256.assert_not_called()
+
+  def test_game_data_io_reload_touched_does_not_parse(self, mocker, save_file):
+    game_data_io_ = game_data_io.GameDataIO(save_file, save_file.parent)
+    stat = save_file.stat()
+    os.utime(save_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    read_save_file = mocker.spy(game_data_io.GameDataIO, '_read_save_file')
+    file_sha256 = mocker.spy(game_data_io, '_file_sha256')
+    assert not game_data_io_.reload()
+    assert not game_data_io_.reload()
+    read_save_file.assert_not_called()
+    file_sha256.assert_called_once()
+
+  @pytest.mark.parametrize('lazy', (False, True))
+  def test_game_data_io_reload_changed_replaces_save(self, save_file, lazy):
+    game_data_io_ = game_data_io.GameDataIO(
+        save_file, save_file.parent, lazy=lazy
+    )
+    save_file.write_text('{ "save_version": "changed" }', encoding='utf-8')
+    assert game_data_io_.reload()
+    assert game_data_io_.save == {'save_version': 'changed'}
+
+  @pytest.mark.slow
+  def test_game_data_io_reload_after_write_save_file_does_not_parse(
+      self, mocker, save_file
+  ):
+    game_data_io_ = game_data_io.GameDataIO(save_file, save_file.parent)
+    mocker.patch.object(
+        game_data_io.GameDataIO, '_backup_save_file', return_value=True
+    )
+    game_data_io_.write_save_file()
+    read_save_file = mocker.spy(game_data_io.GameDataIO, '_read_save_file')
+    assert not game_data_io_.reload()
+    read_save_file.assert_not_called()
+
+
+class TestGameDataIOTrackChanges:
+
+  def test_game_data_io_track_changes_lazy_raises_value_error(self, save_file):
+    with pytest.raises(ValueError):
+      game_data_io.GameDataIO(save_file, lazy=True, track_changes=True)
+
+  @pytest.mark.parametrize('lazy_numbers', (False, True))
+  def test_game_data_io_track_changes_verify_save_integrity_no_error(
+      self, save_file, lazy_numbers
+  ):
+    game_data_io.GameDataIO(
+        save_file, lazy_numbers=lazy_numbers, track_changes=True
+    ).verify_save_integrity()
+
+  @pytest.mark.slow
+  def test_game_data_io_track_changes_write_reuses_unchanged_sections(
+      self, mocker, save_file
+  ):
+    mocker.patch.object(
+        game_data_io.GameDataIO, '_backup_save_file', return_value=True
+    )
+    game_data_io_ = game_data_io.GameDataIO(save_file, track_changes=True)
+    game_data_io_.write_save_file()
+    dumps = mocker.Mock(wraps=json_backend.STDLIB_BACKEND.dumps)
+    game_data_io_._backend = json_backend.JsonBackend('spy', dumps=dumps)
+    sections = game_data_io_.save['data']
+    section = next(iter(sections))
+    sections[section]['edited'] = 1
+    game_data_io_.write_save_file()
+    encoded = [call.args[0] for call in dumps.call_args_list]
+    assert sections[section] in encoded
+    assert all(
+        value not in encoded
+        for key, value in sections.items()
+        if key != section
+    )
+    assert save_file.read_text(encoding='utf-8') == (
+        json_backend.STDLIB_BACKEND.dumps(game_data_io_.save)
+    )
+
+  def test_game_data_io_track_changes_reload_tracks_save(self, save_file):
+    game_data_io_ = game_data_io.GameDataIO(save_file, track_changes=True)
+    save_file.write_text(
+        '{ "save_version": "changed", "data": {} }', encoding='utf-8'
+    )
+    assert game_data_io_.reload()
+    game_data_io_.save['data']['new'] = 1
+    assert game_data_io_._section_cache.tracker.modified == {'new'}
+
+
+class TestGameDataIOSpliceWrites:
+
+  def test_game_data_io_splice_writes_track_changes_raises_value_error(
+      self, save_file
+  ):
+    with pytest.raises(ValueError):
+      game_data_io.GameDataIO(
+          save_file, splice_writes=True, track_changes=True
+      )
+
+  @pytest.mark.slow
+  @pytest.mark.parametrize(
+      'options',
+      ({}, {'lazy_numbers': True}, {'lazy': True, 'use_mmap': True}),
+  )
+  def test_game_data_io_splice_writes_replaces_modified_values(
+      self, mocker, save_file, options
+  ):
+    mocker.patch.object(
+        game_data_io.GameDataIO, '_backup_save_file', return_value=True
+    )
+    raw = save_file.read_bytes()
+    game_data_io_ = game_data_io.GameDataIO(
+        save_file, splice_writes=True, **options
+    )
+    game_data_io_.save['save_version'] = '0.31 production'
+    game_data_io_.write_save_file()
+    assert save_file.read_bytes() == raw
+    game_data_io_.save['data']['difficulty']['edited'] = 'value'
+    game_data_io_.write_save_file()
+    written = save_file.read_bytes()
+    start, end = save_index.locate(raw, ('data', 'difficulty'))
+    assert written[:start] == raw[:start]
+    assert written[-(len(raw) - end):] == raw[end:]
+    assert game_data_io.GameDataIO(save_file).save == (
+        lazy_save.materialize(game_data_io_.save)
+    )
+
+
+class TestGameDataIONumberPool:
+
+  @pytest.mark.parametrize('lazy_numbers', (False, True))
+  def test_game_data_io_loads_share_numbers(self, mocker, lazy_numbers):
+    mocker.patch('zero_saver_core.game_data_io.FileLocation')
+    save_file = file_util.full_file_path('0_31_save_new_hunter_equipment1')
+    first, second = (
+        game_data_io.GameDataIO(save_file, lazy_numbers=lazy_numbers).save
+        for _ in range(2)
+    )
+    difficulty = first['data']['difficulty']
+    key = next(iter(difficulty))
+    assert difficulty[key] is second['data']['difficulty'][key]
+
+
+class TestGameDataIOStreamedWrite:
+
+  @pytest.mark.parametrize(
+      'backend',
+      (
+          json_backend.STDLIB_BACKEND,
+          dataclasses.replace(
+              json_backend.FAST_ENCODER_BACKEND,
+              loads=json_backend.STDLIB_BACKEND.loads,
+          ),
+      ),
+  )
+  def test_game_data_io_streams_save_through_output_sink(
+      self, mocker, save_file, backend
+  ):
+    mocker.patch.object(
+        game_data_io.GameDataIO, '_backup_save_file', return_value=True
+    )
+    game_data_io_ = game_data_io.GameDataIO(save_file, backend=backend)
+    game_data_io_.save['data']['difficulty']['edited'] = 'streamed'
+    expected = game_data_io_._encode_save()
+    dump = mocker.spy(output_sink, 'dump')
+    encode = mocker.spy(game_data_io.GameDataIO, '_encode_save')
+    game_data_io_.write_save_file()
+    dump.assert_called_once()
+    encode.assert_not_called()
+    assert save_file.read_bytes() == expected
+    assert not game_data_io_.reload()
+
+
+class TestGameDataIOEncodeExecutor:
+
+  @pytest.mark.slow
+  @pytest.mark.parametrize('track_changes', (False, True))
+  def test_game_data_io_encode_executor_writes_same_bytes(
+      self, mocker, save_file, track_changes
+  ):
+    mocker.patch.object(
+        game_data_io.GameDataIO, '_backup_save_file', return_value=True
+    )
+    expected = game_data_io.GameDataIO(save_file)._encode_save()
+    with futures.ThreadPoolExecutor(2) as executor:
+      game_data_io_ = game_data_io.GameDataIO(
+          save_file, encode_executor=executor, track_changes=track_changes
+      )
+      game_data_io_.write_save_file()
+    assert save_file.read_bytes() == expected
+
+  def test_game_data_io_encode_executor_cannot_be_combined_with_splice_writes(
+      self, tmp_path
+  ):
+    with futures.ThreadPoolExecutor(1) as executor:
+      with pytest.raises(ValueError):
+        game_data_io.GameDataIO(
+            tmp_path.joinpath('save_shared_1.dat'),
+            splice_writes=True,
+            encode_executor=executor,
+        )
+
+
+class TestGameDataIOBackup:
+
+  @pytest.mark.slow
+  def test_game_data_io_backups_deduplicated(self, save_file, backup_directory):
+    raw = save_file.read_bytes()
+    game_data_io_ = game_data_io.GameDataIO(save_file, backup_directory)
+    game_data_io_.write_save_file()
+    written = save_file.read_bytes()
+    game_data_io_.write_save_file()
+    game_data_io_.write_save_file()
+    store = backup_store.BackupStore(
+        backup_directory,
+        maximum_backups=game_data_io.MAXIMUM_NUMBER_OF_BACKUPS,
+    )
+    assert [store.read(ref) for ref in store.refs()] == [raw, written]
+
+  @pytest.mark.parametrize('compression', list(backup_store.Compression))
+  def test_game_data_io_backup_compression(
+      self, save_file, backup_directory, compression
+  ):
+    game_data_io_ = game_data_io.GameDataIO(
+        save_file, backup_directory, backup_compression=compression
+    )
+    assert game_data_io_._backup_save_file()
+    store = backup_store.BackupStore(backup_directory, maximum_backups=1)
+    [ref] = store.refs()
+    assert store.read(ref) == save_file.read_bytes()
+
+  def test_game_data_io_invalid_backup_compression_level(self, tmp_path):
+    with pytest.raises(ValueError):
+      game_data_io.GameDataIO(
+          tmp_path.joinpath('save_shared_1.dat'),
+          tmp_path,
+          backup_compression=backup_store.Compression.BZ2,
+          backup_compression_level=0,
+      )
+
+  @pytest.mark.slow
+  def test_game_data_io_backup_deltas(self, save_file, backup_directory):
+    game_data_io_ = game_data_io.GameDataIO(
+        save_file, backup_directory, backup_keyframe_interval=4
+    )
+    written = []
+    for value in ('first', 'second', 'third'):
+      game_data_io_.save['data']['difficulty']['edited'] = value
+      game_data_io_.write_save_file()
+      written.append(save_file.read_bytes())
+    store = backup_store.BackupStore(backup_directory, maximum_backups=10)
+    refs = store.refs()
+    assert [store.read(ref) for ref in refs[1:]] == written[:-1]
+    assert store.object_path(refs[-1].sha256).name.endswith(
+        backup_store.DELTA_SUFFIX
+    )
+
+  @pytest.mark.parametrize('verify_backups', (False, True))
+  def test_game_data_io_verify_backups_reads_back(
+      self, mocker, save_file, backup_directory, verify_backups
+  ):
+    game_data_io_ = game_data_io.GameDataIO(
+        save_file, backup_directory, verify_backups=verify_backups
+    )
+    digest = mocker.spy(backup_store.BackupStore, '_digest')
+    assert game_data_io_._backup_save_file()
+    assert digest.call_count == verify_backups
+
+
+class TestGameDataIODurability:
+
+  @pytest.mark.parametrize(
+      'durability, system, expected_fsyncs',
+      (
+          (game_data_io.Durability.NONE, 'Linux', 0),
+          (game_data_io.Durability.FILE, 'Linux', 1),
+          (game_data_io.Durability.FILE_AND_DIRECTORY, 'Linux', 2),
+          (game_data_io.Durability.FILE_AND_DIRECTORY, 'Windows', 1),
+          ('file+directory', 'Linux', 2),
+      ),
+  )
+  def test_game_data_io_durability_fsyncs(
+      self, mocker, save_file, durability, system, expected_fsyncs
+  ):
+    mocker.patch.object(
+        game_data_io.GameDataIO, '_backup_save_file', return_value=True
+    )
+    game_data_io_ = game_data_io.GameDataIO(save_file)
+    expected = game_data_io_._encode_save()
+    mocker.patch('platform.system', return_value=system)
+    fsync = mocker.spy(os, 'fsync')
+    game_data_io_.write_save_file(durability=durability)
+    assert fsync.call_count == expected_fsyncs
+    assert save_file.read_bytes() == expected
+    assert not list(save_file.parent.glob('tmp*'))
+
+
+@pytest.mark.usefixtures('backup_directory')
+class TestGameDataIOWriteExecutor:
+
+  @pytest.fixture
+  def executor(self):
+    with futures.ThreadPoolExecutor(3) as executor:
+      yield executor
+
+  def open(self, save_file, executor, **options):
+    return game_data_io.GameDataIO(
+        save_file,
+        save_file.parent.joinpath('backup'),
+        write_executor=executor,
+        **options,
+    )
+
+  @pytest.mark.parametrize('lazy', (False, True))
+  def test_game_data_io_write_executor_writes_and_backs_up(
+      self, save_file, executor, lazy
+  ):
+    original = save_file.read_bytes()
+    game_data_io_ = self.open(save_file, executor, lazy=lazy)
+    game_data_io_.save['data']['difficulty']['edited'] = 'value'
+    expected = game_data_io_._encode_save()
+    game_data_io_.write_save_file()
+    assert save_file.read_bytes() == expected
+    store = backup_store.BackupStore(
+        save_file.parent.joinpath('backup'), maximum_backups=10
+    )
+    assert [store.read(ref) for ref in store.refs()] == [original]
+
+  def test_game_data_io_write_executor_runs_stages_concurrently(
+      self, mocker, save_file, executor
+  ):
+    # Each stage only completes once all three are running.
+    barrier = threading.Barrier(3, timeout=10)
+
+    def after_barrier(result):
+      def stage():
+        barrier.wait()
+        return result
+
+      return stage
+
+    game_data_io_ = self.open(save_file, executor)
+    expected = game_data_io_._encode_save()
+    for name, result in (
+        ('verify_save_integrity', None),
+        ('_backup_save_file', True),
+        ('_encode_save', expected),
+    ):
+      mocker.patch.object(
+          game_data_io_, name, side_effect=after_barrier(result)
+      )
+    game_data_io_.write_save_file()
+    assert save_file.read_bytes() == expected
+
+  # Verification errors take precedence over backup errors.
+  @pytest.mark.parametrize('backup_succeeds', (True, False))
+  def test_game_data_io_write_executor_invalid_save_not_written(
+      self, mocker, save_file, executor, backup_succeeds
+  ):
+    original = save_file.read_bytes()
+    game_data_io_ = self.open(save_file, executor)
+    mocker.patch.object(
+        game_data_io_, '_backup_save_file', return_value=backup_succeeds
+    )
+    del game_data_io_.save['data']['difficulty']
+    with pytest.raises(ValueError):
+      game_data_io_.write_save_file()
+    assert save_file.read_bytes() == original
+    assert not list(save_file.parent.glob('tmp*'))
+
+  def test_game_data_io_write_executor_failed_backup_not_written(
+      self, mocker, save_file, executor
+  ):
+    original = save_file.read_bytes()
+    game_data_io_ = self.open(save_file, executor)
+    mocker.patch.object(
+        game_data_io_, '_backup_save_file', side_effect=OSError
+    )
+    game_data_io_.save['data']['difficulty']['edited'] = 'value'
+    with pytest.raises(RuntimeError, match='backup'):
+      game_data_io_.write_save_file()
+    assert save_file.read_bytes() == original
+
+  def test_game_data_io_write_executor_cannot_be_encode_executor(
+      self, save_file, executor
+  ):
+    with pytest.raises(ValueError):
+      self.open(save_file, executor, encode_executor=executor)
+
+
+@pytest.mark.usefixtures('backup_directory')
+class TestGameDataIOJournal:
+
+  def open(self, save_file, **options):
+    return game_data_io.GameDataIO(
+        save_file, save_file.parent.joinpath('backup'), journal=True, **options
+    )
+
+  def journal(self, save_file):
+    return edit_journal.journal_path(
+        save_file.parent.joinpath('backup'), save_file
+    )
+
+  @pytest.mark.parametrize('lazy', (False, True))
+  def test_game_data_io_journal_replays_edits(self, save_file, lazy):
+    raw = save_file.read_bytes()
+    game_data_io_ = self.open(save_file)
+    game_data_io_.set_value(('data', 'difficulty', 'edited'), 'value')
+    game_data_io_.delete_value(('data', 'difficulty', 'edited'))
+    game_data_io_.set_value(('data', 'difficulty', 'edited'), 'new value')
+    assert save_file.read_bytes() == raw
+    reopened = self.open(save_file, lazy=lazy)
+    assert reopened.save['data']['difficulty']['edited'] == 'new value'
+    assert lazy_save.materialize(reopened.save) == game_data_io_.save
+
+  @pytest.mark.slow
+  def test_game_data_io_journal_compacted_by_write(self, save_file):
+    game_data_io_ = self.open(save_file)
+    game_data_io_.set_value(('data', 'difficulty', 'edited'), 'value')
+    game_data_io_.write_save_file()
+    journal = self.journal(save_file)
+    assert journal.read_bytes().count(b'\n') == 1
+    reopened = self.open(save_file)
+    assert reopened.save == game_data_io_.save
+
+  @pytest.mark.slow
+  def test_game_data_io_journal_compacts_when_full(self, mocker, save_file):
+    mocker.patch.object(
+        game_data_io.edit_journal.EditJournal, 'is_full', True
+    )
+    raw = save_file.read_bytes()
+    game_data_io_ = self.open(save_file)
+    game_data_io_.set_value(('data', 'difficulty', 'edited'), 'value')
+    assert save_file.read_bytes() != raw
+    written = game_data_io.GameDataIO(save_file, save_file.parent)
+    assert written.save['data']['difficulty']['edited'] == 'value'
+
+  def test_game_data_io_journal_of_replaced_save_is_stale(self, save_file):
+    game_data_io_ = self.open(save_file)
+    game_data_io_.set_value(('data', 'difficulty', 'edited'), 'value')
+    save_file.write_bytes(save_file.read_bytes() + b' ')
+    reopened = self.open(save_file)
+    assert 'edited' not in reopened.save['data']['difficulty']
+    journal = self.journal(save_file)
+    assert journal.with_name(f'{journal.name}.stale').exists()
+
+  def test_game_data_io_journal_per_save_path(self, save_file):
+    other_save_file = save_file.parent.joinpath('other', save_file.name)
+    other_save_file.parent.mkdir()
+    shutil.copy(save_file, other_save_file)
+    other_save_file.write_bytes(other_save_file.read_bytes() + b' ')
+    self.open(save_file).set_value(('data', 'difficulty', 'edited'), 'value')
+    game_data_io.GameDataIO(
+        other_save_file, save_file.parent.joinpath('backup'), journal=True
+    )
+    reopened = self.open(save_file)
+    assert reopened.save['data']['difficulty']['edited'] == 'value'
+    assert self.journal(save_file).parent == save_file.parent.joinpath(
+        'backup'
+    )
+    assert not list(save_file.parent.rglob('*.stale'))
+
+  def test_game_data_io_without_journal_set_value(self, mocker, save_file):
+    mocker.patch('zero_saver_core.game_data_io.FileLocation')
+    game_data_io_ = game_data_io.GameDataIO(save_file)
+    game_data_io_.set_value(('data', 'difficulty', 'edited'), 'value')
+    assert game_data_io_.save['data']['difficulty']['edited'] == 'value'
+    assert not list(save_file.parent.rglob('*.journal'))
+
+
+class TestGameDataIOTracers:
+
+  @pytest.mark.parametrize('use_mmap', (False, True))
+  def test_game_data_io_tracers_time_read(self, mocker, use_mmap):
+    mocker.patch('zero_saver_core.game_data_io.FileLocation')
+    save_file = file_util.full_file_path('0_31_save_new_hunter_equipment1')
+    spans = []
+    game_data_io.GameDataIO(
+        save_file, use_mmap=use_mmap, tracers=[spans.append]
+    )
+    size = os.path.getsize(save_file)
+    assert [(span.stage, span.size, span.error) for span in spans] == [
+        (tracing.Stage.READ, size, None),
+        (tracing.Stage.PARSE, size, None),
+    ]
+
+  @pytest.mark.slow
+  @pytest.mark.parametrize('track_changes', (False, True))
+  def test_game_data_io_tracers_time_write(
+      self, save_file, backup_directory, track_changes
+  ):
+    size = save_file.stat().st_size
+    game_data_io_ = game_data_io.GameDataIO(
+        save_file,
+        backup_directory,
+        backend=json_backend.STDLIB_BACKEND,
+        track_changes=track_changes,
+    )
+    spans = []
+    game_data_io_.tracers.append(spans.append)
+    game_data_io_.write_save_file()
+    encoded_size = save_file.stat().st_size
+    # Streamed saves are encoded while being written.
+    encode = [(tracing.Stage.ENCODE, encoded_size)] if track_changes else []
+    assert [(span.stage, span.size) for span in spans] == [
+        (tracing.Stage.VERIFY, None),
+        (tracing.Stage.BACKUP, size),
+        *encode,
+        (tracing.Stage.WRITE, encoded_size),
+        (tracing.Stage.FSYNC, None),
+        (tracing.Stage.REPLACE, None),
+    ]
+    assert all(span.duration >= 0 for span in spans)
+
+  def test_game_data_io_tracers_report_failed_stage(self, mocker):
+    mocker.patch('zero_saver_core.game_data_io.FileLocation')
+    save_file = file_util.full_file_path('0_31_save_new_hunter_equipment1')
+    game_data_io_ = game_data_io.GameDataIO(save_file)
+    spans = []
+    game_data_io_.tracers.append(spans.append)
+    del game_data_io_.save['save_version']
+    with pytest.raises(RuntimeError):
+      game_data_io_.write_save_file()
+    [span] = spans
+    assert span.stage == tracing.Stage.VERIFY
+    assert isinstance(span.error, KeyError)
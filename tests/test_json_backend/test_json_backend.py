@@ -0,0 +1,89 @@
+#  Copyright 2023 The Zero Saver Authors. All Rights Reserved.
+#
+#  This file is part of Zero Saver.
+#
+#  Zero Saver is free software: you can redistribute it and/or modify it under
+#  the terms of the GNU General Public License as published by the Free Software
+#  Foundation, either version 3 of the License, or (at your option) any later
+#  version.
+#
+#  Zero Saver is distributed in the hope that it will be useful, but WITHOUT ANY
+#  WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR
+#  A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+#  You should have received a copy of the GNU General Public License along with
+#  Zero Saver. If not, see <https://www.gnu.org/licenses/>.
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-class-docstring
+import json
+
+import pytest
+
+from zero_saver_core import json_backend
+
+# Ignores parse_float, losing the lexeme of every number.
+_FLOAT_BACKEND = json_backend.JsonBackend(
+    'float', loads=lambda document, parse_float: json.loads(document)
+)
+# Writes compact JSON instead of the "ZERO Sievert" format.
+_COMPACT_BACKEND = json_backend.JsonBackend(
+    'compact', dumps=lambda value: json.dumps(value, default=str)
+)
+
+
+class TestFidelityCheck:
+
+  def test_passes_fidelity_check_stdlib(self):
+    backend = json_backend.STDLIB_BACKEND
+    assert json_backend.passes_fidelity_check(backend.loads, backend.dumps)
+
+  def test_passes_fidelity_check_fast_encoder(self):
+    assert json_backend.passes_fidelity_check(
+        json_backend.STDLIB_BACKEND.loads,
+        json_backend.FAST_ENCODER_BACKEND.dumps,
+    )
+
+  def test_passes_fidelity_check_float_parser_fails(self):
+    assert not json_backend.passes_fidelity_check(
+        _FLOAT_BACKEND.loads, json_backend.STDLIB_BACKEND.dumps
+    )
+
+  def test_passes_fidelity_check_compact_serializer_fails(self):
+    assert not json_backend.passes_fidelity_check(
+        json_backend.STDLIB_BACKEND.loads, _COMPACT_BACKEND.dumps
+    )
+
+  def test_passes_fidelity_check_simplejson(self):
+    simplejson = pytest.importorskip('simplejson')
+    assert json_backend.passes_fidelity_check(
+        simplejson.loads, json_backend.STDLIB_BACKEND.dumps
+    )
+
+
+class TestSelectBackend:
+
+  def test_select_backend_rejects_lossy_candidates(self):
+    backend = json_backend.select_backend(
+        [_FLOAT_BACKEND, _COMPACT_BACKEND, json_backend.STDLIB_BACKEND]
+    )
+    assert backend is json_backend.STDLIB_BACKEND
+
+  def test_select_backend_combines_parser_and_serializer(self):
+    parser = json_backend.JsonBackend('parser', loads=json.loads)
+    serializer = json_backend.JsonBackend(
+        'serializer',
+        dumps=json_backend.STDLIB_BACKEND.dumps,
+        encoder=json_backend.STDLIB_BACKEND.encoder,
+    )
+    backend = json_backend.select_backend([parser, serializer])
+    assert backend.name == 'parser+serializer'
+    assert backend.loads is parser.loads
+    assert backend.dumps is serializer.dumps
+    assert backend.encoder is serializer.encoder
+
+  def test_select_backend_no_passing_candidate_raises_runtime_error(self):
+    with pytest.raises(RuntimeError):
+      json_backend.select_backend([_FLOAT_BACKEND, _COMPACT_BACKEND])
+
+  def test_default_backend_passes_fidelity_check(self):
+    backend = json_backend.default_backend()
+    assert json_backend.passes_fidelity_check(backend.loads, backend.dumps)
@@ -0,0 +1,114 @@
+#  Copyright 2023 The Zero Saver Authors. All Rights Reserved.
+#
+#  This file is part of Zero Saver.
+#
+#  Zero Saver is free software: you can redistribute it and/or modify it under
+#  the terms of the GNU General Public License as published by the Free Software
+#  Foundation, either version 3 of the License, or (at your option) any later
+#  version.
+#
+#  Zero Saver is distributed in the hope that it will be useful, but WITHOUT ANY
+#  WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR
+#  A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+#  You should have received a copy of the GNU General Public License along with
+#  Zero Saver. If not, see <https://www.gnu.org/licenses/>.
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-class-docstring
+# pylint: disable=protected-access
+import decimal
+import json
+import pickle
+
+import pytest
+import pytest_cases
+
+from zero_saver_core import lazy_decimal
+from zero_saver_core import monkey_patch_json
+from zero_saver_core import number_pool
+
+_CASES = 'case_game_data_io.case_game_data_io'
+
+
+class TestLazyDecimal:
+
+  def test_lazy_decimal_does_not_build_decimal_on_init(self):
+    assert lazy_decimal.LazyDecimal('1.0')._decimal is None
+
+  def test_lazy_decimal_str_is_lexeme(self):
+    assert str(lazy_decimal.LazyDecimal('9.5e-05')) == '9.5e-05'
+
+  @pytest.mark.parametrize(
+      'lexeme, other',
+      (('1.0', 1), ('2.50', decimal.Decimal('2.5')), ('-3.0', -3.0)),
+  )
+  def test_lazy_decimal_equality(self, lexeme, other):
+    value = lazy_decimal.LazyDecimal(lexeme)
+    assert value == other
+    assert hash(value) == hash(decimal.Decimal(lexeme))
+
+  def test_lazy_decimal_comparison(self):
+    assert lazy_decimal.LazyDecimal('1.0') < lazy_decimal.LazyDecimal('2.0')
+    assert lazy_decimal.LazyDecimal('1.0') >= 1
+
+  def test_lazy_decimal_arithmetic_returns_decimal(self):
+    value = lazy_decimal.LazyDecimal('2.50')
+    assert value + 1 == decimal.Decimal('3.50')
+    assert 1 - value == decimal.Decimal('-1.50')
+    assert isinstance(value * value, decimal.Decimal)
+    assert -value == decimal.Decimal('-2.50')
+
+  def test_lazy_decimal_conversions(self):
+    value = lazy_decimal.LazyDecimal('2.50')
+    assert float(value) == 2.5
+    assert int(value) == 2
+    assert round(value, 1) == decimal.Decimal('2.5')
+    assert not lazy_decimal.LazyDecimal('0.0')
+
+  def test_lazy_decimal_pickle(self):
+    value = pickle.loads(pickle.dumps(lazy_decimal.LazyDecimal('1.00')))
+    assert value.lexeme == '1.00'
+
+  def test_intern_pool_shares_lazy_decimals(self):
+    pool = number_pool.InternPool(lazy_decimal.LazyDecimal)
+    assert pool['1.0'] is pool['1.0']
+    assert pool['1.0'] is not pool['1.00']
+
+  def test_resolve_replaces_lazy_decimals(self):
+    value = {'a': [lazy_decimal.LazyDecimal('1.0'), {'b': 'c'}]}
+    resolved = lazy_decimal.resolve(value)
+    assert resolved == {'a': [decimal.Decimal('1.0'), {'b': 'c'}]}
+    assert isinstance(resolved['a'][0], decimal.Decimal)
+
+
+class TestLazyDecimalEncoding:
+
+  def test_lazy_decimal_encodes_lexeme(self):
+    values = [
+        lazy_decimal.LazyDecimal('1.000'),
+        lazy_decimal.LazyDecimal('9.5e-05'),
+        lazy_decimal.LazyDecimal('-0.0'),
+    ]
+    assert (
+        json.dumps(values, cls=monkey_patch_json.ZeroSievertJsonEncoder)
+        == '[ 1.000, 9.5e-05, -0.0 ]'
+    )
+
+  @pytest_cases.parametrize_with_cases(
+      'save_file',
+      cases=_CASES,
+      prefix='save_file_path_',
+      has_tag=['Well-Formed'],
+  )
+  def test_lazy_decimal_round_trip_matches_decimal(self, save_file):
+    with open(save_file, 'rb') as f:
+      raw = f.read()
+    expected = json.dumps(
+        json.loads(raw, parse_float=decimal.Decimal),
+        cls=monkey_patch_json.ZeroSievertJsonEncoder,
+    )
+    pool = number_pool.InternPool(lazy_decimal.LazyDecimal)
+    actual = json.dumps(
+        json.loads(raw, parse_float=pool.__getitem__),
+        cls=monkey_patch_json.ZeroSievertJsonEncoder,
+    )
+    assert actual == expected
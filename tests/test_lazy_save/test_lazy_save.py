@@ -0,0 +1,96 @@
+#  Copyright 2023 The Zero Saver Authors. All Rights Reserved.
+#
+#  This file is part of Zero Saver.
+#
+#  Zero Saver is free software: you can redistribute it and/or modify it under
+#  the terms of the GNU General Public License as published by the Free Software
+#  Foundation, either version 3 of the License, or (at your option) any later
+#  version.
+#
+#  Zero Saver is distributed in the hope that it will be useful, but WITHOUT ANY
+#  WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR
+#  A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+#  You should have received a copy of the GNU General Public License along with
+#  Zero Saver. If not, see <https://www.gnu.org/licenses/>.
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-class-docstring
+# pylint: disable=redefined-outer-name
+import decimal
+import json
+import pathlib
+
+import pytest
+import pytest_cases
+
+from zero_saver_core import lazy_save
+
+_CASES = 'case_game_data_io.case_game_data_io'
+
+
+@pytest_cases.fixture
+@pytest_cases.parametrize_with_cases(
+    'save_file', cases=_CASES, prefix='save_file_path_', has_tag=['Well-Formed']
+)
+def raw_save(save_file):
+  return pathlib.Path(save_file).read_bytes()
+
+
+class TestLoads:
+
+  def test_loads_matches_json_load(self, raw_save):
+    expected = json.loads(raw_save, parse_float=decimal.Decimal)
+    actual = lazy_save.materialize(lazy_save.loads(raw_save))
+    assert actual == expected
+    assert list(actual['data']) == list(expected['data'])
+
+  def test_loads_defers_sections(self, raw_save):
+    save = lazy_save.loads(raw_save)
+    assert isinstance(save['data'], lazy_save.LazySections)
+    assert not any(save['data'].is_decoded(key) for key in save['data'])
+
+  def test_loads_decodes_only_accessed_section(self, raw_save):
+    save = lazy_save.loads(raw_save)
+    expected = json.loads(raw_save, parse_float=decimal.Decimal)
+    assert save['data']['pre_raid'] == expected['data']['pre_raid']
+    assert save['data'].is_decoded('pre_raid')
+    assert not save['data'].is_decoded('general')
+
+  def test_loads_mutation_persists(self, raw_save):
+    save = lazy_save.loads(raw_save)
+    save['data']['pre_raid']['player']['hp'] = decimal.Decimal('1.0')
+    assert save['data']['pre_raid']['player']['hp'] == decimal.Decimal('1.0')
+    materialized = lazy_save.materialize(save)
+    assert materialized['data']['pre_raid']['player']['hp'] == 1
+
+  def test_loads_contains_does_not_decode(self, raw_save):
+    save = lazy_save.loads(raw_save)
+    assert 'general' in save['data']
+    assert 'missing' not in save['data']
+    assert not save['data'].is_decoded('general')
+
+  def test_loads_raw_only_while_undecoded(self, raw_save):
+    save = lazy_save.loads(raw_save)
+    expected = json.loads(raw_save, parse_float=decimal.Decimal)
+    raw_general = save['data'].raw('general')
+    assert (
+        json.loads(raw_general, parse_float=decimal.Decimal)
+        == expected['data']['general']
+    )
+    save['data']['general']  # pylint: disable=pointless-statement
+    assert save['data'].raw('general') is None
+
+  @pytest.mark.parametrize(
+      'raw', (b'{"a":1} garbage', b'{"a":1}}', b'{"data":{}} {}')
+  )
+  def test_loads_trailing_data_raises_json_decode_error(self, raw):
+    with pytest.raises(json.JSONDecodeError):
+      json.loads(raw)
+    with pytest.raises(json.JSONDecodeError):
+      lazy_save.loads(raw)
+
+  def test_loads_trailing_whitespace(self):
+    assert lazy_save.loads(b' {"a": 1} \r\n\t') == {'a': 1}
+
+  def test_materialize_eager_save_unchanged(self):
+    save = {'data': {'a': 1}}
+    assert lazy_save.materialize(save) is save
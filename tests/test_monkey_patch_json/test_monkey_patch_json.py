@@ -0,0 +1,170 @@
+#  Copyright 2023 The Zero Saver Authors. All Rights Reserved.
+#
+#  This file is part of Zero Saver.
+#
+#  Zero Saver is free software: you can redistribute it and/or modify it under
+#  the terms of the GNU General Public License as published by the Free Software
+#  Foundation, either version 3 of the License, or (at your option) any later
+#  version.
+#
+#  Zero Saver is distributed in the hope that it will be useful, but WITHOUT ANY
+#  WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR
+#  A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+#  You should have received a copy of the GNU General Public License along with
+#  Zero Saver. If not, see <https://www.gnu.org/licenses/>.
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-class-docstring
+import decimal
+import enum
+import json
+import pathlib
+
+import pytest
+import pytest_cases
+
+from zero_saver_core import lazy_decimal
+from zero_saver_core import monkey_patch_json
+from zero_saver_core import number_pool
+
+_CASES = 'case_game_data_io.case_game_data_io'
+_NUMBER_LEXEMES = (
+    '0', '0.0', '-0.0', '0.00', '0E-10', '1', '1.0', '1.000', '-2.5', '1E+5',
+    '9e-05', '9.5e-05', '8.5e-05', '-1.25e-10', '0.0001', '123456789.123',
+    '1e307', '1e308', '1e400', 'NaN', 'Infinity', '-Infinity',
+)
+
+
+class _Color(enum.IntEnum):
+  RED = 1
+
+
+class _Text(str):
+  pass
+
+
+def encode_both(value, **options):
+  expected = json.dumps(
+      value, cls=monkey_patch_json.ZeroSievertJsonEncoder, **options
+  )
+  actual = json.dumps(
+      value, cls=monkey_patch_json.ZeroSievertFastJsonEncoder, **options
+  )
+  return expected, actual
+
+
+class TestZeroSievertFastJsonEncoder:
+
+  @pytest_cases.parametrize_with_cases(
+      'save_file',
+      cases=_CASES,
+      prefix='save_file_path_',
+      has_tag=['Well-Formed'],
+  )
+  @pytest.mark.parametrize('lazy_numbers', (False, True))
+  def test_fast_encoder_matches_encoder_sample_saves(
+      self, save_file, lazy_numbers
+  ):
+    parse_float = (
+        number_pool.InternPool(lazy_decimal.LazyDecimal).__getitem__
+        if lazy_numbers
+        else decimal.Decimal
+    )
+    save = json.loads(
+        pathlib.Path(save_file).read_bytes(), parse_float=parse_float
+    )
+    expected, actual = encode_both(save)
+    assert actual == expected
+
+  @pytest.mark.parametrize('lexeme', _NUMBER_LEXEMES)
+  def test_fast_encoder_matches_encoder_numbers(self, lexeme):
+    value = {
+        'decimal': decimal.Decimal(lexeme),
+        'lazy': lazy_decimal.LazyDecimal(lexeme),
+        'list': [decimal.Decimal(lexeme), lazy_decimal.LazyDecimal(lexeme)],
+        'float': float(lexeme),
+    }
+    expected, actual = encode_both(value)
+    assert actual == expected
+
+  @pytest.mark.parametrize(
+      'options',
+      (
+          {},
+          {'sort_keys': True},
+          {'ensure_ascii': False},
+          {'separators': (',', ':')},
+          {'indent': 2},
+          {'skipkeys': True},
+          {'check_circular': False},
+      ),
+  )
+  def test_fast_encoder_matches_encoder_options(self, options):
+    value = {
+        'b': [1, True, False, None, (2, 3), [], {}, 'é\n"'],
+        'a': {1: 'int', 2.5: 'float', True: 'bool', None: 'null'},
+        'c': [_Color.RED, _Text('text'), decimal.Decimal],
+    }
+    if options.get('sort_keys'):
+      value['a'] = {'y': 'str', 'x': 'str'}
+    if options.get('skipkeys'):
+      value[(1, 2)] = 'skipped'
+    expected, actual = encode_both(value, **options)
+    assert actual == expected
+
+  def test_fast_encoder_circular_reference_raises_value_error(self):
+    value = []
+    value.append(value)
+    with pytest.raises(ValueError):
+      json.dumps(value, cls=monkey_patch_json.ZeroSievertFastJsonEncoder)
+
+  def test_fast_encoder_disallowed_nan_raises_value_error(self):
+    with pytest.raises(ValueError):
+      json.dumps(
+          [decimal.Decimal('NaN')],
+          cls=monkey_patch_json.ZeroSievertFastJsonEncoder,
+          allow_nan=False,
+      )
+
+  def test_fast_encoder_unsupported_key_raises_type_error(self):
+    with pytest.raises(TypeError):
+      json.dumps(
+          {(1, 2): 'tuple'}, cls=monkey_patch_json.ZeroSievertFastJsonEncoder
+      )
+
+  @pytest.mark.parametrize('lexeme', _NUMBER_LEXEMES)
+  def test_fast_encoder_memoized_numbers_match_encoder(self, lexeme):
+    value = [decimal.Decimal(lexeme)] * 3
+    first = encode_both(value)
+    assert encode_both(value) == first
+    assert first[0] == first[1]
+
+  @pytest.mark.parametrize('lexeme', ('1e400', 'Infinity', 'NaN'))
+  def test_fast_encoder_disallowed_nan_raises_value_error_after_memo(
+      self, lexeme
+  ):
+    value = [decimal.Decimal(lexeme)]
+    encode_both(value)
+    for cls in (
+        monkey_patch_json.ZeroSievertJsonEncoder,
+        monkey_patch_json.ZeroSievertFastJsonEncoder,
+    ):
+      with pytest.raises(ValueError):
+        json.dumps(value, cls=cls, allow_nan=False)
+
+  def test_fast_encoder_encode_into_writes_batches(self):
+    value = {'a': [[decimal.Decimal('1.5'), 'b']] * 10, 'c': {}}
+    writes = []
+    monkey_patch_json.ZeroSievertFastJsonEncoder().encode_into(
+        value, writes.append, batch_size=8
+    )
+    assert ''.join(writes) == json.dumps(
+        value, cls=monkey_patch_json.ZeroSievertJsonEncoder
+    )
+    assert 1 < len(writes) < 10
+
+  def test_decimal_texts_are_bounded(self, mocker):
+    mocker.patch.object(monkey_patch_json, '_DECIMAL_TEXTS_MAXIMUM_SIZE', 4)
+    mocker.patch.object(monkey_patch_json, '_decimal_texts', {})
+    value = [decimal.Decimal(f'{index}e-06') for index in range(1, 10)]
+    encode_both(value)
+    assert len(monkey_patch_json._decimal_texts) <= 4
@@ -0,0 +1,51 @@
+#  Copyright 2023 The Zero Saver Authors. All Rights Reserved.
+#
+#  This file is part of Zero Saver.
+#
+#  Zero Saver is free software: you can redistribute it and/or modify it under
+#  the terms of the GNU General Public License as published by the Free Software
+#  Foundation, either version 3 of the License, or (at your option) any later
+#  version.
+#
+#  Zero Saver is distributed in the hope that it will be useful, but WITHOUT ANY
+#  WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR
+#  A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+#  You should have received a copy of the GNU General Public License along with
+#  Zero Saver. If not, see <https://www.gnu.org/licenses/>.
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-class-docstring
+# pylint: disable=protected-access
+import decimal
+import json
+
+from zero_saver_core import lazy_decimal
+from zero_saver_core import number_pool
+
+
+class TestInternPool:
+
+  def test_intern_pool_shares_equal_lexemes(self):
+    pool = number_pool.InternPool(decimal.Decimal)
+    values = json.loads('[1.0, 1.0, 1.00]', parse_float=pool.__getitem__)
+    assert values[0] is values[1]
+    assert values[0] is not values[2]
+    assert str(values[2]) == '1.00'
+
+  def test_intern_pool_is_bounded(self):
+    pool = number_pool.InternPool(decimal.Decimal, maximum_size=4)
+    for index in range(100):
+      pool[f'{index}.5']  # pylint: disable=pointless-statement
+    assert len(pool) + len(pool._previous) <= 8
+
+  def test_intern_pool_promotes_previous_generation(self):
+    pool = number_pool.InternPool(decimal.Decimal, maximum_size=2)
+    kept = pool['0.0']
+    pool['1.0']  # pylint: disable=pointless-statement
+    pool['2.0']  # pylint: disable=pointless-statement
+    assert '0.0' not in pool
+    assert pool['0.0'] is kept
+
+  def test_lazy_decimal_pool_builds_lazy_decimals(self):
+    value = number_pool.LAZY_DECIMAL_POOL['2.5']
+    assert isinstance(value, lazy_decimal.LazyDecimal)
+    assert value.lexeme == '2.5'
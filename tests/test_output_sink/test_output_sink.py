@@ -0,0 +1,120 @@
+#  Copyright 2023 The Zero Saver Authors. All Rights Reserved.
+#
+#  This file is part of Zero Saver.
+#
+#  Zero Saver is free software: you can redistribute it and/or modify it under
+#  the terms of the GNU General Public License as published by the Free Software
+#  Foundation, either version 3 of the License, or (at your option) any later
+#  version.
+#
+#  Zero Saver is distributed in the hope that it will be useful, but WITHOUT ANY
+#  WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR
+#  A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+#  You should have received a copy of the GNU General Public License along with
+#  Zero Saver. If not, see <https://www.gnu.org/licenses/>.
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-class-docstring
+import decimal
+import hashlib
+import io
+import json
+import os
+import threading
+
+import pytest
+import pytest_cases
+
+from zero_saver_core import monkey_patch_json
+from zero_saver_core import output_sink
+
+_CASES = 'case_game_data_io.case_game_data_io'
+
+
+class ShortWriter(io.BytesIO):
+  """Writes at most 3 bytes per call, like a raw stream."""
+
+  def write(self, data):
+    return super().write(bytes(data[:3]))
+
+
+class TestOutputSink:
+
+  def test_output_sink_coalesces_chunks(self, mocker):
+    stream = mocker.Mock(write=mocker.Mock(side_effect=len))
+    with output_sink.BufferedSink(stream, buffer_size=4) as sink:
+      for chunk in ('a', 'b', 'c', 'd', 'e'):
+        sink.write(chunk)
+    assert [call.args[0].tobytes() for call in stream.write.call_args_list] == [
+        b'abcd',
+        b'e',
+    ]
+    assert sink.bytes_written == 5
+
+  def test_output_sink_encodes_utf_8(self):
+    stream = io.BytesIO()
+    with output_sink.BufferedSink(stream) as sink:
+      sink.write('é中')
+    assert stream.getvalue() == 'é中'.encode('utf-8')
+    assert sink.bytes_written == 5
+
+  def test_output_sink_completes_partial_writes(self):
+    stream = ShortWriter()
+    with output_sink.BufferedSink(stream) as sink:
+      sink.write('0123456789')
+    assert stream.getvalue() == b'0123456789'
+
+  def test_output_sink_hashes_written_bytes(self):
+    stream = io.BytesIO()
+    hash_function = hashlib.sha256()
+    with output_sink.BufferedSink(
+        stream, buffer_size=4, hash_function=hash_function
+    ) as sink:
+      for chunk in ('abc', 'é', '中', 'd'):
+        sink.write(chunk)
+    assert hash_function.digest() == hashlib.sha256(stream.getvalue()).digest()
+
+  def test_output_sink_exception_discards_pending_chunks(self):
+    stream = io.BytesIO()
+    with pytest.raises(RuntimeError):
+      with output_sink.BufferedSink(stream) as sink:
+        sink.write('pending')
+        raise RuntimeError
+    assert not stream.getvalue()
+
+  @pytest.mark.parametrize(
+      'cls',
+      (
+          monkey_patch_json.ZeroSievertJsonEncoder,
+          monkey_patch_json.ZeroSievertFastJsonEncoder,
+      ),
+  )
+  @pytest_cases.parametrize_with_cases(
+      'save_file',
+      cases=_CASES,
+      prefix='save_file_path_',
+      has_tag=['Well-Formed'],
+  )
+  def test_output_sink_dump_matches_dumps(self, save_file, cls):
+    with open(save_file, 'rb') as f:
+      save = json.loads(f.read(), parse_float=decimal.Decimal)
+    stream = io.BytesIO()
+    written = output_sink.dump(save, stream, cls=cls, buffer_size=1024)
+    expected = json.dumps(save, cls=cls).encode('utf-8')
+    assert stream.getvalue() == expected
+    assert written == len(expected)
+
+  def test_output_sink_dump_to_pipe(self):
+    save = {'numbers': [decimal.Decimal('1.5')] * 10000}
+    read_end, write_end = os.pipe()
+    received = []
+    with open(read_end, 'rb') as reader:
+      thread = threading.Thread(target=lambda: received.append(reader.read()))
+      thread.start()
+      with open(write_end, 'wb', buffering=0) as writer:
+        output_sink.dump(save, writer, buffer_size=1024)
+      thread.join()
+    assert received == [
+        json.dumps(save, cls=monkey_patch_json.ZeroSievertJsonEncoder).encode(
+            'utf-8'
+        )
+    ]
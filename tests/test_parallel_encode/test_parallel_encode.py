@@ -0,0 +1,82 @@
+#  Copyright 2023 The Zero Saver Authors. All Rights Reserved.
+#
+#  This file is part of Zero Saver.
+#
+#  Zero Saver is free software: you can redistribute it and/or modify it under
+#  the terms of the GNU General Public License as published by the Free Software
+#  Foundation, either version 3 of the License, or (at your option) any later
+#  version.
+#
+#  Zero Saver is distributed in the hope that it will be useful, but WITHOUT ANY
+#  WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR
+#  A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+#  You should have received a copy of the GNU General Public License along with
+#  Zero Saver. If not, see <https://www.gnu.org/licenses/>.
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-class-docstring
+import decimal
+import json
+from concurrent import futures
+
+import pytest
+import pytest_cases
+
+from zero_saver_core import json_backend
+from zero_saver_core import parallel_encode
+from zero_saver_core import tracked
+
+_CASES = 'case_game_data_io.case_game_data_io'
+# Module-level, so that it can be pickled to worker processes.
+dumps = json_backend.STDLIB_BACKEND.dumps
+
+
+@pytest.fixture(scope='module')
+def thread_pool():
+  with futures.ThreadPoolExecutor(2) as executor:
+    yield executor
+
+
+class TestParallelEncode:
+
+  @pytest_cases.parametrize_with_cases(
+      'save_file',
+      cases=_CASES,
+      prefix='save_file_path_',
+      has_tag=['Well-Formed'],
+  )
+  @pytest.mark.parametrize('depth', (1, 2, 5))
+  def test_parallel_encode_matches_dumps(self, thread_pool, save_file, depth):
+    with open(save_file, 'rb') as f:
+      save = json.loads(f.read(), parse_float=decimal.Decimal)
+    assert parallel_encode.encode(
+        save, dumps, thread_pool, depth=depth
+    ) == dumps(save)
+
+  @pytest.mark.slow
+  def test_parallel_encode_process_pool_matches_dumps(self):
+    save = {
+        'save_version': '0.31 production',
+        'data': {
+            'general': {'a': [decimal.Decimal('1.5')] * 100, 'b': {}},
+            'chest': {'items': [{'id': 'x', 'n': 1}] * 100},
+        },
+    }
+    with futures.ProcessPoolExecutor(2) as executor:
+      assert parallel_encode.encode(save, dumps, executor) == dumps(save)
+
+  @pytest.mark.parametrize(
+      'save', ([], {}, {'data': []}, {'data': {}}, {'a': 1, 'data': {'b': 2}})
+  )
+  def test_parallel_encode_unsplit_saves_match_dumps(self, thread_pool, save):
+    assert parallel_encode.encode(save, dumps, thread_pool) == dumps(save)
+
+  def test_parallel_encode_propagates_errors(self, thread_pool):
+    with pytest.raises(TypeError):
+      parallel_encode.encode({'data': {'a': object()}}, dumps, thread_pool)
+
+  def test_parallel_encode_section_cache_matches_dumps(self, thread_pool):
+    cache = tracked.SectionCache()
+    save = cache.track({'data': {'a': {'b': 1}, 'c': [2]}, 'd': 'e'})
+    assert cache.encode(save, dumps, thread_pool) == dumps(save)
+    save['data']['c'].append(decimal.Decimal('0.5'))
+    assert cache.encode(save, dumps, thread_pool) == dumps(save)
@@ -0,0 +1,256 @@
+#  Copyright 2023 The Zero Saver Authors. All Rights Reserved.
+#
+#  This file is part of Zero Saver.
+#
+#  Zero Saver is free software: you can redistribute it and/or modify it under
+#  the terms of the GNU General Public License as published by the Free Software
+#  Foundation, either version 3 of the License, or (at your option) any later
+#  version.
+#
+#  Zero Saver is distributed in the hope that it will be useful, but WITHOUT ANY
+#  WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR
+#  A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+#  You should have received a copy of the GNU General Public License along with
+#  Zero Saver. If not, see <https://www.gnu.org/licenses/>.
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-class-docstring
+# pylint: disable=redefined-outer-name
+import decimal
+import json
+import os
+import pathlib
+import shutil
+
+import pytest
+import pytest_cases
+
+from zero_saver_core import save_index
+
+_CASES = 'case_game_data_io.case_game_data_io'
+
+
+def key_paths(value, path=()):
+  yield path, value
+  if isinstance(value, dict):
+    for key, child in value.items():
+      yield from key_paths(child, (*path, key))
+  elif isinstance(value, list):
+    for key, child in enumerate(value):
+      yield from key_paths(child, (*path, key))
+
+
+@pytest_cases.fixture
+@pytest_cases.parametrize_with_cases(
+    'save_file', cases=_CASES, prefix='save_file_path_', has_tag=['Well-Formed']
+)
+def save_file_copy(save_file, tmp_path):
+  destination = tmp_path.joinpath('save_shared_1.dat')
+  shutil.copyfile(save_file, destination)
+  return destination
+
+
+class TestScan:
+
+  def test_member_spans_locates_values(self):
+    raw = b' { "a" : [1, {"b": "x}]\\""}] , "c":{ }, "d" : -1.5e-05 } '
+    spans = save_index.member_spans(raw)
+    values = {key: raw[start:end] for key, (start, end) in spans.items()}
+    assert values == {
+        'a': b'[1, {"b": "x}]\\""}]',
+        'c': b'{ }',
+        'd': b'-1.5e-05',
+    }
+
+  def test_member_spans_empty_object(self):
+    assert not save_index.member_spans(b'{ }')
+
+  def test_member_spans_deeply_nested_value(self):
+    nested = b'[' * 40 + b'1' + b']' * 40
+    raw = b'{"a":' + nested + b',"b":null}'
+    start, end = save_index.member_spans(raw)['a']
+    assert raw[start:end] == nested
+
+  @pytest.mark.parametrize('raw', (b'[1, 2]', b'{"a": 1', b'{"a" 1}'))
+  def test_member_spans_malformed_raises_value_error(self, raw):
+    with pytest.raises(ValueError):
+      save_index.member_spans(raw)
+
+  def test_index_bytes_arrays(self):
+    raw = b' [ 1 , [ ], [2 ,3] , {"a" : [ ] } ] '
+    spans = save_index.index_bytes(raw)
+    values = {path: raw[start:end] for path, (start, end) in spans.items()}
+    assert values == {
+        (): b'[ 1 , [ ], [2 ,3] , {"a" : [ ] } ]',
+        (0,): b'1',
+        (1,): b'[ ]',
+        (2,): b'[2 ,3]',
+        (2, 0): b'2',
+        (2, 1): b'3',
+        (3,): b'{"a" : [ ] }',
+        (3, 'a'): b'[ ]',
+    }
+
+  def test_index_bytes_max_depth(self):
+    spans = save_index.index_bytes(b'{"a": {"b": {"c": 1}}}', max_depth=1)
+    assert set(spans) == {(), ('a',)}
+
+  def test_locate_matches_index_bytes(self):
+    raw = b' [ 1 , [ ], [2 ,3] , {"a" : [ ] , "b" :{"c":"]"} } ] '
+    for key_path, span in save_index.index_bytes(raw).items():
+      assert save_index.locate(raw, key_path) == span
+
+  @pytest.mark.parametrize(
+      'key_path', (('b',), ('a', 2), ('a', 0, 'x'), ('c', 'd'))
+  )
+  def test_locate_missing_raises_key_error(self, key_path):
+    with pytest.raises(KeyError):
+      save_index.locate(b'{"a": [{}, 1], "c": {}}', key_path)
+
+
+  def test_locate_all_matches_index_bytes(self):
+    raw = b' [ 1 , [ ], [2 ,3] , {"a" : [ ] , "b" :{"c":"]"} } ] '
+    spans = save_index.index_bytes(raw)
+    assert save_index.locate_all(raw, spans) == spans
+
+  def test_locate_all_duplicate_member_resolves_to_last(self):
+    raw = b'{"a": {"b": 1}, "c": 2, "a": {"b": 3}}'
+    spans = save_index.locate_all(raw, [('a', 'b'), ('c',)])
+    assert {path: raw[start:end] for path, (start, end) in spans.items()} == {
+        ('a', 'b'): b'3',
+        ('c',): b'2',
+    }
+
+  @pytest.mark.parametrize(
+      'key_path', (('b',), ('a', 2), ('a', 0, 'x'), ('c', 'd'))
+  )
+  def test_locate_all_missing_raises_key_error(self, key_path):
+    with pytest.raises(KeyError):
+      save_index.locate_all(b'{"a": [{}, 1], "c": {}}', [('a', 1), key_path])
+
+
+class TestSaveIndex:
+
+  def test_save_index_decodes_every_value(self, save_file_copy):
+    raw = save_file_copy.read_bytes()
+    index = save_index.SaveIndex.from_bytes(raw)
+    save = json.loads(raw, parse_float=decimal.Decimal)
+    for path, value in key_paths(save):
+      assert index.decode(raw, path) == value
+    assert len(index) == len(list(key_paths(save)))
+
+  def test_save_index_resolve_dotted_path(self, save_file_copy):
+    index = save_index.SaveIndex.from_bytes(save_file_copy.read_bytes())
+    assert index.resolve('data.pre_raid.Inventory.items.0') == (
+        'data',
+        'pre_raid',
+        'Inventory',
+        'items',
+        0,
+    )
+
+  def test_save_index_resolve_missing_raises_key_error(self, save_file_copy):
+    index = save_index.SaveIndex.from_bytes(save_file_copy.read_bytes())
+    with pytest.raises(KeyError):
+      index.resolve('data.not_a_section')
+
+  @pytest.mark.parametrize(
+      'key_path',
+      (
+          ('data', 'pre_raid', 'Inventory', 'items', 0),
+          'data.pre_raid.Inventory.items.0',
+          ('data', 'pre_raid'),
+      ),
+  )
+  def test_save_index_decodes_values_deeper_than_max_depth(
+      self, save_file_copy, key_path
+  ):
+    raw = save_file_copy.read_bytes()
+    index = save_index.SaveIndex.from_bytes(raw, max_depth=2)
+    save = json.loads(raw, parse_float=decimal.Decimal)
+    expected = save['data']['pre_raid']
+    if len(key_path) > 2:
+      expected = expected['Inventory']['items'][0]
+    assert index.decode(raw, key_path) == expected
+
+  def test_save_index_decode_missing_deep_value_raises_key_error(
+      self, save_file_copy
+  ):
+    raw = save_file_copy.read_bytes()
+    index = save_index.SaveIndex.from_bytes(raw, max_depth=2)
+    with pytest.raises(KeyError):
+      index.decode(raw, 'data.pre_raid.not_a_member')
+
+  def test_save_index_json_round_trip(self, save_file_copy):
+    index = save_index.SaveIndex.from_bytes(save_file_copy.read_bytes())
+    restored = save_index.SaveIndex.from_json(
+        json.loads(json.dumps(index.to_json()))
+    )
+    assert dict(restored) == dict(index)
+    assert restored.sha256 == index.sha256
+
+
+class TestLoadIndex:
+
+  def test_read_value_matches_json_load(self, save_file_copy, tmp_path):
+    save = json.loads(save_file_copy.read_bytes(), parse_float=decimal.Decimal)
+    value = save_index.read_value(
+        save_file_copy, 'data.pre_raid.player', cache_directory=tmp_path
+    )
+    assert value == save['data']['pre_raid']['player']
+
+  def test_load_index_persisted_index_smaller_than_save(
+      self, save_file_copy, tmp_path
+  ):
+    cache_directory = tmp_path.joinpath('cache')
+    cache_directory.mkdir()
+    save_index.load_index(save_file_copy, cache_directory)
+    (cache_file,) = cache_directory.iterdir()
+    assert cache_file.stat().st_size < save_file_copy.stat().st_size / 2
+
+  def test_load_index_other_max_depth_rebuilds_index(
+      self, mocker, save_file_copy, tmp_path
+  ):
+    save_index.load_index(save_file_copy, tmp_path)
+    spy = mocker.spy(save_index, 'index_bytes')
+    index = save_index.load_index(save_file_copy, tmp_path, max_depth=None)
+    spy.assert_called_once()
+    assert index.max_depth is None
+    assert ('data', 'pre_raid', 'Inventory', 'items', 0) in index
+
+  def test_load_index_reuses_persisted_index(
+      self, mocker, save_file_copy, tmp_path
+  ):
+    save_index.load_index(save_file_copy, tmp_path)
+    spy = mocker.spy(save_index, 'index_bytes')
+    save_index.load_index(save_file_copy, tmp_path)
+    spy.assert_not_called()
+
+  def test_load_index_touched_file_reuses_index_by_hash(
+      self, mocker, save_file_copy, tmp_path
+  ):
+    index = save_index.load_index(save_file_copy, tmp_path)
+    os.utime(save_file_copy, ns=(0, index.mtime_ns + 10**9))
+    spy = mocker.spy(save_index, 'index_bytes')
+    reloaded = save_index.load_index(save_file_copy, tmp_path)
+    spy.assert_not_called()
+    assert reloaded.mtime_ns == index.mtime_ns + 10**9
+
+  def test_load_index_modified_file_rebuilds_index(
+      self, save_file_copy, tmp_path
+  ):
+    save_index.load_index(save_file_copy, tmp_path)
+    save_file_copy.write_bytes(b'{"data": {"pre_raid": 1}}')
+    assert (
+        save_index.read_value(
+            save_file_copy, 'data.pre_raid', cache_directory=tmp_path
+        )
+        == 1
+    )
+
+  def test_load_index_corrupt_cache_rebuilds_index(
+      self, save_file_copy, tmp_path
+  ):
+    save_index.load_index(save_file_copy, tmp_path)
+    for cache_file in pathlib.Path(tmp_path).glob('*.json'):
+      cache_file.write_text('{', encoding='utf-8')
+    assert save_index.load_index(save_file_copy, tmp_path)
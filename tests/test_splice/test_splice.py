@@ -0,0 +1,107 @@
+#  Copyright 2023 The Zero Saver Authors. All Rights Reserved.
+#
+#  This file is part of Zero Saver.
+#
+#  Zero Saver is free software: you can redistribute it and/or modify it under
+#  the terms of the GNU General Public License as published by the Free Software
+#  Foundation, either version 3 of the License, or (at your option) any later
+#  version.
+#
+#  Zero Saver is distributed in the hope that it will be useful, but WITHOUT ANY
+#  WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR
+#  A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+#  You should have received a copy of the GNU General Public License along with
+#  Zero Saver. If not, see <https://www.gnu.org/licenses/>.
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-class-docstring
+import copy
+import decimal
+import json
+
+import pytest
+import pytest_cases
+
+from zero_saver_core import monkey_patch_json
+from zero_saver_core import splice
+
+_CASES = 'case_game_data_io.case_game_data_io'
+_RAW = b'{"a":{"b":1.5,"c":[1,2,3]},"d":"x","e":[]}'
+
+
+def dumps(value):
+  return json.dumps(value, cls=monkey_patch_json.ZeroSievertJsonEncoder)
+
+
+def loads(raw):
+  return json.loads(raw, parse_float=decimal.Decimal)
+
+
+class TestSplice:
+
+  @pytest.mark.parametrize(
+      'edit, expected',
+      (
+          (lambda save: None, []),
+          (
+              lambda save: save['a'].update(b=decimal.Decimal('2.5')),
+              [('a', 'b')],
+          ),
+          (lambda save: save['a']['c'].__setitem__(1, 5), [('a', 'c', 1)]),
+          (lambda save: save['a']['c'].append(4), [('a', 'c')]),
+          (lambda save: save['a'].update(z=1), [('a',)]),
+          (lambda save: save.update(d='y', e=[1]), [('d',), ('e',)]),
+          (lambda save: save.update(a=save.pop('a')), [()]),
+          (lambda save: save['a'].update(b=decimal.Decimal('1.50')), []),
+      ),
+  )
+  def test_splice_changed_paths(self, edit, expected):
+    save = loads(_RAW)
+    edit(save)
+    assert splice.changed_paths(loads(_RAW), save) == expected
+
+  def test_splice_keeps_unmodified_bytes(self):
+    save = loads(_RAW)
+    save['a']['c'][2] = decimal.Decimal('0.5')
+    save['e'].append({'f': None})
+    assert splice.splice(_RAW, loads(_RAW), save, dumps) == (
+        b'{"a":{"b":1.5,"c":[1,2,0.5]},"d":"x","e":[ { "f": null } ]}'
+    )
+
+  def test_splice_writes_values_of_other_types(self):
+    raw = b'{"v":1.0,"w":0,"x":[1]}'
+    save = loads(raw)
+    save.update(v=True, w=False, x=[decimal.Decimal('1.0')])
+    assert splice.changed_paths(loads(raw), save) == [('v',), ('w',), ('x', 0)]
+    spliced = splice.splice(raw, loads(raw), save, dumps)
+    assert spliced == b'{"v":true,"w":false,"x":[1.0]}'
+
+  def test_splice_duplicate_member_writes_last_member(self):
+    raw = b'{"a":1,"b":{"c":2},"a":{"c":3}}'
+    save = loads(raw)
+    save['a']['c'] = 4
+    save['b']['c'] = 5
+    spliced = splice.splice(raw, loads(raw), save, dumps)
+    assert spliced == b'{"a":1,"b":{"c":5},"a":{"c":4}}'
+    assert loads(spliced) == save
+
+  def test_splice_top_level_change_encodes_whole_save(self):
+    save = {'d': 'x'}
+    assert splice.splice(_RAW, loads(_RAW), save, dumps) == (
+        dumps(save).encode('utf-8')
+    )
+
+  @pytest_cases.parametrize_with_cases(
+      'save_file',
+      cases=_CASES,
+      prefix='save_file_path_',
+      has_tag=['Well-Formed'],
+  )
+  def test_splice_decodes_to_modified_save(self, save_file):
+    with open(save_file, 'rb') as f:
+      raw = f.read()
+    original = loads(raw)
+    save = copy.deepcopy(original)
+    sections = save['data']
+    sections[next(iter(sections))] = {'replaced': [decimal.Decimal('0.5')]}
+    sections[next(reversed(sections))]['added'] = 'é'
+    assert loads(splice.splice(raw, original, save, dumps)) == save
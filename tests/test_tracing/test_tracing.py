@@ -0,0 +1,49 @@
+#  Copyright 2023 The Zero Saver Authors. All Rights Reserved.
+#
+#  This file is part of Zero Saver.
+#
+#  Zero Saver is free software: you can redistribute it and/or modify it under
+#  the terms of the GNU General Public License as published by the Free Software
+#  Foundation, either version 3 of the License, or (at your option) any later
+#  version.
+#
+#  Zero Saver is distributed in the hope that it will be useful, but WITHOUT ANY
+#  WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR
+#  A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+#  You should have received a copy of the GNU General Public License along with
+#  Zero Saver. If not, see <https://www.gnu.org/licenses/>.
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-class-docstring
+import pytest
+
+from zero_saver_core import tracing
+
+
+class TestTracing:
+
+  def test_tracing_reports_span_to_each_tracer(self):
+    first, second = [], []
+    with tracing.trace(
+        [first.append, second.append], tracing.Stage.ENCODE
+    ) as measurement:
+      measurement.size = 3
+    [span] = first
+    assert second == [span]
+    assert span.stage == tracing.Stage.ENCODE
+    assert span.size == 3
+    assert span.duration >= 0
+    assert span.error is None
+
+  def test_tracing_reports_and_reraises_error(self):
+    spans = []
+    error = OSError('disk full')
+    with pytest.raises(OSError, match='disk full'):
+      with tracing.trace([spans.append], tracing.Stage.WRITE):
+        raise error
+    [span] = spans
+    assert span.error is error
+    assert span.size is None
+
+  def test_tracing_without_tracers_yields_measurement(self):
+    with tracing.trace([], tracing.Stage.READ) as measurement:
+      measurement.size = 1
@@ -0,0 +1,153 @@
+#  Copyright 2023 The Zero Saver Authors. All Rights Reserved.
+#
+#  This file is part of Zero Saver.
+#
+#  Zero Saver is free software: you can redistribute it and/or modify it under
+#  the terms of the GNU General Public License as published by the Free Software
+#  Foundation, either version 3 of the License, or (at your option) any later
+#  version.
+#
+#  Zero Saver is distributed in the hope that it will be useful, but WITHOUT ANY
+#  WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR
+#  A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+#  You should have received a copy of the GNU General Public License along with
+#  Zero Saver. If not, see <https://www.gnu.org/licenses/>.
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-class-docstring
+# pylint: disable=protected-access
+import copy
+import decimal
+import json
+import pickle
+
+import pytest
+import pytest_cases
+
+from zero_saver_core import monkey_patch_json
+from zero_saver_core import tracked
+
+_CASES = 'case_game_data_io.case_game_data_io'
+
+
+def dumps(value):
+  return json.dumps(value, cls=monkey_patch_json.ZeroSievertJsonEncoder)
+
+
+@pytest.fixture
+def save():
+  return {
+      'save_version': '0.31 production',
+      'data': {
+          'general': {'money': 10, 'items': [{'id': 'a'}]},
+          'pre_raid': {'player': {'hp': decimal.Decimal('75.0')}},
+          'empty': {},
+      },
+  }
+
+
+@pytest.fixture
+def cache():
+  return tracked.SectionCache()
+
+
+class TestTracked:
+
+  def test_tracked_track_save_equals_save(self, cache, save):
+    tracked_save = cache.track(save)
+    assert tracked_save == save
+    assert isinstance(tracked_save['data'], tracked.TrackedSections)
+    assert isinstance(
+        tracked_save['data']['general']['items'], tracked.TrackedList
+    )
+
+  @pytest.mark.parametrize(
+      'edit, section',
+      (
+          (lambda save: save['data']['general'].update(money=11), 'general'),
+          (lambda save: save['data']['general']['items'].pop(), 'general'),
+          (
+              lambda save: save['data']['general']['items'][0].clear(),
+              'general',
+          ),
+          (lambda save: save['data']['pre_raid'].pop('player'), 'pre_raid'),
+          (lambda save: save['data'].pop('empty'), 'empty'),
+          (lambda save: save['data'].setdefault('new', 1), 'new'),
+          (lambda save: save.update(save_version='0.32'), None),
+      ),
+  )
+  def test_tracked_edit_marks_section_modified(
+      self, cache, save, edit, section
+  ):
+    edit(cache.track(save))
+    assert cache.tracker.modified == {section}
+    assert not cache.tracker.tainted
+
+  def test_tracked_untracked_container_taints_section(self, cache, save):
+    tracked_save = cache.track(save)
+    items = tracked_save['data']['general']['items']
+    tracked_save['data']['pre_raid']['inventory'] = items
+    untracked = {'hp': 1}
+    tracked_save['data']['general']['items'].append(untracked)
+    assert cache.tracker.tainted == {'pre_raid', 'general'}
+
+  def test_tracked_tracked_container_does_not_taint_own_section(
+      self, cache, save
+  ):
+    tracked_save = cache.track(save)
+    general = tracked_save['data']['general']
+    general['items'].append(general['items'].pop())
+    assert not cache.tracker.tainted
+
+  def test_tracked_encode_unchanged_reuses_sections(self, mocker, cache, save):
+    tracked_save = cache.track(save)
+    cache.encode(tracked_save, dumps)
+    spy = mocker.Mock(wraps=dumps)
+    tracked_save['data']['pre_raid']['player']['hp'] = decimal.Decimal('1.5')
+    assert cache.encode(tracked_save, spy) == dumps(tracked_save)
+    encoded = [call.args[0] for call in spy.call_args_list]
+    assert tracked_save['data']['pre_raid'] in encoded
+    assert tracked_save['data']['general'] not in encoded
+
+  def test_tracked_encode_tainted_section_reencodes_every_time(
+      self, cache, save
+  ):
+    tracked_save = cache.track(save)
+    player = {'hp': decimal.Decimal('1.0')}
+    tracked_save['data']['pre_raid']['player'] = player
+    cache.encode(tracked_save, dumps)
+    player['hp'] = decimal.Decimal('2.0')
+    assert cache.encode(tracked_save, dumps) == dumps(tracked_save)
+
+  def test_tracked_encode_untracked_save_matches_dumps(self, cache, save):
+    cache.track(save)
+    assert cache.encode(save, dumps) == dumps(save)
+
+  def test_tracked_copies_are_untracked(self, cache, save):
+    tracked_save = cache.track(save)
+    copies = (
+        copy.deepcopy(tracked_save),
+        pickle.loads(pickle.dumps(tracked_save)),
+    )
+    for copied in copies:
+      assert type(copied) is dict
+      assert copied == save
+
+  @pytest_cases.parametrize_with_cases(
+      'save_file',
+      cases=_CASES,
+      prefix='save_file_path_',
+      has_tag=['Well-Formed'],
+  )
+  def test_tracked_encode_after_edits_matches_dumps(self, cache, save_file):
+    with open(save_file, 'rb') as f:
+      tracked_save = cache.track(
+          json.loads(f.read(), parse_float=decimal.Decimal)
+      )
+    assert cache.encode(tracked_save, dumps) == dumps(tracked_save)
+    sections = tracked_save['data']
+    first = next(iter(sections))
+    sections[first] = {'replaced': [decimal.Decimal('0.5')]}
+    assert cache.encode(tracked_save, dumps) == dumps(tracked_save)
+    sections[first]['replaced'].append(1)
+    del sections[next(reversed(sections))]
+    assert cache.encode(tracked_save, dumps) == dumps(tracked_save)
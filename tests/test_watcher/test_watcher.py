@@ -0,0 +1,174 @@
+#  Copyright 2023 The Zero Saver Authors. All Rights Reserved.
+#
+#  This file is part of Zero Saver.
+#
+#  Zero Saver is free software: you can redistribute it and/or modify it under
+#  the terms of the GNU General Public License as published by the Free Software
+#  Foundation, either version 3 of the License, or (at your option) any later
+#  version.
+#
+#  Zero Saver is distributed in the hope that it will be useful, but WITHOUT ANY
+#  WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR
+#  A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+#  You should have received a copy of the GNU General Public License along with
+#  Zero Saver. If not, see <https://www.gnu.org/licenses/>.
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-class-docstring
+# pylint: disable=redefined-outer-name
+import decimal
+import json
+import os
+import pathlib
+import shutil
+import sys
+import threading
+
+import pytest
+
+from zero_saver_core import lazy_save
+from zero_saver_core import watcher
+from resources import file_util
+
+_SAVE_FILE = '0_31_save_new_hunter_equipment1'
+
+
+@pytest.fixture
+def save_file(tmp_path):
+  save_file = tmp_path.joinpath('save_shared_1.dat')
+  shutil.copy(file_util.full_file_path(_SAVE_FILE), save_file)
+  return save_file
+
+
+def rewrite_hp_max(save_file, hp_max, source=None):
+  """Replaces *save_file* the way the game does, changing a single value of
+  *source*, which defaults to *save_file*."""
+  source = source if source else save_file
+  raw = source.read_bytes().replace(
+      b'"hp_max":75.0', f'"hp_max":{hp_max}'.encode()
+  )
+  temporary_file = save_file.with_suffix('.tmp')
+  temporary_file.write_bytes(raw)
+  os.replace(temporary_file, save_file)
+
+
+class TestDiffSaves:
+
+  def test_diff_saves_equal(self):
+    save = {'a': [1, {'b': 'c'}]}
+    assert not watcher.diff_saves(save, json.loads(json.dumps(save)))
+
+  def test_diff_saves_nested_value(self):
+    old = {'a': {'b': [1, 2], 'c': 'd'}}
+    new = {'a': {'b': [1, 3], 'c': 'd'}}
+    assert watcher.diff_saves(old, new) == [watcher.Change(('a', 'b', 1), 2, 3)]
+
+  def test_diff_saves_added_and_removed(self):
+    old = {'a': 1, 'b': [1, 2]}
+    new = {'c': 2, 'b': [1]}
+    assert watcher.diff_saves(old, new) == [
+        watcher.Change(('a',), 1, watcher.MISSING),
+        watcher.Change(('c',), watcher.MISSING, 2),
+        watcher.Change(('b', 1), 2, watcher.MISSING),
+    ]
+
+  def test_diff_saves_type_change(self):
+    assert watcher.diff_saves({'a': [1]}, {'a': {'0': 1}}) == [
+        watcher.Change(('a',), [1], {'0': 1})
+    ]
+
+  def test_diff_saves_lazy_skips_identical_sections(self, save_file):
+    old = lazy_save.loads(save_file.read_bytes())
+    rewrite_hp_max(save_file, '80.0')
+    new = lazy_save.loads(save_file.read_bytes())
+    assert watcher.diff_saves(old, new) == [
+        watcher.Change(
+            ('data', 'pre_raid', 'player', 'hp_max'),
+            decimal.Decimal('75.0'),
+            decimal.Decimal('80.0'),
+        )
+    ]
+    assert not new['data'].is_decoded('general')
+    assert new['data'].is_decoded('pre_raid')
+
+
+class TestSaveWatcher:
+
+  @pytest.mark.parametrize(
+      'use_inotify',
+      (
+          False,
+          pytest.param(
+              True,
+              marks=pytest.mark.skipif(
+                  sys.platform != 'linux', reason='Requires inotify'
+              ),
+          ),
+      ),
+  )
+  def test_save_watcher_yields_changes(self, save_file, use_inotify):
+    with watcher.SaveWatcher(
+        save_file, poll_interval=0.01, use_inotify=use_inotify
+    ) as save_watcher:
+      if use_inotify:
+        assert isinstance(
+            save_watcher._events,  # pylint: disable=protected-access
+            watcher._InotifyEvents,  # pylint: disable=protected-access
+        )
+      changes = save_watcher.changes()
+      rewrite_hp_max(save_file, '80.0')
+      assert next(changes) == [
+          watcher.Change(
+              ('data', 'pre_raid', 'player', 'hp_max'),
+              decimal.Decimal('75.0'),
+              decimal.Decimal('80.0'),
+          )
+      ]
+      assert save_watcher.save['data']['pre_raid']['player']['hp_max'] == 80
+
+  def test_save_watcher_skips_unreadable_rewrite(self, save_file):
+    with watcher.SaveWatcher(
+        save_file, poll_interval=0.01, use_inotify=False
+    ) as save_watcher:
+      changes = save_watcher.changes()
+      save_file.write_text('{', encoding='utf-8')
+      rewrite = threading.Timer(
+          0.1,
+          rewrite_hp_max,
+          (save_file, '80.0'),
+          {'source': pathlib.Path(file_util.full_file_path(_SAVE_FILE))},
+      )
+      rewrite.start()
+      assert [change.key_path for change in next(changes)] == [
+          ('data', 'pre_raid', 'player', 'hp_max')
+      ]
+      rewrite.join()
+
+  def test_save_watcher_skips_rewrite_with_malformed_section(self, save_file):
+    with watcher.SaveWatcher(
+        save_file, poll_interval=0.01, use_inotify=False
+    ) as save_watcher:
+      changes = save_watcher.changes()
+      rewrite_hp_max(save_file, '1.2.3')
+      rewrite = threading.Timer(
+          0.1,
+          rewrite_hp_max,
+          (save_file, '80.0'),
+          {'source': pathlib.Path(file_util.full_file_path(_SAVE_FILE))},
+      )
+      rewrite.start()
+      assert next(changes) == [
+          watcher.Change(
+              ('data', 'pre_raid', 'player', 'hp_max'),
+              decimal.Decimal('75.0'),
+              decimal.Decimal('80.0'),
+          )
+      ]
+      rewrite.join()
+      assert save_watcher.save['data']['pre_raid']['player']['hp_max'] == 80
+
+  def test_save_watcher_stop_ends_changes(self, save_file):
+    with watcher.SaveWatcher(
+        save_file, poll_interval=0.01, use_inotify=False
+    ) as save_watcher:
+      threading.Timer(0.05, save_watcher.stop).start()
+      assert not list(save_watcher.changes())
@@ -0,0 +1,136 @@
+#  Copyright 2023 The Zero Saver Authors. All Rights Reserved.
+#
+#  This file is part of Zero Saver.
+#
+#  Zero Saver is free software: you can redistribute it and/or modify it under
+#  the terms of the GNU General Public License as published by the Free Software
+#  Foundation, either version 3 of the License, or (at your option) any later
+#  version.
+#
+#  Zero Saver is distributed in the hope that it will be useful, but WITHOUT ANY
+#  WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR
+#  A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+#  You should have received a copy of the GNU General Public License along with
+#  Zero Saver. If not, see <https://www.gnu.org/licenses/>.
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-class-docstring
+import shutil
+import threading
+
+import pytest
+
+from zero_saver_core import game_data_io
+from zero_saver_core import write_scheduler
+from resources import file_util
+
+
+@pytest.fixture
+def data(mocker):
+  return mocker.Mock(spec=game_data_io.GameDataIO)
+
+
+class TestWriteScheduler:
+
+  def test_write_scheduler_coalesces_requests(self, data):
+    with write_scheduler.WriteScheduler(
+        data, delay=60, maximum_delay=60
+    ) as scheduler:
+      requests = [scheduler.request_write() for _ in range(5)]
+      scheduler.flush()
+    assert all(request.done() for request in requests)
+    data.write_save_file.assert_called_once_with(
+        durability=game_data_io.Durability.FILE
+    )
+
+  def test_write_scheduler_writes_after_delay(self, data):
+    with write_scheduler.WriteScheduler(data, delay=0.01) as scheduler:
+      assert scheduler.request_write().result(timeout=10) is None
+    data.write_save_file.assert_called_once()
+
+  def test_write_scheduler_writes_after_maximum_delay(self, data):
+    with write_scheduler.WriteScheduler(
+        data, delay=0.05, maximum_delay=0.1
+    ) as scheduler:
+      first = scheduler.request_write()
+      while not first.done():
+        # Requests keep postponing the write, up to maximum_delay.
+        scheduler.request_write()
+        threading.Event().wait(0.01)
+      assert first.result() is None
+
+  def test_write_scheduler_reports_write_errors(self, data):
+    data.write_save_file.side_effect = ValueError(
+        'Save not formatted properly.'
+    )
+    with write_scheduler.WriteScheduler(
+        data, delay=60, maximum_delay=60
+    ) as scheduler:
+      request = scheduler.request_write()
+      with pytest.raises(ValueError, match='Save not formatted properly.'):
+        scheduler.flush()
+    assert isinstance(request.exception(), ValueError)
+
+  def test_write_scheduler_separates_requests_after_write(self, data):
+    with write_scheduler.WriteScheduler(
+        data, delay=60, maximum_delay=60
+    ) as scheduler:
+      scheduler.request_write()
+      scheduler.flush()
+      scheduler.request_write()
+      scheduler.flush()
+    assert data.write_save_file.call_count == 2
+
+  def test_write_scheduler_skips_cancelled_requests(self, data):
+    with write_scheduler.WriteScheduler(
+        data, delay=60, maximum_delay=60
+    ) as scheduler:
+      assert scheduler.request_write().cancel()
+      scheduler.flush()
+    data.write_save_file.assert_not_called()
+
+  def test_write_scheduler_close_writes_pending_requests(self, data):
+    scheduler = write_scheduler.WriteScheduler(
+        data, delay=60, maximum_delay=60
+    )
+    request = scheduler.request_write()
+    scheduler.close()
+    assert request.result(timeout=0) is None
+    with pytest.raises(RuntimeError):
+      scheduler.request_write()
+
+  def test_write_scheduler_holds_lock_while_writing(self, data):
+    with write_scheduler.WriteScheduler(
+        data, delay=60, maximum_delay=60
+    ) as scheduler:
+      owned = []
+      data.write_save_file.side_effect = lambda durability: owned.append(
+          # pylint: disable-next=protected-access
+          scheduler.lock._is_owned()
+      )
+      scheduler.request_write()
+      scheduler.flush()
+    assert owned == [True]
+
+  def test_write_scheduler_rejects_invalid_delays(self, data):
+    with pytest.raises(ValueError):
+      write_scheduler.WriteScheduler(data, delay=2, maximum_delay=1)
+
+  @pytest.mark.slow
+  def test_write_scheduler_writes_save(self, mocker, tmp_path):
+    mocker.patch.object(
+        game_data_io.GameDataIO, '_backup_save_file', return_value=True
+    )
+    save_file = tmp_path.joinpath('save_shared_1.dat')
+    shutil.copy(
+        file_util.full_file_path('0_31_save_new_hunter_equipment1'), save_file
+    )
+    with write_scheduler.WriteScheduler(
+        game_data_io.GameDataIO(save_file), delay=60, maximum_delay=60
+    ) as scheduler:
+      for value in ('first', 'second'):
+        with scheduler.lock:
+          scheduler.data.save['data']['difficulty']['edited'] = value
+        request = scheduler.request_write()
+    request.result(timeout=0)
+    reloaded = game_data_io.GameDataIO(save_file)
+    assert reloaded.save['data']['difficulty']['edited'] == 'second'